@@ -28,6 +28,17 @@ from app.db.base import Base
 
 target_metadata = Base.metadata
 
+# Indexes the migrations only create where their extension is available.
+# Autogenerate compares them when the database has them and otherwise leaves
+# them alone, instead of proposing to create them on a server that can't.
+OPTIONAL_INDEXES = {"ix_products_title_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "index" and name in OPTIONAL_INDEXES and not reflected and compare_to is None:
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +61,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -73,7 +85,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,45 @@
+"""Add trigram index on products title
+
+Revision ID: 3c9d2f1ab6e4
+Revises: 709f700aebcc
+Create Date: 2026-10-18 09:12:41.512309
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2f1ab6e4'
+down_revision: Union[str, Sequence[str], None] = '709f700aebcc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm ships with contrib but is not available on every server. Without it
+    # title search keeps working through the plain ILIKE, only without an index.
+    if not context.is_offline_mode():
+        available = op.get_bind().execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).scalar()
+        if not available:
+            return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_products_title_trgm',
+        'products',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension is left installed, other objects may depend on it.
+    op.drop_index('ix_products_title_trgm', table_name='products', if_exists=True)
@@ -0,0 +1,30 @@
+"""Add row versions to products and categories
+
+Revision ID: b57a0e9c3f18
+Revises: 8e41b7c05d2a
+Create Date: 2026-10-18 13:41:09.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b57a0e9c3f18'
+down_revision: Union[str, Sequence[str], None] = '8e41b7c05d2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('categories', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('products', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'version')
+    op.drop_column('categories', 'version')
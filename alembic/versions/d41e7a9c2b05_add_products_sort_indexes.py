@@ -0,0 +1,34 @@
+"""Add composite indexes for sorted product search
+
+Revision ID: d41e7a9c2b05
+Revises: b57a0e9c3f18
+Create Date: 2026-10-18 16:02:37.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7a9c2b05'
+down_revision: Union[str, Sequence[str], None] = 'b57a0e9c3f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_price_id', 'products', ['price', 'id'], unique=False)
+    op.create_index('ix_products_category_id_price_id', 'products', ['category_id', 'price', 'id'], unique=False)
+    op.create_index('ix_products_title_id', 'products', ['title', 'id'], unique=False)
+    op.create_index('ix_products_category_id_title_id', 'products', ['category_id', 'title', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_category_id_title_id', table_name='products')
+    op.drop_index('ix_products_title_id', table_name='products')
+    op.drop_index('ix_products_category_id_price_id', table_name='products')
+    op.drop_index('ix_products_price_id', table_name='products')
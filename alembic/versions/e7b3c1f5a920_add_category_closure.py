@@ -0,0 +1,50 @@
+"""Add category closure table
+
+Revision ID: e7b3c1f5a920
+Revises: d41e7a9c2b05
+Create Date: 2026-10-18 17:24:52.830166
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c1f5a920'
+down_revision: Union[str, Sequence[str], None] = 'd41e7a9c2b05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_category_closure_descendant_id'), 'category_closure', ['descendant_id'], unique=False)
+    # Backfill by walking parent_id upwards from every category; path stops the
+    # walk at an existing cycle instead of looping.
+    op.execute("""
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE walk (ancestor_id, descendant_id, depth, path) AS (
+            SELECT id, id, 0, ARRAY[id] FROM categories
+            UNION ALL
+            SELECT c.parent_id, walk.descendant_id, walk.depth + 1, walk.path || c.parent_id
+            FROM walk JOIN categories c ON c.id = walk.ancestor_id
+            WHERE c.parent_id IS NOT NULL AND c.parent_id <> ALL(walk.path)
+        )
+        SELECT ancestor_id, descendant_id, depth FROM walk
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_closure_descendant_id'), table_name='category_closure')
+    op.drop_table('category_closure')
@@ -0,0 +1,47 @@
+"""Add change tracking columns and tombstones for the change feed
+
+Revision ID: f2a8d6b4c317
+Revises: e7b3c1f5a920
+Create Date: 2026-10-18 18:47:15.402958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d6b4c317'
+down_revision: Union[str, Sequence[str], None] = 'e7b3c1f5a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENT_XID = "(pg_current_xact_id()::text)::bigint"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('products', 'categories'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XID), nullable=False))
+        op.create_index(f'ix_{table}_change_xid_id', table, ['change_xid', 'id'], unique=False)
+    op.create_table('tombstones',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('change_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XID), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_change_xid_id', 'tombstones', ['change_xid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tombstones_change_xid_id', table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in ('categories', 'products'):
+        op.drop_index(f'ix_{table}_change_xid_id', table_name=table)
+        op.drop_column(table, 'change_xid')
+        op.drop_column(table, 'updated_at')
@@ -1,4 +1,14 @@
-from app.db.session import get_session_local
+from fastapi import Request
+from app.db.session import get_async_read_session_local, get_async_session_local, get_read_session_local, get_session_local
+
+# Set on responses to successful writes for read_after_write_seconds, so the
+# writer's next reads see its own changes rather than a lagging replica.
+READ_PRIMARY_COOKIE = "read_primary"
+
+# For non-GET routes that only read (e.g. POST /products/batch): their responses
+# don't pin the client's reads to the primary.
+def read_only_request(request: Request):
+    request.state.read_only = True
 
 def get_db():
     SessionLocal = get_session_local()
@@ -6,4 +16,22 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    AsyncSessionLocal = get_async_session_local()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request):
+    SessionLocal = get_read_session_local(prefer_primary=READ_PRIMARY_COOKIE in request.cookies)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    AsyncSessionLocal = await get_async_read_session_local(prefer_primary=READ_PRIMARY_COOKIE in request.cookies)
+    async with AsyncSessionLocal() as db:
+        yield db
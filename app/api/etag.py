@@ -0,0 +1,30 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+# Strong ETags: any change to the response body changes the tag, either because
+# the inputs include every row version the body is built from, or because the
+# tag is a hash of the serialised body itself.
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = (candidate.strip().removeprefix("W/") for candidate in header.split(","))
+    return etag in candidates
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+def etag_json_response(request: Request, body: bytes) -> Response:
+    etag = make_etag(hashlib.sha256(body).hexdigest())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
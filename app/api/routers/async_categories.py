@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db, get_async_read_db
+from app.api.etag import etag_json_response, etag_matches, make_etag, not_modified
+from app.api.routers.categories import category_adapter, category_list_adapter
+from app.api.single_flight import coalesce_async
+from app.crud.async_categories import category_version, create_category_crud, delete_category_crud, list_all_categories, list_specific_category, update_category_crud
+from app.crud.categories import category_version_of
+from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+
+# AsyncSession variants of the routes in categories.py, mounted ahead of them
+# when settings.async_database is on.
+router = APIRouter(
+    prefix="/categories",
+    tags=["categories"],
+)
+
+@router.get("/", response_model=list[CategoryRead])
+async def get_categories(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    categories = category_list_adapter.validate_python(await list_all_categories(db), from_attributes=True)
+    return etag_json_response(request, category_list_adapter.dump_json(categories))
+
+async def category_json(db: AsyncSession, category_id: int) -> tuple[bytes, str] | None:
+    category = await list_specific_category(db, category_id)
+    if category is None:
+        return None
+    body = category_adapter.dump_json(category_adapter.validate_python(category, from_attributes=True))
+    return body, make_etag("category", *category_version_of(category))
+
+@router.get("/{category_id:int}", response_model=CategoryRead)
+async def get_category_by_id(category_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    if "if-none-match" in request.headers:
+        version = await category_version(db, category_id)
+        if version is not None and etag_matches(request, make_etag("category", *version)):
+            return not_modified(make_etag("category", *version))
+    found = await coalesce_async(request, ("category", category_id), lambda: category_json(db, category_id))
+    if found is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    body, etag = found
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.post("/", response_model=CategoryRead, status_code=201)
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    return await create_category_crud(db, category)
+
+@router.patch("/{category_id:int}", response_model=CategoryRead)
+async def update_category_by_id(category_id: int, category: CategoryUpdate, db: AsyncSession = Depends(get_async_db)):
+    updated_category = await update_category_crud(db, category_id, category)
+    if updated_category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return updated_category
+
+@router.delete("/{category_id:int}", status_code=204)
+async def delete_category_by_id(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    if await delete_category_crud(db, category_id) is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return Response(status_code=204)
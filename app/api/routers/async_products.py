@@ -0,0 +1,75 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db, get_async_read_db
+from app.api.etag import etag_json_response, etag_matches, make_etag, not_modified
+from app.api.routers.products import product_fields_adapter, product_fields_list_adapter, product_read_adapter, product_record_adapter, search_json
+from app.api.single_flight import coalesce_async, params_key
+from app.crud.async_products import create_product_crud, delete_product_crud, get_product_fields, list_product_fields, list_product_records, list_specific_product, product_version, search_product_records, update_product_crud
+from app.crud.products import product_version_of, selected_fields
+from app.schemas.product import ProductCreate, ProductFieldsParams, ProductPage, ProductParams, ProductRead, ProductUpdate
+
+# AsyncSession variants of the routes in products.py, mounted ahead of them when
+# settings.async_database is on. The :int convertor lets paths such as
+# /products/export fall through to the sync router.
+router = APIRouter(
+    prefix="/products",
+    tags=["products"],
+)
+
+@router.get("/", response_model=list[ProductRead])
+async def get_products(request: Request, params: Annotated[ProductFieldsParams, Query()], db: AsyncSession = Depends(get_async_read_db)):
+    if params.fields:
+        body = product_fields_list_adapter.dump_json(await list_product_fields(db, selected_fields(params.fields)))
+    else:
+        body = product_record_adapter.dump_json(await list_product_records(db))
+    return etag_json_response(request, body)
+
+@router.get("/search", response_model=list[ProductRead] | ProductPage, response_model_exclude_unset=True)
+async def search_products(request: Request, query: Annotated[ProductParams, Query()], db: AsyncSession = Depends(get_async_read_db)):
+    async def search():
+        return search_json(query, await search_product_records(db, query))
+    body = await coalesce_async(request, params_key("search", query), search)
+    return Response(content=body, media_type="application/json")
+
+async def product_json(db: AsyncSession, product_id: int, fields: tuple[str, ...]) -> tuple[bytes, str] | None:
+    if fields:
+        found = await get_product_fields(db, product_id, fields)
+        if found is None:
+            return None
+        record, version = found
+        return product_fields_adapter.dump_json(record), make_etag("product", *version, *fields)
+    product = await list_specific_product(db, product_id)
+    if product is None:
+        return None
+    return product_read_adapter.dump_json(ProductRead.model_validate(product)), make_etag("product", *product_version_of(product))
+
+@router.get("/{product_id:int}", response_model=ProductRead)
+async def get_product_by_id(product_id: int, request: Request, params: Annotated[ProductFieldsParams, Query()], db: AsyncSession = Depends(get_async_read_db)):
+    fields = selected_fields(params.fields)
+    if "if-none-match" in request.headers:
+        version = await product_version(db, product_id)
+        if version is not None and etag_matches(request, make_etag("product", *version, *fields)):
+            return not_modified(make_etag("product", *version, *fields))
+    found = await coalesce_async(request, ("product", product_id, fields), lambda: product_json(db, product_id, fields))
+    if found is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    body, etag = found
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.post("/", response_model=ProductRead, status_code=201)
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    return await create_product_crud(db, product)
+
+@router.patch("/{product_id:int}", response_model=ProductRead)
+async def update_product_by_id(product_id: int, product: ProductUpdate, db: AsyncSession = Depends(get_async_db)):
+    updated_product = await update_product_crud(db, product_id, product)
+    if updated_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return updated_product
+
+@router.delete("/{product_id:int}", status_code=204)
+async def delete_product_by_id(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    if await delete_product_crud(db, product_id) is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return Response(status_code=204)
@@ -1,24 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
-from app.crud.categories import create_category_crud, delete_category_crud, list_all_categories, list_specific_category, update_category_crud
-from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+from app.api.deps import get_db, get_read_db
+from app.api.etag import etag_json_response, etag_matches, make_etag, not_modified
+from app.api.single_flight import coalesce
+from app.crud.categories import category_version, category_version_of, create_category_crud, delete_category_crud, get_categories_batch, list_all_categories, list_category_tree, list_specific_category, update_category_crud
+from app.schemas.category import CategoryBatchParams, CategoryBatchRead, CategoryCreate, CategoryRead, CategoryTreeRead, CategoryUpdate
 
 router = APIRouter(
     prefix="/categories",
     tags=["categories"],
 )
 
-@router.get("/", response_model=list[CategoryRead])
-def get_categories(db: Session = Depends(get_db)):
-    return list_all_categories(db)
+category_list_adapter = TypeAdapter(list[CategoryRead])
+category_adapter = TypeAdapter(CategoryRead)
 
-@router.get("/{category_id}", response_model=CategoryRead)
-def get_category_by_id(category_id: int, db: Session = Depends(get_db)):
+# The body and ETag of GET /categories/{id}, or None; shared by identical concurrent reads.
+def category_json(db: Session, category_id: int) -> tuple[bytes, str] | None:
     category = list_specific_category(db, category_id)
     if category is None:
+        return None
+    body = category_adapter.dump_json(category_adapter.validate_python(category, from_attributes=True))
+    return body, make_etag("category", *category_version_of(category))
+
+@router.get("/", response_model=list[CategoryRead])
+def get_categories(request: Request, db: Session = Depends(get_read_db)):
+    categories = category_list_adapter.validate_python(list_all_categories(db), from_attributes=True)
+    return etag_json_response(request, category_list_adapter.dump_json(categories))
+
+@router.get("/batch", response_model=CategoryBatchRead)
+def get_categories_batch_by_query(params: Annotated[CategoryBatchParams, Query()], db: Session = Depends(get_read_db)):
+    return {"items": get_categories_batch(db, params.ids)}
+
+@router.get("/tree", response_model=list[CategoryTreeRead])
+def get_category_tree(db: Session = Depends(get_read_db)):
+    return list_category_tree(db)
+
+@router.get("/{category_id}/subtree", response_model=CategoryTreeRead)
+def get_category_subtree(category_id: int, depth: Annotated[int | None, Query(ge=0)] = None, db: Session = Depends(get_read_db)):
+    subtree = list_category_tree(db, root_id=category_id, depth=depth)
+    if not subtree:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return subtree[0]
+
+@router.get("/{category_id}", response_model=CategoryRead)
+def get_category_by_id(category_id: int, request: Request, db: Session = Depends(get_read_db)):
+    # Conditional GETs are answered from the row versions alone.
+    if "if-none-match" in request.headers:
+        version = category_version(db, category_id)
+        if version is not None and etag_matches(request, make_etag("category", *version)):
+            return not_modified(make_etag("category", *version))
+    found = coalesce(request, ("category", category_id), lambda: category_json(db, category_id))
+    if found is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    body, etag = found
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.post("/", response_model=CategoryRead, status_code=201)
 def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
@@ -33,8 +70,6 @@ def update_category_by_id(category_id: int, category: CategoryUpdate, db: Sessio
 
 @router.delete("/{category_id}", status_code=204)
 def delete_category_by_id(category_id: int, db: Session = Depends(get_db)):
-    category = list_specific_category(db, category_id)
-    if category is None:
+    if delete_category_crud(db, category_id) is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    delete_category_crud(db, category_id)
     return Response(status_code=204)
\ No newline at end of file
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from app.api.single_flight import get_single_flight
+from app.core.admission import get_admission
+from app.crud.category_cache import get_category_cache
+from app.db import session
+from app.db.pool import pool_status
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+)
+
+# async so it still answers when every threadpool worker is stuck waiting for a
+# connection, which is exactly when these figures are needed.
+@router.get("/metrics")
+async def get_metrics():
+    pools = {}
+    if session.engine is not None:
+        pools["sync"] = pool_status(session.engine.pool)
+    if session.async_engine is not None:
+        pools["async"] = pool_status(session.async_engine.pool)
+    for name, replicas in (("replica", session.replica_set), ("async_replica", session.async_replica_set)):
+        for index, replica in enumerate(replicas.replicas if replicas is not None else []):
+            pools[f"{name}_{index}"] = pool_status(replica.engine.pool)
+    replicas = {}
+    if session.replica_set is not None:
+        replicas["sync"] = session.replica_set.status()
+    if session.async_replica_set is not None:
+        replicas["async"] = session.async_replica_set.status()
+    return {"pools": pools, "replicas": replicas, "category_cache": get_category_cache().stats(), "admission": get_admission().stats(), "single_flight": get_single_flight().stats()}
+
+
+# Readiness probe: 503 until the startup warm-up has finished, so a new worker
+# only gets traffic once its pool, statements and serialisers are warm.
+@router.get("/ready")
+async def get_readiness(request: Request):
+    startup = getattr(request.app.state, "startup", None)
+    if startup is None:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return JSONResponse(status_code=200 if startup.ready else 503, content=startup.report())
@@ -1,34 +1,118 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Annotated, Literal
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
-from app.crud.products import create_product_crud, delete_product_crud, list_all_products, list_specific_product, search_for_product, update_product_crud
-from app.schemas.product import ProductCreate, ProductParams, ProductRead, ProductUpdate
+from app.api.deps import get_db, get_read_db, read_only_request
+from app.api.etag import etag_json_response, etag_matches, make_etag, not_modified
+from app.api.single_flight import coalesce, params_key
+from app.core.config import get_settings
+from app.crud.changes import list_changes
+from app.crud.products import bulk_update_products, create_product_crud, delete_product_crud, get_product_fields, get_products_batch, list_product_fields, list_product_records, list_specific_product, product_line_adapter, product_version, product_version_of, search_product_records, selected_fields, stream_product_records, update_product_crud
+from app.schemas.product import BULK_UPDATE_LIMIT, ProductBatchPage, ProductBatchRead, ProductBatchRequest, ProductBulkUpdateItem, ProductBulkUpdateResult, ProductChangesPage, ProductChangesParams, ProductChangesRead, ProductCreate, ProductFields, ProductFieldsPage, ProductFieldsParams, ProductPage, ProductParams, ProductRead, ProductRecord, ProductRecordPage, ProductUpdate
 
 router = APIRouter(
     prefix="/products",
     tags=["products"],
 )
 
-@router.get("/", response_model=list[ProductRead])
-def get_products(db: Session = Depends(get_db)):
-    return list_all_products(db)
+# Built once. Records come from our own database, so they are serialised
+# straight to JSON bytes without being validated again.
+product_record_adapter = TypeAdapter(list[ProductRecord])
+product_record_page_adapter = TypeAdapter(ProductRecordPage)
+product_fields_adapter = TypeAdapter(ProductFields)
+product_fields_list_adapter = TypeAdapter(list[ProductFields])
+product_fields_page_adapter = TypeAdapter(ProductFieldsPage)
 
-@router.get("/search", response_model=list[ProductRead])
-def search_products(query: Annotated[ProductParams, Query()], db: Session = Depends(get_db)):
-    return search_for_product(db, query)
+product_read_adapter = TypeAdapter(ProductRead)
 
-@router.get("/{product_id}", response_model=ProductRead)
-def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
+def search_json(query: ProductParams, result) -> bytes:
+    if query.fields:
+        adapter = product_fields_list_adapter if isinstance(result, list) else product_fields_page_adapter
+    else:
+        adapter = product_record_adapter if isinstance(result, list) else product_record_page_adapter
+    return adapter.dump_json(result)
+
+# The body and ETag of GET /products/{id}, or None if there is no such product.
+# Identical concurrent reads share one call (app.api.single_flight).
+def product_json(db: Session, product_id: int, fields: tuple[str, ...]) -> tuple[bytes, str] | None:
+    if fields:
+        found = get_product_fields(db, product_id, fields)
+        if found is None:
+            return None
+        record, version = found
+        return product_fields_adapter.dump_json(record), make_etag("product", *version, *fields)
     product = list_specific_product(db, product_id)
     if product is None:
+        return None
+    return product_read_adapter.dump_json(ProductRead.model_validate(product)), make_etag("product", *product_version_of(product))
+
+@router.get("/", response_model=list[ProductRead])
+def get_products(request: Request, params: Annotated[ProductFieldsParams, Query()], db: Session = Depends(get_read_db)):
+    if params.fields:
+        body = product_fields_list_adapter.dump_json(list_product_fields(db, selected_fields(params.fields)))
+    else:
+        body = product_record_adapter.dump_json(list_product_records(db))
+    return etag_json_response(request, body)
+
+@router.get("/search", response_model=list[ProductRead] | ProductPage, response_model_exclude_unset=True)
+def search_products(request: Request, query: Annotated[ProductParams, Query()], db: Session = Depends(get_read_db)):
+    body = coalesce(request, params_key("search", query), lambda: search_json(query, search_product_records(db, query)))
+    return Response(content=body, media_type="application/json")
+
+product_batch_adapter = TypeAdapter(ProductBatchPage)
+
+@router.get("/batch", response_model=ProductBatchRead)
+def get_products_batch_by_query(params: Annotated[ProductBatchRequest, Query()], db: Session = Depends(get_read_db)):
+    body = product_batch_adapter.dump_json({"items": get_products_batch(db, params)})
+    return Response(content=body, media_type="application/json")
+
+# Same lookup with the keys in the body, for batches too long for a URL.
+@router.post("/batch", response_model=ProductBatchRead, dependencies=[Depends(read_only_request)])
+def get_products_batch_by_body(batch: ProductBatchRequest, db: Session = Depends(get_read_db)):
+    body = product_batch_adapter.dump_json({"items": get_products_batch(db, batch)})
+    return Response(content=body, media_type="application/json")
+
+product_changes_adapter = TypeAdapter(ProductChangesPage)
+
+# Incremental sync: upserts and deletions since the consumer's last cursor.
+@router.get("/changes", response_model=ProductChangesRead)
+def get_product_changes(params: Annotated[ProductChangesParams, Query()], db: Session = Depends(get_read_db)):
+    body = product_changes_adapter.dump_json(list_changes(db, params))
+    return Response(content=body, media_type="application/json")
+
+@router.get("/export", response_class=StreamingResponse)
+def export_products(export_format: Annotated[Literal["ndjson"], Query(alias="format")] = "ndjson", db: Session = Depends(get_read_db)):
+    chunks = stream_product_records(db, get_settings().export_chunk_size)
+    return StreamingResponse(ndjson_lines(chunks), media_type="application/x-ndjson")
+
+def ndjson_lines(chunks):
+    for records in chunks:
+        yield b"\n".join(product_line_adapter.dump_json(record) for record in records) + b"\n"
+
+@router.get("/{product_id}", response_model=ProductRead)
+def get_product_by_id(product_id: int, request: Request, params: Annotated[ProductFieldsParams, Query()], db: Session = Depends(get_read_db)):
+    # Conditional GETs are answered from the row version alone.
+    fields = selected_fields(params.fields)
+    if "if-none-match" in request.headers:
+        version = product_version(db, product_id)
+        if version is not None and etag_matches(request, make_etag("product", *version, *fields)):
+            return not_modified(make_etag("product", *version, *fields))
+    found = coalesce(request, ("product", product_id, fields), lambda: product_json(db, product_id, fields))
+    if found is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    body, etag = found
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.post("/", response_model=ProductRead, status_code=201)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     return create_product_crud(db, product)
 
+# Registered before /{product_id} so "bulk" isn't taken for an id.
+@router.patch("/bulk", response_model=ProductBulkUpdateResult)
+def bulk_update_products_by_body(items: Annotated[list[ProductBulkUpdateItem], Body(min_length=1, max_length=BULK_UPDATE_LIMIT)], db: Session = Depends(get_db)):
+    return bulk_update_products(db, items, get_settings().bulk_update_chunk_size)
+
 @router.patch("/{product_id}", response_model=ProductRead)
 def update_product_by_id(product_id: int, product: ProductUpdate, db: Session = Depends(get_db)):
     updated_product = update_product_crud(db, product_id, product)
@@ -38,8 +122,6 @@ def update_product_by_id(product_id: int, product: ProductUpdate, db: Session =
 
 @router.delete("/{product_id}", status_code=204)
 def delete_product_by_id(product_id: int, db: Session = Depends(get_db)):
-    product = list_specific_product(db, product_id)
-    if product is None:
+    if delete_product_crud(db, product_id) is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    delete_product_crud(db, product_id)
     return Response(status_code=204)
\ No newline at end of file
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from app.core.config import get_settings
+from app.snapshots import MEDIA_TYPES, read_manifest
+
+router = APIRouter(
+    prefix="/snapshots",
+    tags=["snapshots"],
+)
+
+# Files are written by python -m app.snapshots (or the app's periodic build) and
+# served straight from disk: no database work, and Range requests let a client
+# resume an interrupted download.
+@router.get("/manifest")
+def get_snapshot_manifest():
+    manifest = read_manifest(get_settings().snapshot_dir)
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No snapshot has been built yet")
+    return manifest
+
+@router.get("/{name}", response_class=FileResponse)
+def get_snapshot_file(name: str):
+    root = Path(get_settings().snapshot_dir)
+    manifest = read_manifest(root)
+    # Only names listed in the manifest, so nothing else under the directory is reachable.
+    if manifest is None or name not in manifest["files"]:
+        raise HTTPException(status_code=404, detail="Snapshot file not found")
+    file = manifest["files"][name]
+    return FileResponse(
+        root / manifest["generation"] / name,
+        media_type=MEDIA_TYPES[file["format"]],
+        filename=name,
+        headers={"ETag": f'"{file["sha256"]}"', "Cache-Control": "public, max-age=60"},
+    )
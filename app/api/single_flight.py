@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+
+from fastapi import Request
+from pydantic import BaseModel
+from app.api.deps import READ_PRIMARY_COOKIE
+from app.core.config import get_settings
+
+
+class Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self, done):
+        self.done = done
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Per-worker request coalescing: while a read for some key is running, identical
+    reads wait for it and share its result instead of querying again.
+
+    Only reads already in flight are joined; nothing is kept once the leader
+    finishes. A follower waits at most max_wait seconds, then runs the read
+    itself. Sync handlers (threadpool) and async handlers have separate flights.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self._flights: dict = {}
+        self._async_flights: dict = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, fn, max_wait: float):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight(threading.Event())
+                self.leaders += 1
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as exc:
+                flight.error = exc
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            return flight.result
+
+        if not flight.done.wait(max_wait):
+            with self._lock:
+                self.timeouts += 1
+            return fn()
+        with self._lock:
+            self.coalesced += 1
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    async def run_async(self, key, fn, max_wait: float):
+        flight = self._async_flights.get(key)
+        if flight is None:
+            flight = self._async_flights[key] = Flight(asyncio.get_running_loop().create_future())
+            self.leaders += 1
+            try:
+                flight.result = await fn()
+            except BaseException as exc:
+                flight.error = exc
+                raise
+            finally:
+                del self._async_flights[key]
+                flight.done.set_result(None)
+            return flight.result
+
+        done, _ = await asyncio.wait([flight.done], timeout=max_wait)
+        # A leader that was cancelled (its client went away) has nothing to share.
+        if not done or isinstance(flight.error, asyncio.CancelledError):
+            self.timeouts += 1
+            return await fn()
+        self.coalesced += 1
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            reads = self.leaders + self.coalesced + self.timeouts
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "in_flight": len(self._flights) + len(self._async_flights),
+                "coalescing_ratio": round(self.coalesced / reads, 4) if reads else 0.0,
+            }
+
+
+# Lazy singleton, one per worker process.
+_single_flight: SingleFlight | None = None
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+# List params that behave as sets: ?fields=id,title and ?fields=title,id give
+# the same response. price_edges is not one of them, its order is checked.
+UNORDERED_PARAMS = ("fields", "include")
+
+def params_key(route: str, params: BaseModel) -> tuple:
+    # Equivalent query strings (parameter order, defaults spelled out) share a key.
+    values = params.model_dump(mode="json")
+    for name in UNORDERED_PARAMS:
+        if isinstance(values.get(name), list):
+            values[name] = sorted(values[name])
+    return (route, json.dumps(values, sort_keys=True))
+
+def coalescable(request: Request) -> bool:
+    # A client reading its own writes must not join a read that started before them.
+    settings = get_settings()
+    return settings.single_flight and READ_PRIMARY_COOKIE not in request.cookies
+
+def coalesce(request: Request, key, fn):
+    if not coalescable(request):
+        return fn()
+    return get_single_flight().run(key, fn, get_settings().single_flight_max_wait_seconds)
+
+async def coalesce_async(request: Request, key, fn):
+    if not coalescable(request):
+        return await fn()
+    return await get_single_flight().run_async(key, fn, get_settings().single_flight_max_wait_seconds)
@@ -0,0 +1,144 @@
+import asyncio
+import re
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+from app.core.config import get_settings
+
+LOOKUP_PATH = re.compile(r"^/(products|categories)/\d+$")
+
+
+def route_class(method: str, path: str) -> str | None:
+    # Only the catalog endpoints hold database connections for long; internal
+    # metrics, snapshots (served from disk) and the docs are never limited.
+    if not path.startswith(("/products", "/categories")):
+        return None
+    if method in ("GET", "HEAD"):
+        return "lookup" if LOOKUP_PATH.match(path) else "heavy"
+    if method == "POST" and path == "/products/batch":
+        return "heavy"
+    return "write"
+
+
+class Gate:
+    """
+    A concurrency limit with a bounded wait queue for one route class.
+
+    Only touched from the event loop, so the counters need no lock. A released
+    slot is handed straight to the oldest waiter, which keeps the queue FIFO.
+    """
+
+    def __init__(self, limit: int, queue_size: int):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.admitted = 0
+        self.waited = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait([waiter], timeout=timeout)
+        except BaseException:
+            # Cancelled (e.g. the client went away): give back a slot handed over meanwhile.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+        if not waiter.done():
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            self.timed_out += 1
+            return False
+        self.admitted += 1
+        self.waited += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "waited": self.waited,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class Admission:
+    def __init__(self, limits: dict[str, int], queue_sizes: dict[str, int]):
+        self.gates = {name: Gate(limit, queue_sizes.get(name, 0)) for name, limit in limits.items()}
+
+    def stats(self) -> dict:
+        return {name: gate.stats() for name, gate in self.gates.items()}
+
+
+# Lazy singleton, one per worker process.
+_admission: Admission | None = None
+
+def get_admission() -> Admission:
+    global _admission
+    if _admission is None:
+        settings = get_settings()
+        _admission = Admission(settings.admission_limits, settings.admission_queue)
+    return _admission
+
+
+class AdmissionControl:
+    """
+    ASGI middleware that sheds load before it reaches the connection pool.
+
+    Each route class may run admission_limits[class] requests at once; up to
+    admission_queue[class] more wait for a slot, for at most
+    admission_wait_seconds. Anything beyond that is answered at once with a 503
+    and Retry-After instead of piling up on the threadpool and the pool. The slot
+    is held until the response is fully sent, streamed exports included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        gate = get_admission().gates.get(route_class(scope["method"], scope["path"]))
+        if gate is None:
+            return await self.app(scope, receive, send)
+
+        settings = get_settings()
+        if not await gate.acquire(settings.admission_wait_seconds):
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, retry shortly."},
+                headers={"Retry-After": str(settings.admission_retry_after_seconds)},
+            )
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -1,9 +1,74 @@
+from decimal import Decimal
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str
     test_database_url: str = ""
     environment: str = "local"
+    # Connection pool, per engine and per worker process.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    # Connections older than this are replaced on checkout; -1 never recycles.
+    db_pool_recycle_seconds: int = 1800
+    # always: ping on every checkout. idle: only after db_pre_ping_idle_seconds
+    # unused in the pool. never: rely on recycling.
+    db_pre_ping: Literal["always", "idle", "never"] = "always"
+    db_pre_ping_idle_seconds: float = 30
+    # Behind PgBouncer in transaction mode: no server-side prepared statements.
+    db_pgbouncer: bool = False
+    # No application-side pooling (NullPool), e.g. when PgBouncer pools instead.
+    db_null_pool: bool = False
+    # Read replicas for GET endpoints, as a JSON list. Empty: everything uses the primary.
+    replica_database_urls: list[str] = []
+    # A replica further behind than this, or unreachable, is skipped until it recovers.
+    replica_max_lag_seconds: float = 5
+    replica_health_check_seconds: float = 5
+    replica_connect_timeout_seconds: int = 2
+    # After a successful write, that client's reads stay on the primary this long.
+    read_after_write_seconds: int = 5
+    # Serve the core product and category endpoints from the AsyncSession path
+    # instead of sync handlers on Starlette's threadpool.
+    async_database: bool = False
+    # Safety net for the per-worker category cache: full reload after this long.
+    category_cache_ttl_seconds: float = 300
+    # Rows fetched per server-side cursor round-trip by streaming exports.
+    export_chunk_size: int = 1000
+    # Rows per UPDATE (and per transaction) of PATCH /products/bulk.
+    bulk_update_chunk_size: int = 1000
+    # Admission control, per worker and route class: lookup (GET /products/{id},
+    # /categories/{id}), heavy (lists, search, batch, export, changes) and write.
+    # Past its limit a request waits in a queue of at most admission_queue for up
+    # to admission_wait_seconds, then gets a 503. The default limits add up to
+    # db_pool_size + db_max_overflow. A class left out of the limits is unlimited.
+    admission_limits: dict[str, int] = {"lookup": 8, "heavy": 3, "write": 4}
+    admission_queue: dict[str, int] = {"lookup": 32, "heavy": 6, "write": 16}
+    admission_wait_seconds: float = 1
+    admission_retry_after_seconds: int = 1
+    # Concurrent identical reads of a product, a category or a search share one
+    # query and response body; a read waits at most this long, then runs its own.
+    single_flight: bool = True
+    single_flight_max_wait_seconds: float = 2
+    # Warm-up after startup: engine, db_pool_size connections, hot statements and
+    # serialisers. /internal/ready answers 503 until it has finished; while the
+    # database is unreachable it is retried every warmup_retry_seconds.
+    warmup_on_startup: bool = True
+    warmup_retry_seconds: float = 5
+    # Prebuilt catalog snapshots (python -m app.snapshots). With an interval > 0
+    # the app rebuilds them itself; one worker at a time, via an advisory lock.
+    snapshot_dir: str = "snapshots"
+    snapshot_formats: list[Literal["gzip", "zstd"]] = ["gzip"]
+    snapshot_keep: int = 2
+    snapshot_interval_seconds: float = 0
+    # Default bucket edges of the search price histogram (include=facets).
+    facet_price_edges: list[Decimal] = [Decimal(edge) for edge in (10, 25, 50, 100, 250, 500, 1000)]
+
+    # Requests slower than this are logged with their SQL statement count and DB time.
+    slow_request_ms: float = 500
+    # A statement repeated this many times within one request is logged as a likely N+1.
+    n_plus_one_threshold: int = 5
 
     model_config = {"env_file": ".env"}
 
@@ -0,0 +1,123 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.errors import ValidationErrors
+from app.crud.async_validations import category_validation
+from app.crud.category_cache import get_category_cache
+from app.crud.category_closure import closure_detach, closure_insert, closure_move, is_descendant
+from app.crud.tombstones import with_tombstone
+from app.crud.validations import raise_integrity_error
+from app.db.models import Category
+from sqlalchemy import delete, insert, or_, select, update
+
+from app.schemas.category import CategoryCreate, CategoryUpdate
+
+# Async mirrors of app.crud.categories for the AsyncSession path.
+
+async def list_all_categories(db: AsyncSession) -> list[Category]:
+    statement = select(Category).options(selectinload(Category.children))
+    return (await db.execute(statement)).scalars().all()
+
+async def list_specific_category(db: AsyncSession, id: int) -> Category:
+    statement = (
+        select(Category)
+        .where(Category.id == id)
+        .options(selectinload(Category.children))
+        .execution_options(populate_existing=True)
+    )
+    return (await db.execute(statement)).scalars().one_or_none()
+
+async def category_version(db: AsyncSession, id: int) -> tuple | None:
+    statement = select(Category.id, Category.version, Category.parent_id).where(or_(Category.id == id, Category.parent_id == id))
+    rows = (await db.execute(statement)).all()
+    category = next((row for row in rows if row.id == id), None)
+    if category is None:
+        return None
+    children = sorted((row.id, row.version) for row in rows if row.id != id)
+    return (id, category.version, category.parent_id, tuple(children))
+
+async def create_category_crud(db: AsyncSession, payload: CategoryCreate) -> Category:
+    data = payload.model_dump()
+    if data.get("parent_id") is not None:
+        valid_category = await category_validation(db, data["parent_id"])
+        if valid_category is not None:
+            raise ValidationErrors([valid_category])
+
+    # Creating the category: one INSERT ... RETURNING and its closure rows, then COMMIT.
+    try:
+        category = (await db.execute(insert(Category).values(**data).returning(Category))).scalars().one()
+        db.expunge(category)
+        await db.execute(closure_insert(category.id, category.parent_id))
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise_integrity_error(e, data, "Integrity error while creating category")
+
+    # A new category has no children yet.
+    set_committed_value(category, "children", [])
+    get_category_cache().put(category.id, category.name, category.parent_id)
+    return category
+
+async def update_category_crud(db: AsyncSession, id: int, payload: CategoryUpdate) -> Category:
+    errors = []
+    if payload.parent_id is not None:
+        valid_category = await category_validation(db, payload.parent_id)
+        if valid_category is not None:
+            errors.append(valid_category)
+        if payload.parent_id == id:
+            errors.append({"field": "parent_id", "message": f"parent_id = {payload.parent_id} must be different than the ID of the category."})
+        elif valid_category is None and (await db.execute(is_descendant(payload.parent_id, id))).scalar():
+            errors.append({"field": "parent_id", "message": f"parent_id = {payload.parent_id} is a descendant of the category."})
+
+    if errors:
+        if (await db.execute(select(Category.id).where(Category.id == id))).scalar_one_or_none() is None:
+            return None
+        raise ValidationErrors(errors)
+
+    updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        return await list_specific_category(db, id)
+
+    # Updating the category: UPDATE ... RETURNING, the closure when reparented, plus the children, then COMMIT.
+    statement = (
+        update(Category)
+        .where(Category.id == id)
+        .values(**updates, version=Category.version + 1)
+        .returning(Category)
+    )
+    try:
+        category = (await db.execute(statement)).scalars().one_or_none()
+        if category is None:
+            await db.rollback()
+            return None
+        if "parent_id" in updates:
+            await db.execute(closure_move(id, category.parent_id))
+        children = (await db.execute(select(Category).where(Category.parent_id == id))).scalars().all()
+        for instance in [category, *children]:
+            db.expunge(instance)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise_integrity_error(e, updates, "Integrity error while updating category")
+
+    set_committed_value(category, "children", children)
+    get_category_cache().put(category.id, category.name, category.parent_id)
+    return category
+
+async def delete_category_crud(db: AsyncSession, id: int) -> int | None:
+    # One statement: the children are made roots (an UPDATE, so the change feed
+    # sees them) and their subtrees detached from the closure above, then the
+    # category is deleted and its tombstone written. Products still restrict the delete.
+    orphaned = update(Category).where(Category.parent_id == id).values(parent_id=None).cte("orphaned")
+    deleted = delete(Category).where(Category.id == id).returning(Category.id)
+    statement = with_tombstone("category", deleted).add_cte(closure_detach(id).cte("detached"), orphaned)
+    try:
+        deleted = (await db.execute(statement)).scalar_one_or_none()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise IntegrityError("Integrity error while deleting category", e.params, e.orig)
+    if deleted is not None:
+        get_category_cache().evict(id)
+    return deleted
@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.category_cache import CATEGORY_ROWS, CachedCategory, attach_categories, get_category_cache
+from app.db.models import Category, Product
+
+# Async counterparts of the read-through helpers in app.crud.category_cache;
+# both paths share the same per-worker cache.
+
+async def load_category_cache(db: AsyncSession) -> None:
+    get_category_cache().load((await db.execute(CATEGORY_ROWS)).all())
+
+async def get_cached_categories(db: AsyncSession, ids) -> dict[int, CachedCategory]:
+    cache = get_category_cache()
+    if cache.expired():
+        await load_category_cache(db)
+    found, missing = cache.lookup(ids)
+    if missing:
+        for row in (await db.execute(CATEGORY_ROWS.where(Category.id.in_(missing)))).all():
+            found[row.id] = cache.put(row.id, row.name, row.parent_id)
+    return found
+
+async def attach_cached_categories(db: AsyncSession, products: list[Product]) -> None:
+    attach_categories(products, await get_cached_categories(db, [product.category_id for product in products]))
@@ -0,0 +1,134 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.errors import ValidationErrors
+from app.crud.async_category_cache import attach_cached_categories, get_cached_categories
+from app.crud.async_validations import category_validation, sku_validation
+from app.crud.validations import raise_integrity_error
+from app.crud.products import facets_statement, fields_columns, fields_record, fields_statement, product_record, product_records_statement, record_mapper, search_page, search_statement
+from app.crud.tombstones import with_tombstone
+from app.db.models import Product
+from sqlalchemy import delete, insert, select, update
+
+from app.schemas.product import ProductCreate, ProductParams, ProductRecord, ProductUpdate
+
+# Async mirrors of app.crud.products for the AsyncSession path. Objects are
+# returned fully loaded since nothing may lazy load once the handler returns.
+
+
+async def list_product_records(db: AsyncSession) -> list[ProductRecord]:
+    return [product_record(row) for row in await db.execute(product_records_statement())]
+
+async def list_specific_product(db: AsyncSession, id: int) -> Product:
+    statement = select(Product).where(Product.id == id).execution_options(populate_existing=True)
+    product = (await db.execute(statement)).scalars().one_or_none()
+    if product is not None:
+        await attach_cached_categories(db, [product])
+    return product
+
+async def product_version(db: AsyncSession, id: int) -> tuple | None:
+    row = (await db.execute(select(Product.version, Product.category_id).where(Product.id == id))).one_or_none()
+    if row is None:
+        return None
+    category = (await get_cached_categories(db, [row.category_id])).get(row.category_id)
+    return (id, row.version, row.category_id, None if category is None else category.name)
+
+async def create_product_crud(db: AsyncSession, payload: ProductCreate):
+    data = payload.model_dump()
+    if data.get("image"):
+        data["image"] = str(data["image"])
+
+    # Validations. The category is checked against the cache; sku uniqueness is
+    # left to the unique index.
+    valid_category = await category_validation(db, data["category_id"])
+    if valid_category is not None:
+        # The insert won't run, so report a duplicate sku alongside.
+        errors = [error for error in (await sku_validation(db, sku=data["sku"]), valid_category) if error is not None]
+        raise ValidationErrors(errors)
+
+    # Creating the product: one INSERT ... RETURNING, then COMMIT.
+    try:
+        product = (await db.execute(insert(Product).values(**data).returning(Product))).scalars().one()
+        db.expunge(product)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise_integrity_error(e, data, "Integrity error while creating product")
+
+    await attach_cached_categories(db, [product])
+    return product
+
+async def update_product_crud(db: AsyncSession, id: int, payload: ProductUpdate) -> Product:
+    updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        return await list_specific_product(db, id)
+    if updates.get("image") is not None:
+        updates["image"] = str(updates["image"])
+
+    # Validations.
+    if updates.get("category_id") is not None:
+        valid_category = await category_validation(db, updates["category_id"])
+        if valid_category is not None:
+            if (await db.execute(select(Product.id).where(Product.id == id))).scalar_one_or_none() is None:
+                return None
+            errors = [valid_category]
+            if updates.get("sku"):
+                valid_sku = await sku_validation(db, sku=updates["sku"])
+                if valid_sku is not None:
+                    errors.insert(0, valid_sku)
+            raise ValidationErrors(errors)
+
+    # Updating the product: one UPDATE ... RETURNING, then COMMIT.
+    statement = (
+        update(Product)
+        .where(Product.id == id)
+        .values(**updates, version=Product.version + 1)
+        .returning(Product)
+    )
+    try:
+        product = (await db.execute(statement)).scalars().one_or_none()
+        if product is None:
+            await db.rollback()
+            return None
+        db.expunge(product)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise_integrity_error(e, updates, "Integrity error while updating product")
+
+    await attach_cached_categories(db, [product])
+    return product
+
+async def delete_product_crud(db: AsyncSession, id: int) -> int | None:
+    statement = with_tombstone("product", delete(Product).where(Product.id == id).returning(Product.id))
+    try:
+        deleted = (await db.execute(statement)).scalar_one_or_none()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise IntegrityError("Integrity error while deleting product", e.params, e.orig)
+    return deleted
+
+async def list_product_fields(db: AsyncSession, fields: tuple[str, ...]) -> list[dict]:
+    statement = fields_statement(fields).order_by(Product.id)
+    return [fields_record(fields, row) for row in await db.execute(statement)]
+
+async def get_product_fields(db: AsyncSession, id: int, fields: tuple[str, ...]):
+    own_fields = tuple(field for field in fields if field != "category")
+    statement = select(*fields_columns(own_fields), Product.version, Product.category_id).where(Product.id == id)
+    row = (await db.execute(statement)).one_or_none()
+    if row is None:
+        return None
+    *values, version, category_id = row
+    category = (await get_cached_categories(db, [category_id])).get(category_id)
+    record = fields_record(own_fields, values)
+    if "category" in fields:
+        record["category"] = None if category is None else {"id": category.id, "name": category.name}
+    return record, (id, version, category_id, None if category is None else category.name)
+
+async def search_product_records(db: AsyncSession, query: ProductParams):
+    to_record, width = record_mapper(query)
+    rows = [(to_record(row), *row[width:]) for row in await db.execute(search_statement(query, records=True))]
+    facets = None
+    if query.include:
+        facets = rows[0][-1] if rows else (await db.execute(facets_statement(query))).scalar_one()
+    return search_page(query, rows, facets)
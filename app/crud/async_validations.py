@@ -0,0 +1,18 @@
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.async_category_cache import get_cached_categories
+from app.db.models import Product
+
+
+async def sku_validation(db: AsyncSession, sku: str):
+    sku_exists = (await db.execute(select(Product.id).where(Product.sku == sku))).scalar_one_or_none()
+    if sku_exists is not None:
+        return {"field": "sku", "message": f"sku={sku} already exists"}
+    return None
+
+async def category_validation(db: AsyncSession, category_id: int):
+    if category_id not in await get_cached_categories(db, [category_id]):
+        return {"field": "category_id", "message": f"category_id={category_id} does not exist"}
+    return None
@@ -1,9 +1,14 @@
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, aliased, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.core.errors import ValidationErrors
-from app.crud.validations import category_validation
+from app.crud.category_cache import get_category_cache
+from app.crud.category_closure import closure_detach, closure_insert, closure_move, is_descendant
+from app.crud.tombstones import with_tombstone
+from app.crud.validations import category_validation, raise_integrity_error
 from app.db.models import Category
-from sqlalchemy import select
+from sqlalchemy import Integer, all_, any_, bindparam, delete, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array
 
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
@@ -15,55 +20,167 @@ def list_specific_category(db: Session, id: int) -> Category:
     statement = select(Category).where(Category.id == id).options(selectinload(Category.children))
     return db.execute(statement).scalars().one_or_none()
 
+def get_categories_batch(db: Session, ids: list[int]) -> list[dict]:
+    # Categories and their children in one statement: the children are
+    # aggregated per category instead of loaded by a second SELECT.
+    child = aliased(Category)
+    children = func.coalesce(
+        func.json_agg(aggregate_order_by(func.json_build_object("name", child.name, "id", child.id), child.id))
+        .filter(child.id.is_not(None)),
+        text("'[]'::json"),
+    )
+    statement = (
+        select(Category.name, Category.parent_id, Category.id, children)
+        .outerjoin(child, child.parent_id == Category.id)
+        .where(Category.id == any_(bindparam("ids", list(dict.fromkeys(ids)), type_=ARRAY(Integer))))
+        .group_by(Category.id)
+    )
+    found = {row.id: {"name": row.name, "parent_id": row.parent_id, "id": row.id, "children": row[3]} for row in db.execute(statement)}
+    return [{"id": id, "found": id in found, "category": found.get(id)} for id in ids]
+
+def list_category_tree(db: Session, root_id: int | None = None, depth: int | None = None) -> list[dict]:
+    # One WITH RECURSIVE query walks parent_id from the roots (or from root_id);
+    # path guards against cycles in the parent_id graph.
+    anchor = select(
+        Category.id,
+        Category.name,
+        Category.parent_id,
+        literal(0, Integer).label("depth"),
+        array([Category.id]).label("path"),
+    )
+    if root_id is None:
+        anchor = anchor.where(Category.parent_id.is_(None))
+    else:
+        anchor = anchor.where(Category.id == root_id)
+    tree = anchor.cte("tree", recursive=True)
+
+    step = (
+        select(
+            Category.id,
+            Category.name,
+            Category.parent_id,
+            tree.c.depth + 1,
+            tree.c.path.op("||")(Category.id),
+        )
+        .join(tree, Category.parent_id == tree.c.id)
+        .where(Category.id != all_(tree.c.path))
+    )
+    if depth is not None:
+        step = step.where(tree.c.depth < depth)
+    tree = tree.union_all(step)
+
+    statement = select(tree.c.id, tree.c.name, tree.c.parent_id).order_by(tree.c.depth, tree.c.id)
+    rows = db.execute(statement).all()
+
+    # Rows arrive parents first, so each node's parent is already in the map.
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = {"id": row.id, "name": row.name, "parent_id": row.parent_id, "children": []}
+        nodes[row.id] = node
+        parent = nodes.get(row.parent_id)
+        if parent is None:
+            roots.append(node)
+        else:
+            parent["children"].append(node)
+    return roots
+
+# Everything a CategoryRead body depends on: the category and its children.
+# parent_id is part of it because ON DELETE SET NULL changes it without a version bump.
+def category_version(db: Session, id: int) -> tuple | None:
+    statement = select(Category.id, Category.version, Category.parent_id).where(or_(Category.id == id, Category.parent_id == id))
+    rows = db.execute(statement).all()
+    category = next((row for row in rows if row.id == id), None)
+    if category is None:
+        return None
+    children = sorted((row.id, row.version) for row in rows if row.id != id)
+    return (id, category.version, category.parent_id, tuple(children))
+
+def category_version_of(category: Category) -> tuple:
+    children = sorted((child.id, child.version) for child in category.children)
+    return (category.id, category.version, category.parent_id, tuple(children))
+
 def create_category_crud(db: Session, payload: CategoryCreate) -> Category:
-    category = Category(**payload.model_dump())
-    db.add(category)
+    data = payload.model_dump()
+    if data.get("parent_id") is not None:
+        valid_category = category_validation(db, data["parent_id"])
+        if valid_category is not None:
+            raise ValidationErrors([valid_category])
+
+    # Creating the category: one INSERT ... RETURNING and its closure rows, then COMMIT.
     try:
+        category = db.execute(insert(Category).values(**data).returning(Category)).scalars().one()
+        db.expunge(category)
+        db.execute(closure_insert(category.id, category.parent_id))
         db.commit()
     except IntegrityError as e:
         db.rollback()
-        raise IntegrityError("Integrity error while creating category", e.params, e.orig)
+        raise_integrity_error(e, data, "Integrity error while creating category")
 
-    db.refresh(category)
+    # A new category has no children yet.
+    set_committed_value(category, "children", [])
+    get_category_cache().put(category.id, category.name, category.parent_id)
     return category
 
 def update_category_crud(db: Session, id: int, payload: CategoryUpdate) -> Category:
     errors = []
-    statement = select(Category).where(Category.id == id).options(selectinload(Category.children))
-    category = db.execute(statement).scalars().one_or_none()
-    if category is None:
-        return None
-    
     if payload.parent_id is not None:
         valid_category = category_validation(db, payload.parent_id)
         if valid_category is not None:
             errors.append(valid_category)
         if payload.parent_id == id:
             errors.append({"field": "parent_id", "message": f"parent_id = {payload.parent_id} must be different than the ID of the category."})
+        elif valid_category is None and (db.execute(is_descendant(payload.parent_id, id))).scalar():
+            errors.append({"field": "parent_id", "message": f"parent_id = {payload.parent_id} is a descendant of the category."})
     
     if errors:
+        if db.execute(select(Category.id).where(Category.id == id)).scalar_one_or_none() is None:
+            return None
         raise ValidationErrors(errors)
     
     updates = payload.model_dump(exclude_unset=True)
-    for key, value in updates.items():
-        setattr(category, key, value)
+    if not updates:
+        return list_specific_category(db, id)
 
+    # Updating the category: UPDATE ... RETURNING, the closure when reparented, plus the children, then COMMIT.
+    statement = (
+        update(Category)
+        .where(Category.id == id)
+        .values(**updates, version=Category.version + 1)
+        .returning(Category)
+    )
     try:
+        category = db.execute(statement).scalars().one_or_none()
+        if category is None:
+            db.rollback()
+            return None
+        if "parent_id" in updates:
+            db.execute(closure_move(id, category.parent_id))
+        children = db.execute(select(Category).where(Category.parent_id == id)).scalars().all()
+        for instance in [category, *children]:
+            db.expunge(instance)
         db.commit()
     except IntegrityError as e:
         db.rollback()
-        raise IntegrityError("Integrity error while updating category", e.params, e.orig)
-    db.refresh(category)
+        raise_integrity_error(e, updates, "Integrity error while updating category")
+
+    set_committed_value(category, "children", children)
+    get_category_cache().put(category.id, category.name, category.parent_id)
     return category
 
-def delete_category_crud(db: Session, id: int) -> None:
-    statement = select(Category).where(Category.id == id)
-    category = db.execute(statement).scalars().one_or_none()
-    if category is None:
-        return None
-    db.delete(category)
+def delete_category_crud(db: Session, id: int) -> int | None:
+    # One statement: the children are made roots (an UPDATE, so the change feed
+    # sees them) and their subtrees detached from the closure above, then the
+    # category is deleted and its tombstone written. Products still restrict the delete.
+    orphaned = update(Category).where(Category.parent_id == id).values(parent_id=None).cte("orphaned")
+    deleted = delete(Category).where(Category.id == id).returning(Category.id)
+    statement = with_tombstone("category", deleted).add_cte(closure_detach(id).cte("detached"), orphaned)
     try:
+        deleted = db.execute(statement).scalar_one_or_none()
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise IntegrityError("Integrity error while deleting category", e.params, e.orig)
+    if deleted is not None:
+        get_category_cache().evict(id)
+    return deleted
@@ -0,0 +1,123 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import get_settings
+from app.db.models import Category, Product
+
+
+@dataclass(frozen=True, slots=True)
+class CachedCategory:
+    id: int
+    name: str
+    parent_id: int | None
+
+
+class CategoryCache:
+    """
+    Per-worker map of category id -> (name, parent_id).
+
+    Categories change rarely, so product validation and the category embedded in
+    product responses are answered from here. The category CRUD functions write
+    through on every change; writes made by other workers are picked up on the
+    next full reload, at most ttl_seconds later.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[int, CachedCategory] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def load(self, rows) -> None:
+        entries = {row.id: CachedCategory(row.id, row.name, row.parent_id) for row in rows}
+        with self._lock:
+            self._entries = entries
+            self._loaded_at = time.monotonic()
+
+    def lookup(self, ids) -> tuple[dict[int, CachedCategory], list[int]]:
+        found = {}
+        missing = []
+        with self._lock:
+            for id in set(ids):
+                entry = self._entries.get(id)
+                if entry is None:
+                    missing.append(id)
+                else:
+                    found[id] = entry
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put(self, id: int, name: str, parent_id: int | None) -> CachedCategory:
+        entry = CachedCategory(id, name, parent_id)
+        with self._lock:
+            self._entries[id] = entry
+        return entry
+
+    def evict(self, id: int) -> None:
+        # Mirrors ON DELETE SET NULL on categories.parent_id.
+        with self._lock:
+            self._entries.pop(id, None)
+            for child in [entry for entry in self._entries.values() if entry.parent_id == id]:
+                self._entries[child.id] = CachedCategory(child.id, child.name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._loaded_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "age_seconds": None if self._loaded_at is None else time.monotonic() - self._loaded_at,
+            }
+
+
+# Lazy singleton, one per worker process.
+_category_cache: CategoryCache | None = None
+
+def get_category_cache() -> CategoryCache:
+    global _category_cache
+    if _category_cache is None:
+        _category_cache = CategoryCache(get_settings().category_cache_ttl_seconds)
+    return _category_cache
+
+CATEGORY_ROWS = select(Category.id, Category.name, Category.parent_id)
+
+def load_category_cache(db: Session) -> None:
+    get_category_cache().load(db.execute(CATEGORY_ROWS).all())
+
+def get_cached_categories(db: Session, ids) -> dict[int, CachedCategory]:
+    cache = get_category_cache()
+    if cache.expired():
+        load_category_cache(db)
+    found, missing = cache.lookup(ids)
+    # Misses are read through in one query; ids that don't exist are not cached.
+    if missing:
+        for row in db.execute(CATEGORY_ROWS.where(Category.id.in_(missing))).all():
+            found[row.id] = cache.put(row.id, row.name, row.parent_id)
+    return found
+
+def attach_categories(products: list[Product], categories: dict[int, CachedCategory]) -> None:
+    # Populates Product.category as if it had been loaded, so serialising a
+    # product neither lazy loads nor needs an eager load of its category.
+    for product in products:
+        entry = categories.get(product.category_id)
+        category = None if entry is None else Category(id=entry.id, name=entry.name, parent_id=entry.parent_id)
+        set_committed_value(product, "category", category)
+
+def attach_cached_categories(db: Session, products: list[Product]) -> None:
+    attach_categories(products, get_cached_categories(db, [product.category_id for product in products]))
@@ -0,0 +1,64 @@
+from sqlalchemy import delete, exists, insert, literal, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from app.db.models import CategoryClosure
+
+# Statement builders for keeping category_closure in step with parent_id. They
+# are shared by the sync and async category CRUD functions and always run in the
+# same transaction as the categories write they belong to.
+
+closure = CategoryClosure.__table__
+
+def closure_insert(id: int, parent_id: int | None):
+    # A new leaf: linked to itself, and to every ancestor of its parent one level deeper.
+    own = select(literal(id), literal(id), literal(0))
+    if parent_id is None:
+        rows = own
+    else:
+        inherited = select(closure.c.ancestor_id, literal(id), closure.c.depth + 1).where(closure.c.descendant_id == parent_id)
+        rows = union_all(inherited, own)
+    return insert(closure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+
+def closure_detach(id: int, keep=None):
+    # Drops the links between the subtree rooted at id and everything above it,
+    # except to the ancestors selected by keep.
+    link, up, down = closure.alias("link"), closure.alias("up"), closure.alias("down")
+    statement = delete(link).where(
+        up.c.descendant_id == id,
+        up.c.depth > 0,
+        down.c.ancestor_id == id,
+        link.c.ancestor_id == up.c.ancestor_id,
+        link.c.descendant_id == down.c.descendant_id,
+    )
+    if keep is not None:
+        statement = statement.where(up.c.ancestor_id.not_in(keep))
+    return statement
+
+def closure_move(id: int, parent_id: int | None):
+    # Reparenting as one statement: links to ancestors the subtree leaves are
+    # deleted by a data-modifying CTE, and the INSERT links it below the new
+    # parent. Ancestors shared by the old and new position keep their rows and
+    # only get their depth updated, so nothing is deleted and re-inserted.
+    if parent_id is None:
+        return closure_detach(id)
+    new_ancestors = select(closure.c.ancestor_id).where(closure.c.descendant_id == parent_id)
+    detached = closure_detach(id, keep=new_ancestors).cte("detached")
+    up, down = closure.alias("up"), closure.alias("down")
+    # Every new ancestor times every member of the subtree.
+    rows = (
+        select(up.c.ancestor_id, down.c.descendant_id, up.c.depth + down.c.depth + 1)
+        .select_from(up.join(down, true()))
+        .where(up.c.descendant_id == parent_id, down.c.ancestor_id == id)
+    )
+    statement = upsert(closure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[closure.c.ancestor_id, closure.c.descendant_id],
+        set_={"depth": statement.excluded.depth},
+    )
+    return statement.add_cte(detached)
+
+def is_descendant(id: int, ancestor_id: int):
+    return select(exists().where(closure.c.ancestor_id == ancestor_id, closure.c.descendant_id == id))
+
+def subtree_ids(id: int):
+    return select(closure.c.descendant_id).where(closure.c.ancestor_id == id)
@@ -0,0 +1,86 @@
+from sqlalchemy import BigInteger, Integer, Text, any_, bindparam, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.crud.pagination import decode_cursor, encode_cursor
+from app.crud.products import product_record, product_records_statement
+from app.db.models import Category, Product, Tombstone
+from app.schemas.product import ProductChangesParams
+
+# Change feed: every product and category insert or update stamps the row with
+# its transaction id (change_xid), and deletes made through the CRUD functions
+# leave a tombstone stamped the same way (app.crud.tombstones). The feed walks
+# the three sources in (change_xid, source, id) order.
+
+CATEGORY_SOURCE, PRODUCT_SOURCE, TOMBSTONE_SOURCE = 0, 1, 2
+
+# Transactions below the snapshot xmin have all finished, so no row with a
+# smaller change_xid can still appear; the feed never reads past it. That keeps
+# a transaction that commits late from being skipped by a consumer's cursor.
+XID_HORIZON = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+def source_keys(source: int, xid_column, id_column, changed_at, kind, entity_id, after: list | None, limit: int):
+    # One source's next rows, read off its (change_xid, id) index. The cursor's
+    # row comparison is narrowed to this source so the seek stays sargable.
+    statement = select(
+        xid_column.label("change_xid"),
+        literal(source).label("source"),
+        id_column.label("id"),
+        kind.label("kind"),
+        entity_id.label("entity_id"),
+        changed_at.label("changed_at"),
+    ).where(xid_column < XID_HORIZON)
+    if after is not None:
+        xid, after_source, id = after
+        if source < after_source:
+            statement = statement.where(xid_column > xid)
+        elif source == after_source:
+            statement = statement.where(tuple_(xid_column, id_column) > tuple_(xid, id))
+        else:
+            statement = statement.where(xid_column >= xid)
+    return statement.order_by(xid_column, id_column).limit(limit)
+
+def changes_statement(after: list | None, limit: int):
+    sources = [
+        source_keys(CATEGORY_SOURCE, Category.change_xid, Category.id, Category.updated_at, literal("category"), Category.id, after, limit),
+        source_keys(PRODUCT_SOURCE, Product.change_xid, Product.id, Product.updated_at, literal("product"), Product.id, after, limit),
+        source_keys(TOMBSTONE_SOURCE, Tombstone.change_xid, Tombstone.id, Tombstone.deleted_at, Tombstone.kind, Tombstone.entity_id, after, limit),
+    ]
+    keys = union_all(*sources).subquery("keys")
+    return select(keys).order_by(keys.c.change_xid, keys.c.source, keys.c.id).limit(limit)
+
+def list_changes(db: Session, params: ProductChangesParams) -> dict:
+    after = decode_cursor(params.since or "", "changes", (int, int, int), "since")
+    # One extra row tells us whether the consumer is caught up.
+    keys = db.execute(changes_statement(after, params.limit + 1)).all()
+    has_more = len(keys) > params.limit
+    keys = keys[:params.limit]
+
+    # Upserts carry the row as it is now; a row changed again since is simply
+    # reported again later, and one deleted since is left to its tombstone.
+    product_ids = [key.entity_id for key in keys if key.source == PRODUCT_SOURCE]
+    category_ids = [key.entity_id for key in keys if key.source == CATEGORY_SOURCE]
+    products = {}
+    if product_ids:
+        statement = product_records_statement().where(Product.id == any_(bindparam("ids", product_ids, type_=ARRAY(Integer))))
+        products = {record.id: record for record in map(product_record, db.execute(statement))}
+    categories = {}
+    if category_ids:
+        statement = select(Category.id, Category.name, Category.parent_id).where(Category.id == any_(bindparam("ids", category_ids, type_=ARRAY(Integer))))
+        categories = {row.id: {"id": row.id, "name": row.name, "parent_id": row.parent_id} for row in db.execute(statement)}
+
+    changes = []
+    for key in keys:
+        change = {"kind": key.kind, "id": key.entity_id, "deleted": key.source == TOMBSTONE_SOURCE, "changed_at": key.changed_at}
+        if key.source == PRODUCT_SOURCE:
+            if key.entity_id not in products:
+                continue
+            change["product"] = products[key.entity_id]
+        elif key.source == CATEGORY_SOURCE:
+            if key.entity_id not in categories:
+                continue
+            change["category"] = categories[key.entity_id]
+        changes.append(change)
+
+    next_cursor = encode_cursor("changes", list(keys[-1][:3])) if keys else params.since or ""
+    return {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from decimal import Decimal
+
+from sqlalchemy import tuple_
+
+from app.core.errors import ValidationErrors
+
+
+# Cursors are opaque to clients: url-safe base64 of a small JSON document
+# holding the sort name and the sort key values of the last row served.
+def encode_cursor(sort: str, keys: list) -> str:
+    raw = json.dumps({"s": sort, "k": keys}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, sort: str, types: tuple, field: str = "after") -> list | None:
+    # An empty token starts a cursor walk from the first row.
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys = data["k"]
+        cursor_sort = data["s"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValidationErrors([{"field": field, "message": f"{field} is not a valid cursor."}])
+    if cursor_sort != sort:
+        raise ValidationErrors([{"field": field, "message": f"{field} cursor does not match sort={sort}."}])
+    if not isinstance(keys, list) or len(keys) != len(types):
+        raise ValidationErrors([{"field": field, "message": f"{field} is not a valid cursor."}])
+    try:
+        return [cursor_key(type_, key) for type_, key in zip(types, keys)]
+    except (ValueError, TypeError, ArithmeticError):
+        raise ValidationErrors([{"field": field, "message": f"{field} is not a valid cursor."}])
+
+def cursor_key(type_, key):
+    # Keys are checked, not coerced: a cursor edited by hand must not turn
+    # "1e9" into a price or true into an id. Decimals are encoded as strings.
+    if type_ is Decimal:
+        if not isinstance(key, str) or not Decimal(key).is_finite():
+            raise ValueError(key)
+        return Decimal(key)
+    if type_ is float:
+        if isinstance(key, bool) or not isinstance(key, (int, float)):
+            raise TypeError(key)
+        return float(key)
+    if isinstance(key, bool) or not isinstance(key, type_):
+        raise TypeError(key)
+    return key
+
+def keyset_predicate(columns: list, values: list, descending: bool):
+    # Row comparison keeps the seek sargable on a matching multi-column index.
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
@@ -1,115 +1,530 @@
+from decimal import Decimal
+
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
 from app.core.errors import ValidationErrors
-from app.crud.validations import category_validation, sku_validation
-from app.db.models import Product
-from sqlalchemy import select
+from app.crud.category_cache import attach_cached_categories, get_cached_categories, get_category_cache
+from app.crud.category_closure import subtree_ids
+from app.crud.pagination import decode_cursor, encode_cursor, keyset_predicate
+from app.crud.tombstones import with_tombstone
+from app.crud.validations import category_validation, constraint_violation, raise_integrity_error, sku_validation
+from app.db.models import Category, Product
+from sqlalchemy import Boolean, Double, Integer, any_, bindparam, case, cast, column, delete, func, insert, literal, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, array
+
+from app.schemas.product import PRODUCT_FIELDS, CategoryRecord, ProductBatchRequest, ProductBulkUpdateItem, ProductCreate, ProductParams, ProductRecord, ProductUpdate
+
+# Must match the configuration used by the products.search_vector generated column.
+TEXT_SEARCH_CONFIG = "english"
+
+
+# The list and search endpoints read plain columns into records instead of ORM
+# objects: no identity map, no attribute instrumentation, and the category name
+# comes from the same row.
+PRODUCT_RECORD_COLUMNS = (
+    Product.sku,
+    Product.title,
+    Product.description,
+    Product.image,
+    Product.price,
+    Product.category_id,
+    Product.id,
+    Category.name,
+)
+
+def product_record(row) -> ProductRecord:
+    sku, title, description, image, price, category_id, id, category_name = row[:len(PRODUCT_RECORD_COLUMNS)]
+    return ProductRecord(sku, title, description, image, price, category_id, id, CategoryRecord(category_id, category_name))
+
+def product_records_statement():
+    return select(*PRODUCT_RECORD_COLUMNS).join(Product.category).order_by(Product.id)
+
+def list_product_records(db: Session) -> list[ProductRecord]:
+    return [product_record(row) for row in db.execute(product_records_statement())]
+
+# Sparse fieldsets: only the requested columns are selected, and categories are
+# joined only when the embedded category is asked for.
+def selected_fields(fields) -> tuple[str, ...]:
+    requested = set(fields)
+    return tuple(field for field in PRODUCT_FIELDS if field in requested)
+
+def fields_columns(fields: tuple[str, ...]) -> list:
+    columns = []
+    for field in fields:
+        if field == "category":
+            columns += [Product.category_id, Category.name]
+        else:
+            columns.append(getattr(Product, field))
+    return columns
+
+def fields_statement(fields: tuple[str, ...]):
+    statement = select(*fields_columns(fields))
+    if "category" in fields:
+        statement = statement.join(Product.category)
+    return statement
+
+def fields_record(fields: tuple[str, ...], row) -> dict:
+    record = {}
+    values = iter(row)
+    for field in fields:
+        if field == "category":
+            category_id, category_name = next(values), next(values)
+            record["category"] = {"id": category_id, "name": category_name}
+        else:
+            record[field] = next(values)
+    return record
+
+def record_mapper(query: ProductParams):
+    # How search rows become response items, and how many leading columns they use.
+    if query.fields:
+        fields = selected_fields(query.fields)
+        return (lambda row: fields_record(fields, row)), len(fields_columns(fields))
+    return product_record, len(PRODUCT_RECORD_COLUMNS)
+
+def list_product_fields(db: Session, fields: tuple[str, ...]) -> list[dict]:
+    statement = fields_statement(fields).order_by(Product.id)
+    return [fields_record(fields, row) for row in db.execute(statement)]
 
-from app.schemas.product import ProductCreate, ProductParams, ProductUpdate
+def get_product_fields(db: Session, id: int, fields: tuple[str, ...]):
+    # The category comes from the cache, as for the full product, so the version
+    # tuple (and ETag) matches product_version().
+    own_fields = tuple(field for field in fields if field != "category")
+    statement = select(*fields_columns(own_fields), Product.version, Product.category_id).where(Product.id == id)
+    row = db.execute(statement).one_or_none()
+    if row is None:
+        return None
+    *values, version, category_id = row
+    category = get_cached_categories(db, [category_id]).get(category_id)
+    record = fields_record(own_fields, values)
+    if "category" in fields:
+        record["category"] = None if category is None else {"id": category.id, "name": category.name}
+    return record, (id, version, category_id, None if category is None else category.name)
+
+# Batch lookups bind the keys as one array parameter: a single statement shape
+# whatever the batch size, answered with one index probe per key.
+def batch_statement(key: str, keys: list):
+    column = getattr(Product, key)
+    unique_keys = list(dict.fromkeys(keys))
+    return (
+        select(*PRODUCT_RECORD_COLUMNS)
+        .join(Product.category)
+        .where(column == any_(bindparam("keys", unique_keys, type_=ARRAY(column.type))))
+    )
+
+def batch_items(key: str, keys: list, records: list[ProductRecord]) -> list[dict]:
+    found = {getattr(record, key): record for record in records}
+    return [{key: value, "found": value in found, "product": found.get(value)} for value in keys]
+
+def batch_key(request: ProductBatchRequest) -> tuple[str, list]:
+    if (request.ids is None) == (request.skus is None):
+        raise ValidationErrors([{"field": "ids & skus", "message": "Provide either ids or skus."}])
+    return ("id", request.ids) if request.ids is not None else ("sku", request.skus)
 
+def get_products_batch(db: Session, request: ProductBatchRequest) -> list[dict]:
+    key, keys = batch_key(request)
+    records = [product_record(row) for row in db.execute(batch_statement(key, keys))]
+    return batch_items(key, keys, records)
 
-def list_all_products(db: Session) -> list[Product]:
-    statement = select(Product).options(selectinload(Product.category))
-    return db.execute(statement).scalars().all()
+# One record per NDJSON line, for the export and the snapshots. Records come from
+# our own database, so they are serialised without being validated again.
+product_line_adapter = TypeAdapter(ProductRecord)
+
+def stream_product_records(db: Session, chunk_size: int):
+    # The list endpoint's statement through a server-side cursor: nothing enters
+    # the identity map and only one chunk of records is held in memory at a time.
+    statement = product_records_statement().execution_options(yield_per=chunk_size)
+    for rows in db.execute(statement).partitions():
+        yield [product_record(row) for row in rows]
 
 def list_specific_product(db: Session, id: int) -> Product:
-    statement = select(Product).where(Product.id == id).options(selectinload(Product.category))
-    return db.execute(statement).scalars().one_or_none()
+    product = db.execute(select(Product).where(Product.id == id)).scalars().one_or_none()
+    if product is not None:
+        attach_cached_categories(db, [product])
+    return product
+
+# Everything a ProductRead body depends on. product_version answers it with one
+# narrow query so conditional GETs can skip loading and serialising the product.
+def product_version(db: Session, id: int) -> tuple | None:
+    row = db.execute(select(Product.version, Product.category_id).where(Product.id == id)).one_or_none()
+    if row is None:
+        return None
+    category = get_cached_categories(db, [row.category_id]).get(row.category_id)
+    return (id, row.version, row.category_id, None if category is None else category.name)
+
+def product_version_of(product: Product) -> tuple:
+    category = product.category
+    return (product.id, product.version, product.category_id, None if category is None else category.name)
 
 def create_product_crud(db: Session, payload: ProductCreate):
-    errors = []
     data = payload.model_dump()
-
-    # Validations.
     if data.get("image"):
         data["image"] = str(data["image"])
-    if data.get("sku"):
-        valid_sku = sku_validation(db, sku=data["sku"])
-        if valid_sku is not None:
-            errors.append(valid_sku)
-    if data.get("category_id") is not None:
-        valid_category = category_validation(db, data["category_id"])
-        if valid_category is not None:
-            errors.append(valid_category)
-    if errors:
+
+    # Validations. The category is checked against the cache; sku uniqueness is
+    # left to the unique index.
+    valid_category = category_validation(db, data["category_id"])
+    if valid_category is not None:
+        # The insert won't run, so report a duplicate sku alongside.
+        errors = [error for error in (sku_validation(db, sku=data["sku"]), valid_category) if error is not None]
         raise ValidationErrors(errors)
 
-    # Creating the product.
-    product = Product(**data)
-    db.add(product)
+    # Creating the product: one INSERT ... RETURNING, then COMMIT.
     try:
+        product = db.execute(insert(Product).values(**data).returning(Product)).scalars().one()
+        # Detached, the RETURNING values survive the commit without a reload.
+        db.expunge(product)
         db.commit()
     except IntegrityError as e:
         db.rollback()
-        raise IntegrityError("Integrity error while creating product", e.params, e.orig)
+        raise_integrity_error(e, data, "Integrity error while creating product")
 
-    db.refresh(product)
+    attach_cached_categories(db, [product])
     return product
 
 def update_product_crud(db: Session, id: int, payload: ProductUpdate) -> Product:
-    errors = []
-    statement = select(Product).where(Product.id == id).options(selectinload(Product.category))
-    product = db.execute(statement).scalars().one_or_none()
-    if product is None:
-        return None
-
     updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        return list_specific_product(db, id)
+    if updates.get("image") is not None:
+        updates["image"] = str(updates["image"])
 
     # Validations.
-    if updates.get("sku"):
-        valid_sku = sku_validation(db, sku=updates["sku"])
-        if valid_sku is not None:
-            errors.append(valid_sku)
     if updates.get("category_id") is not None:
         valid_category = category_validation(db, updates["category_id"])
         if valid_category is not None:
-            errors.append(valid_category)
-    if errors:
-        raise ValidationErrors(errors)
-
-    # Updating the product.
-    for (key, value) in updates.items():
-        if key == "image" and value is not None:
-            value = str(value)
-        setattr(product, key, value)
+            if db.execute(select(Product.id).where(Product.id == id)).scalar_one_or_none() is None:
+                return None
+            errors = [valid_category]
+            if updates.get("sku"):
+                valid_sku = sku_validation(db, sku=updates["sku"])
+                if valid_sku is not None:
+                    errors.insert(0, valid_sku)
+            raise ValidationErrors(errors)
 
+    # Updating the product: one UPDATE ... RETURNING, then COMMIT.
+    statement = (
+        update(Product)
+        .where(Product.id == id)
+        .values(**updates, version=Product.version + 1)
+        .returning(Product)
+    )
     try:
+        product = db.execute(statement).scalars().one_or_none()
+        if product is None:
+            db.rollback()
+            return None
+        db.expunge(product)
         db.commit()
     except IntegrityError as e:
         db.rollback()
-        raise IntegrityError("Integrity error while updating product", e.params, e.orig)
+        raise_integrity_error(e, updates, "Integrity error while updating product")
 
-    db.refresh(product)
+    attach_cached_categories(db, [product])
     return product
 
-def delete_product_crud(db: Session, id: int) -> None:
-    statement = select(Product).where(Product.id == id)
-    product = db.execute(statement).scalars().one_or_none()
-    if product is None:
-        return None
-    db.delete(product)
+def delete_product_crud(db: Session, id: int) -> int | None:
+    statement = with_tombstone("product", delete(Product).where(Product.id == id).returning(Product.id))
     try:
+        deleted = db.execute(statement).scalar_one_or_none()
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise IntegrityError("Integrity error while deleting product", e.params, e.orig)
+    return deleted
+
+BULK_FIELDS = ("title", "description", "image", "price", "category_id")
+NOT_NULL_FIELDS = ("title", "price", "category_id")
+
+def bulk_update_statement(key: str, fields: list[str]):
+    # UPDATE ... FROM a row source of the changes. The rows arrive as one array
+    # per column, unnested side by side, so the statement text only depends on
+    # key and fields: it is compiled once and cached instead of per chunk.
+    # Rows don't all change the same fields, so a field is only assigned where
+    # its set flag is true.
+    products = Product.__table__
+    columns = [("index", Integer()), (key, products.c[key].type)]
+    for name in fields:
+        columns += [(f"{name}_set", Boolean()), (name, products.c[name].type)]
+    changes = (
+        func.unnest(*(bindparam(f"{name}_values", type_=ARRAY(type_)) for name, type_ in columns))
+        .table_valued(*(column(name, type_) for name, type_ in columns))
+        .render_derived(name="changes")
+    )
+    assignments = {name: case((changes.c[f"{name}_set"], changes.c[name]), else_=products.c[name]) for name in fields}
+    return (
+        update(Product)
+        .where(products.c[key] == changes.c[key])
+        .values(**assignments, version=Product.version + 1)
+        .returning(changes.c.index)
+    )
+
+def bulk_update_errors(db: Session, items: list[ProductBulkUpdateItem]):
+    # Checks that need no writes; returns the errors and the rows that passed, as
+    # (index, key, value, updates).
+    errors = []
+    rows = []
+    seen = set()
+    categories = get_cached_categories(db, {item.category_id for item in items if item.category_id is not None})
+    for index, item in enumerate(items):
+        updates = item.model_dump(include=set(BULK_FIELDS), exclude_unset=True)
+        if (item.id is None) == (item.sku is None):
+            errors.append({"index": index, "field": "id & sku", "message": "Provide either id or sku."})
+            continue
+        key, value = ("id", item.id) if item.id is not None else ("sku", item.sku)
+        if (key, value) in seen:
+            errors.append({"index": index, "field": key, "message": f"{key}={value} appears more than once in the request."})
+            continue
+        seen.add((key, value))
+        if not updates:
+            errors.append({"index": index, "field": key, "message": "No fields to update."})
+            continue
+        nulled = next((name for name in NOT_NULL_FIELDS if name in updates and updates[name] is None), None)
+        if nulled is not None:
+            errors.append({"index": index, "field": nulled, "message": f"{nulled} cannot be null."})
+            continue
+        if updates.get("category_id") is not None and updates["category_id"] not in categories:
+            errors.append({"index": index, "field": "category_id", "message": f"category_id={updates['category_id']} does not exist"})
+            continue
+        if updates.get("image") is not None:
+            updates["image"] = str(updates["image"])
+        rows.append((index, key, value, updates))
+    return errors, rows
+
+def bulk_update_chunk(db: Session, key: str, chunk: list) -> tuple[set, list[dict]]:
+    # One set-based UPDATE and one transaction; returns the indexes it matched and
+    # the rows that failed. The categories were checked against the per-worker
+    # cache, which can lag a delete made elsewhere: on a foreign key violation the
+    # chunk's categories are re-read from the database, the rows pointing at
+    # missing ones are reported, and the rest of the chunk is retried.
+    errors = []
+    while chunk:
+        fields = [name for name in BULK_FIELDS if any(name in updates for _, _, _, updates in chunk)]
+        params = {"index_values": [index for index, _, _, _ in chunk], f"{key}_values": [value for _, _, value, _ in chunk]}
+        for name in fields:
+            params[f"{name}_set_values"] = [name in updates for _, _, _, updates in chunk]
+            params[f"{name}_values"] = [updates.get(name) for _, _, _, updates in chunk]
+        try:
+            matched = set(db.execute(bulk_update_statement(key, fields), params).scalars())
+            db.commit()
+            return matched, errors
+        except IntegrityError as e:
+            db.rollback()
+            violation = constraint_violation(e, {})
+            if violation is None or violation["field"] != "category_id":
+                raise
+            category_ids = {updates["category_id"] for _, _, _, updates in chunk if updates.get("category_id") is not None}
+            existing = set(db.execute(select(Category.id).where(Category.id.in_(category_ids))).scalars())
+            db.rollback()
+            missing = category_ids - existing
+            if not missing:
+                raise
+            for id in missing:
+                get_category_cache().evict(id)
+            errors.extend(
+                {"index": index, "field": "category_id", "message": f"category_id={updates['category_id']} does not exist"}
+                for index, _, _, updates in chunk if updates.get("category_id") in missing
+            )
+            chunk = [row for row in chunk if row[3].get("category_id") not in missing]
+    return set(), errors
+
+def bulk_update_products(db: Session, items: list[ProductBulkUpdateItem], chunk_size: int) -> dict:
+    errors, rows = bulk_update_errors(db, items)
+    updated = 0
+    # Rows keyed by id and by sku go in separate chunks, so every UPDATE joins
+    # on a single unique index. A failed chunk doesn't undo the ones already
+    # committed.
+    for key in ("id", "sku"):
+        keyed = [row for row in rows if row[1] == key]
+        for start in range(0, len(keyed), chunk_size):
+            chunk = keyed[start:start + chunk_size]
+            matched, failed = bulk_update_chunk(db, key, chunk)
+            errors.extend(failed)
+            failed_indexes = {error["index"] for error in failed}
+            updated += len(matched)
+            errors.extend(
+                {"index": index, "field": key, "message": f"{key}={value} does not exist"}
+                for index, _, value, _ in chunk if index not in matched and index not in failed_indexes
+            )
+    errors.sort(key=lambda error: error["index"])
+    return {"updated": updated, "errors": errors}
+
+def title_contains(title: str):
+    # Escape LIKE wildcards so user input is matched literally. The GIN trigram
+    # index (ix_products_title_trgm) serves this predicate when pg_trgm is installed.
+    escaped = title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return Product.title.ilike(f"%{escaped}%", escape="\\")
 
-def search_for_product(db: Session, query: ProductParams):
-    statement = select(Product).options(selectinload(Product.category))
+# Search is split into statement building and result paging so the sync and
+# async CRUD modules share everything but the execute call.
+def search_filters(query: ProductParams):
+    conditions = []
     if query.title:
-        statement = statement.where(Product.title.ilike(f"%{query.title}%"))
+        conditions.append(title_contains(query.title))
     if query.sku:
-        statement = statement.where(Product.sku == query.sku)
+        conditions.append(Product.sku == query.sku)
     if query.min_price is not None and query.max_price is not None:
         if query.min_price > query.max_price:
             raise ValidationErrors([{"field": "min_price & max_price", "message": f"min_price cannot be higher than max_price."}])
     if query.min_price is not None:
-        statement = statement.where(Product.price >= query.min_price)
+        conditions.append(Product.price >= query.min_price)
     if query.max_price is not None:
-        statement = statement.where(Product.price <= query.max_price)
-    if query.category_id is not None:
-        statement = statement.where(Product.category_id == query.category_id)
-    statement = statement.order_by(Product.id)
-    statement = statement.offset(query.offset).limit(query.limit)
-    return db.execute(statement).scalars().all()
\ No newline at end of file
+        conditions.append(Product.price <= query.max_price)
+    if query.include_descendants:
+        if query.category_id is None:
+            raise ValidationErrors([{"field": "include_descendants", "message": "include_descendants requires category_id."}])
+        conditions.append(Product.category_id.in_(subtree_ids(query.category_id)))
+    elif query.category_id is not None:
+        conditions.append(Product.category_id == query.category_id)
+
+    # Full-text match, served by the GIN index on the generated search_vector column.
+    rank = None
+    if query.q:
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query.q)
+        conditions.append(Product.search_vector.op("@@")(tsquery))
+        # ts_rank is a real; as double precision it round-trips exactly through cursors.
+        rank = cast(func.ts_rank(Product.search_vector, tsquery), Double)
+    return conditions, rank
+
+def price_edges(query: ProductParams) -> list[Decimal]:
+    edges = query.price_edges or get_settings().facet_price_edges
+    if any(low >= high for low, high in zip(edges, edges[1:])):
+        raise ValidationErrors([{"field": "price_edges", "message": "price_edges must be strictly increasing."}])
+    return edges
+
+# Sort name -> (leading sort column, its type, descending). Every order ends
+# with the id in the same direction, so a filtered first page is a range scan
+# of the matching (..., column, id) index, forwards or backwards.
+SEARCH_SORTS = {
+    "id": (None, None, False),
+    "-id": (None, None, True),
+    "price": ("price", Decimal, False),
+    "-price": ("price", Decimal, True),
+    "title": ("title", str, False),
+}
+
+def search_matches(query: ProductParams, conditions, rank):
+    columns = [Product.id, Product.category_id, Product.price]
+    if query.sort == "title":
+        columns.append(Product.title)
+    if rank is not None:
+        columns.append(rank.label("rank"))
+    return select(*columns).where(*conditions).cte("matches")
+
+def facets_column(query: ProductParams, matches):
+    # One aggregate over the match set: the () grouping set is the total, the
+    # others the per-category counts and the price histogram. grouping() tells
+    # the rows apart: 3 = total, 1 = category, 2 = price bucket.
+    if "facets" in query.include:
+        bucket = func.width_bucket(matches.c.price, array(price_edges(query)))
+        group_columns = [matches.c.category_id, bucket]
+        level = func.grouping(*group_columns)
+        group_by = [func.grouping_sets(tuple_(), tuple_(matches.c.category_id), tuple_(bucket))]
+    else:
+        group_columns = [null(), null()]
+        level = literal(3)
+        group_by = []
+    facets = (
+        select(level.label("level"), *group_columns, func.count().label("count"))
+        .select_from(matches)
+        .group_by(*group_by)
+        .subquery("facets")
+    )
+    return select(func.json_agg(func.json_build_array(*facets.c))).scalar_subquery().label("facets")
+
+def search_statement(query: ProductParams, records: bool = False):
+    conditions, rank = search_filters(query)
+    if records and query.fields:
+        statement = fields_statement(selected_fields(query.fields))
+    elif records:
+        statement = select(*PRODUCT_RECORD_COLUMNS).join(Product.category)
+    else:
+        statement = select(Product)
+
+    # Totals and facets come from the same filtered scan as the page: the
+    # matches are collected once, aggregated, and the page is joined back to
+    # products by primary key.
+    if query.include:
+        matches = search_matches(query, conditions, rank)
+        statement = statement.join(matches, matches.c.id == Product.id)
+        source = matches.c
+        rank = matches.c.rank if rank is not None else None
+    else:
+        statement = statement.where(*conditions)
+        source = Product.__table__.c
+
+    # Sort keys always end with the primary key so the order is total.
+    if query.sort == "relevance":
+        if rank is None:
+            raise ValidationErrors([{"field": "sort", "message": "sort=relevance requires q."}])
+        sort_columns, sort_types, descending = [rank, source.id], (float, int), True
+    else:
+        name, type_, descending = SEARCH_SORTS[query.sort]
+        if name is None:
+            sort_columns, sort_types = [source.id], (int,)
+        else:
+            sort_columns, sort_types = [source[name], source.id], (type_, int)
+    statement = statement.add_columns(*sort_columns)
+    statement = statement.order_by(*(column.desc() if descending else column for column in sort_columns))
+    if query.include:
+        statement = statement.add_columns(facets_column(query, matches))
+
+    if query.after is None:
+        return statement.offset(query.offset).limit(query.limit)
+
+    # Cursor mode: seek past the last sort key served instead of skipping rows.
+    if query.offset:
+        raise ValidationErrors([{"field": "after & offset", "message": "offset cannot be combined with an after cursor."}])
+    keys = decode_cursor(query.after, query.sort, sort_types)
+    if keys is not None:
+        statement = statement.where(keyset_predicate(sort_columns, keys, descending))
+    # One extra row tells us whether another page exists.
+    return statement.limit(query.limit + 1)
+
+# The facets ride along on every page row; an empty page needs them on their own.
+def facets_statement(query: ProductParams):
+    conditions, rank = search_filters(query)
+    return select(facets_column(query, search_matches(query, conditions, rank)))
+
+def search_facets(query: ProductParams, data) -> dict:
+    result = {}
+    categories = []
+    edges = price_edges(query) if "facets" in query.include else []
+    buckets = [0] * (len(edges) + 1)
+    for level, category_id, bucket, count in data or []:
+        if level == 3:
+            result["total"] = count
+        elif level == 1:
+            categories.append({"category_id": category_id, "count": count})
+        elif level == 2:
+            buckets[bucket] = count
+    if "facets" in query.include:
+        categories.sort(key=lambda facet: (-facet["count"], facet["category_id"]))
+        bounds = [None, *edges, None]
+        prices = [{"min": low, "max": high, "count": count} for low, high, count in zip(bounds, bounds[1:], buckets)]
+        result["facets"] = {"categories": categories, "prices": prices}
+    return result
+
+def search_page(query: ProductParams, rows, facets=None):
+    if query.include:
+        rows = [row[:-1] for row in rows]
+    if query.after is None and not query.include:
+        return [row[0] for row in rows]
+    next_cursor = None
+    if query.after is not None and len(rows) > query.limit:
+        rows = rows[:query.limit]
+        next_cursor = encode_cursor(query.sort, list(rows[-1][1:]))
+    page = {"items": [row[0] for row in rows], "next_cursor": next_cursor}
+    if query.include:
+        page.update(search_facets(query, facets))
+    return page
+
+def search_product_records(db: Session, query: ProductParams):
+    to_record, width = record_mapper(query)
+    rows = [(to_record(row), *row[width:]) for row in db.execute(search_statement(query, records=True))]
+    facets = None
+    if query.include:
+        facets = rows[0][-1] if rows else db.execute(facets_statement(query)).scalar_one()
+    return search_page(query, rows, facets)
@@ -0,0 +1,14 @@
+from sqlalchemy import insert, literal, select
+
+from app.db.models import Tombstone
+
+
+# Wraps DELETE ... RETURNING id so the change feed's tombstone is written by the
+# same statement; the result is still the deleted id, or None.
+def with_tombstone(kind: str, statement):
+    deleted = statement.cte("deleted")
+    return (
+        insert(Tombstone)
+        .from_select(["kind", "entity_id"], select(literal(kind), deleted.c.id))
+        .returning(Tombstone.entity_id)
+    )
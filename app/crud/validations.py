@@ -1,8 +1,12 @@
 
+import psycopg
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.db.models import Category, Product
+from app.core.errors import ValidationErrors
+from app.crud.category_cache import get_cached_categories
+from app.db.models import Product
 
 
 def sku_validation(db: Session, sku: str):
@@ -12,7 +16,26 @@ def sku_validation(db: Session, sku: str):
     return None
 
 def category_validation(db: Session, category_id: int):
-    category_exists = db.execute(select(Category.id).where(Category.id == category_id)).scalar_one_or_none()
-    if category_exists is None:
+    if category_id not in get_cached_categories(db, [category_id]):
         return {"field": "category_id", "message": f"category_id={category_id} does not exist"}
-    return None
\ No newline at end of file
+    return None
+
+# Writes don't pre-check uniqueness or foreign keys with extra SELECTs; the
+# constraint that rejected the statement is reported in the ValidationErrors format.
+def constraint_violation(error: IntegrityError, values: dict):
+    orig = error.orig
+    constraint = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if isinstance(orig, psycopg.errors.UniqueViolation) and constraint == "ix_products_sku":
+        return {"field": "sku", "message": f"sku={values.get('sku')} already exists"}
+    if isinstance(orig, psycopg.errors.ForeignKeyViolation):
+        if constraint == "products_category_id_fkey":
+            return {"field": "category_id", "message": f"category_id={values.get('category_id')} does not exist"}
+        if constraint == "categories_parent_id_fkey":
+            return {"field": "parent_id", "message": f"parent_id={values.get('parent_id')} does not exist"}
+    return None
+
+def raise_integrity_error(error: IntegrityError, values: dict, message: str):
+    violation = constraint_violation(error, values)
+    if violation is not None:
+        raise ValidationErrors([violation])
+    raise IntegrityError(message, error.params, error.orig)
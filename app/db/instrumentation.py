@@ -0,0 +1,44 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+
+@dataclass(slots=True)
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        # The same SQL text run again and again within one request is usually a
+        # per-row lazy load or per-item query: a likely N+1.
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+# Set by the request middleware. Sync endpoints run in the threadpool with a copy
+# of the request's context, so they record into the same object.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        # Bound parameters are placeholders in the statement text, so it is the shape.
+        stats.shapes[statement] += 1
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def server_timing(stats: RequestStats, total_seconds: float) -> str:
+    return f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} statements", total;dur={total_seconds * 1000:.2f}'
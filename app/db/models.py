@@ -1,10 +1,18 @@
+from datetime import datetime
 from typing import List
 from typing import Optional
 from decimal import Decimal
+from sqlalchemy import BigInteger
+from sqlalchemy import Computed
+from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import String
 from sqlalchemy import Text
+from sqlalchemy import func
+from sqlalchemy import literal_column
 from sqlalchemy import Numeric
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 
 from sqlalchemy.orm import DeclarativeBase
@@ -16,8 +24,31 @@ from sqlalchemy.orm import validates
 class Base(DeclarativeBase):
     pass
 
+# The writing transaction's id as a bigint. Unlike a timestamp or a sequence it
+# can be compared with pg_snapshot_xmin(), which tells the change feed when no
+# transaction that is still running can add rows below a given point.
+CURRENT_XID = "(pg_current_xact_id()::text)::bigint"
+
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Serves ILIKE '%q%' title search; only created where pg_trgm is available,
+        # and alembic/env.py keeps autogenerate from adding it anywhere else.
+        Index(
+            "ix_products_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Ordered search pages (sort=price, -price, title), with or without a
+        # category filter, read these in order instead of sorting the matches.
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        Index("ix_products_title_id", "title", "id"),
+        Index("ix_products_category_id_title_id", "category_id", "title", "id"),
+        Index("ix_products_change_xid_id", "change_xid", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
 
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -46,6 +77,24 @@ class Product(Base):
         back_populates="products"
     )
 
+    # Bumped by the update CRUD functions; feeds the ETag of product responses.
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
+    # Set on insert and on every UPDATE statement; the change feed pages by change_xid.
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now(), deferred=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=literal_column(CURRENT_XID), onupdate=literal_column(CURRENT_XID), deferred=True)
+
+    # Maintained by PostgreSQL; deferred so regular product loads don't fetch it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
  
 
 class Category(Base):
@@ -61,6 +110,15 @@ class Category(Base):
         index=True,
     )
 
+    # Bumped by the update CRUD functions; feeds the ETag of category responses.
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
+    # Set on insert and on every UPDATE statement; the change feed pages by change_xid.
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now(), deferred=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=literal_column(CURRENT_XID), onupdate=literal_column(CURRENT_XID), deferred=True)
+
+    __table_args__ = (Index("ix_categories_change_xid_id", "change_xid", "id"),)
+
     parent: Mapped[Optional["Category"]] = relationship(
         "Category",
         remote_side="Category.id",
@@ -75,4 +133,34 @@ class Category(Base):
     products: Mapped[List["Product"]] = relationship(
         "Product",
         back_populates="category",
-    )
\ No newline at end of file
+    )
+
+
+# Every (ancestor, descendant) pair of the category tree, including each
+# category with itself at depth 0. Kept in step with parent_id by the category
+# CRUD functions, so subtree lookups are an index range scan instead of a walk.
+class CategoryClosure(Base):
+    __tablename__ = "category_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    depth: Mapped[int] = mapped_column(nullable=False)
+
+
+# A product or category deleted through the CRUD functions, kept so the change
+# feed can report the deletion after the row itself is gone.
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_change_xid_id", "change_xid", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=literal_column(CURRENT_XID))
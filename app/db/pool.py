@@ -0,0 +1,128 @@
+import threading
+import time
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Time spent waiting in Pool.connect(), i.e. for a free connection (or a new
+    one to be opened), across every checkout of one engine.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds * 1000, 3),
+                "wait_ms_mean": round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class MeteredPool:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() swaps in a new pool; the figures carry over.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(MeteredPool, QueuePool):
+    pass
+
+class MeteredAsyncAdaptedQueuePool(MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+class MeteredNullPool(MeteredPool, NullPool):
+    pass
+
+
+def pool_options(settings, is_async: bool = False) -> dict:
+    options = {"pool_pre_ping": settings.db_pre_ping == "always"}
+    if settings.db_pgbouncer:
+        # PgBouncer in transaction mode can hand each transaction a different
+        # server connection, so psycopg must not prepare statements server-side.
+        options["connect_args"] = {"prepare_threshold": None}
+    if settings.db_null_pool:
+        # Let PgBouncer do the pooling: a connection per checkout, closed on release.
+        options["poolclass"] = MeteredNullPool
+        return options
+    options.update(
+        poolclass=MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    return options
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float) -> None:
+    # pool_pre_ping pings on every checkout; this only pings connections that sat
+    # idle in the pool long enough for a firewall or server timeout to drop them.
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one.
+            raise DisconnectionError() from e
+
+
+def pool_status(pool: Pool) -> dict:
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # Negative while the pool hasn't opened pool_size connections yet.
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
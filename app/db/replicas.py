@@ -0,0 +1,117 @@
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Seconds the replica is behind the primary, from the replica's own state. A
+# replica that is streaming and has replayed everything it received is current,
+# however long ago the last write was. One whose WAL receiver isn't streaming
+# (e.g. it lost the primary) has replayed all it received too, but may be far
+# behind: its lag is the age of the last replayed transaction, and unknown (so
+# unhealthy) if it hasn't replayed one. The receiver's status is only visible to
+# roles with pg_read_all_stats (e.g. via pg_monitor); without it every replica
+# is judged by the replay timestamp alone.
+REPLICA_STATE = (
+    "SELECT pg_is_in_recovery() AS in_recovery,"
+    " (SELECT status FROM pg_stat_wal_receiver) AS receiver_status,"
+    " pg_last_wal_receive_lsn() AS received,"
+    " pg_last_wal_replay_lsn() AS replayed,"
+    " pg_last_xact_replay_timestamp() AS replayed_at"
+)
+LAG_SECONDS = (
+    "CASE"
+    " WHEN NOT in_recovery THEN 0"
+    " WHEN receiver_status = 'streaming' AND received = replayed THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - replayed_at)"
+    " END"
+)
+REPLICA_LAG = text(f"SELECT {LAG_SECONDS} FROM ({REPLICA_STATE}) AS state")
+
+
+@dataclass(slots=True)
+class Replica:
+    engine: object
+    sessionmaker: object
+    healthy: bool = True
+    lag_seconds: float | None = None
+    error: str | None = None
+    checked_at: float | None = None
+    checking: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+@dataclass
+class ReplicaSet:
+    """
+    Round-robin over the replicas that passed their last health check. Checks
+    run lazily from the request path, at most once per check_interval per
+    replica; a replica that is unreachable or lagging more than max_lag_seconds
+    is skipped until a later check finds it healthy again.
+    """
+
+    replicas: list[Replica]
+    max_lag_seconds: float
+    check_interval: float
+    _counter: itertools.count = field(default_factory=itertools.count)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def rotation(self) -> list[Replica]:
+        if not self.replicas:
+            return []
+        start = next(self._counter) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def claim_check(self, replica: Replica) -> bool:
+        # Only one request re-checks a replica; the others use the last result.
+        with self._lock:
+            due = replica.checked_at is None or time.monotonic() - replica.checked_at >= self.check_interval
+            if not due or replica.checking:
+                return False
+            replica.checking = True
+            return True
+
+    def record(self, replica: Replica, lag_seconds: float | None, error: str | None = None) -> None:
+        with self._lock:
+            replica.lag_seconds = lag_seconds
+            replica.error = error
+            replica.healthy = error is None and lag_seconds is not None and lag_seconds <= self.max_lag_seconds
+            replica.checked_at = time.monotonic()
+            replica.checking = False
+
+    def status(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"replica": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds, "error": replica.error}
+                for replica in self.replicas
+            ]
+
+
+def record_lag(replicas: ReplicaSet, replica: Replica, lag) -> None:
+    if lag is None:
+        replicas.record(replica, None, "Replication lag unknown")
+    else:
+        replicas.record(replica, float(lag))
+
+def check_replica(replicas: ReplicaSet, replica: Replica) -> None:
+    try:
+        with replica.engine.connect() as conn:
+            lag = conn.execute(REPLICA_LAG).scalar_one()
+    except SQLAlchemyError as e:
+        replicas.record(replica, None, type(e).__name__)
+        return
+    record_lag(replicas, replica, lag)
+
+async def check_async_replica(replicas: ReplicaSet, replica: Replica) -> None:
+    try:
+        async with replica.engine.connect() as conn:
+            lag = (await conn.execute(REPLICA_LAG)).scalar_one()
+    except SQLAlchemyError as e:
+        replicas.record(replica, None, type(e).__name__)
+        return
+    record_lag(replicas, replica, lag)
@@ -1,19 +1,45 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import install_idle_pre_ping, pool_options
+from app.db.replicas import Replica, ReplicaSet, check_async_replica, check_replica
 
 engine = None
 SessionLocal = None
 
+async_engine = None
+AsyncSessionLocal = None
+
+replica_set = None
+async_replica_set = None
+
+def new_engine(settings, url: str, **options):
+    new = create_engine(url, echo=False, **pool_options(settings), **options)
+    instrument_engine(new)
+    if settings.db_pre_ping == "idle":
+        install_idle_pre_ping(new, settings.db_pre_ping_idle_seconds)
+    return new
+
+def new_async_engine(settings, url: str, **options):
+    # The postgresql+psycopg URL resolves to psycopg's async driver here.
+    new = create_async_engine(url, echo=False, **pool_options(settings, is_async=True), **options)
+    instrument_engine(new.sync_engine)
+    if settings.db_pre_ping == "idle":
+        install_idle_pre_ping(new.sync_engine, settings.db_pre_ping_idle_seconds)
+    return new
+
+def replica_options(settings) -> dict:
+    # A replica that doesn't answer quickly is treated as down, not waited for.
+    connect_args = pool_options(settings).get("connect_args", {})
+    return {"connect_args": {**connect_args, "connect_timeout": settings.replica_connect_timeout_seconds}}
+
 def init_engine():
     global engine, SessionLocal
     if engine is None:
         settings = get_settings()
-        engine = create_engine(
-            settings.database_url,
-            echo=False,
-            pool_pre_ping=True,
-        )
+        engine = new_engine(settings, settings.database_url)
         SessionLocal = sessionmaker(
             bind=engine,
             autoflush=False,
@@ -22,4 +48,63 @@ def init_engine():
 
 def get_session_local():
     init_engine()
-    return SessionLocal
\ No newline at end of file
+    return SessionLocal
+
+def init_async_engine():
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        settings = get_settings()
+        async_engine = new_async_engine(settings, settings.database_url)
+        # Attributes must stay loaded after commit: lazy loads can't run implicitly
+        # under asyncio, so responses are built from what is already in memory.
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+def get_async_session_local():
+    init_async_engine()
+    return AsyncSessionLocal
+
+def init_replicas():
+    global replica_set
+    if replica_set is None:
+        settings = get_settings()
+        replicas = []
+        for url in settings.replica_database_urls:
+            replica_engine = new_engine(settings, url, **replica_options(settings))
+            replicas.append(Replica(replica_engine, sessionmaker(bind=replica_engine, autoflush=False, autocommit=False)))
+        replica_set = ReplicaSet(replicas, settings.replica_max_lag_seconds, settings.replica_health_check_seconds)
+
+def init_async_replicas():
+    global async_replica_set
+    if async_replica_set is None:
+        settings = get_settings()
+        replicas = []
+        for url in settings.replica_database_urls:
+            replica_engine = new_async_engine(settings, url, **replica_options(settings))
+            replicas.append(Replica(replica_engine, async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)))
+        async_replica_set = ReplicaSet(replicas, settings.replica_max_lag_seconds, settings.replica_health_check_seconds)
+
+# Reads go to the next healthy replica, or to the primary when there is none
+# (or the caller has just written and must see its own write).
+def get_read_session_local(prefer_primary: bool = False):
+    init_replicas()
+    if not prefer_primary:
+        for replica in replica_set.rotation():
+            if replica_set.claim_check(replica):
+                check_replica(replica_set, replica)
+            if replica.healthy:
+                return replica.sessionmaker
+    return get_session_local()
+
+async def get_async_read_session_local(prefer_primary: bool = False):
+    init_async_replicas()
+    if not prefer_primary:
+        for replica in async_replica_set.rotation():
+            if async_replica_set.claim_check(replica):
+                await check_async_replica(async_replica_set, replica)
+            if replica.healthy:
+                return replica.sessionmaker
+    return get_async_session_local()
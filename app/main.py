@@ -1,12 +1,97 @@
+# Taken before anything else is imported, for the import time in the startup report.
+import time
+import_started = time.perf_counter()
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
-from app.api.routers import products, categories
+from app.api.deps import READ_PRIMARY_COOKIE
+from app.api.routers import async_categories, async_products, internal, products, categories, snapshots
+from app.core.admission import AdmissionControl
+from app.core.config import get_settings
 from app.core.errors import ValidationErrors
+from app.db.instrumentation import RequestStats, current_request_stats, server_timing
+from app.snapshots import build_periodically
+from app.warmup import StartupState, build_engines, warm_up_until_ready
 
 import psycopg
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The engines are built up front. Warm-up (pool, category cache, hot
+    # statements, serialisers) runs in the background; /internal/ready turns 200
+    # once it is done. Until then the app still serves, and anything not yet warm
+    # is set up on first use.
+    settings = get_settings()
+    app.state.startup = StartupState(import_seconds)
+    build_engines(app.state.startup)
+    tasks = []
+    if settings.warmup_on_startup:
+        tasks.append(asyncio.create_task(warm_up_until_ready(app.state.startup)))
+    else:
+        app.state.startup.ready = True
+    if settings.snapshot_interval_seconds > 0:
+        tasks.append(asyncio.create_task(build_periodically(settings.snapshot_interval_seconds)))
+    yield
+    for task in tasks:
+        task.cancel()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def read_after_write(request: Request, call_next):
+    response = await call_next(request)
+    settings = get_settings()
+    wrote = request.method not in ("GET", "HEAD", "OPTIONS") and not getattr(request.state, "read_only", False)
+    if settings.replica_database_urls and wrote and response.status_code < 400:
+        response.set_cookie(READ_PRIMARY_COOKIE, "1", max_age=settings.read_after_write_seconds, httponly=True, samesite="lax")
+    return response
+
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+    # For streamed responses this covers the work done before the first chunk.
+    elapsed = time.perf_counter() - started
+    response.headers["Server-Timing"] = server_timing(stats, elapsed)
+
+    settings = get_settings()
+    repeated = stats.repeated_shapes(settings.n_plus_one_threshold)
+    for statement, count in repeated:
+        logger.warning(json.dumps({
+            "event": "n_plus_one",
+            "method": request.method,
+            "path": request.url.path,
+            "count": count,
+            "statement": statement,
+        }))
+    if elapsed * 1000 >= settings.slow_request_ms:
+        logger.warning(json.dumps({
+            "event": "slow_request",
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "db_ms": round(stats.db_seconds * 1000, 2),
+            "statements": stats.statements,
+            "repeated_statements": len(repeated),
+        }))
+    return response
+
+# Added last, so it is the outermost middleware: a shed request costs nothing else.
+app.add_middleware(AdmissionControl)
 
 # Global error handling for ValueErrors
 @app.exception_handler(ValidationErrors)
@@ -34,5 +119,14 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
 
     return JSONResponse(status_code=status, content={"detail": detail})
 
+# Async routers take precedence for the endpoints they cover; anything they
+# don't (e.g. the NDJSON export) is still served by the sync routers.
+if get_settings().async_database:
+    app.include_router(async_products.router)
+    app.include_router(async_categories.router)
 app.include_router(products.router)
-app.include_router(categories.router)
\ No newline at end of file
+app.include_router(categories.router)
+app.include_router(snapshots.router)
+app.include_router(internal.router)
+
+import_seconds = time.perf_counter() - import_started
\ No newline at end of file
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from typing import Optional
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.common import BATCH_LIMIT, split_commas
 
 class CategoryBase(BaseModel):
     name: str = Field(min_length=1, max_length=255)
@@ -21,6 +23,28 @@ class CategoryRead(CategoryBase):
     id: int
     children: list[CategoryChildRead]
 
+# Whole hierarchy below a category, as returned by the tree endpoints.
+class CategoryTreeRead(CategoryBase):
+    id: int
+    children: list[CategoryTreeRead] = []
+
+class CategoryBatchParams(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BATCH_LIMIT)
+
+    @field_validator("ids", mode="before")
+    @classmethod
+    def split_ids(cls, value):
+        return split_commas(value)
+
+# One entry per requested id, in request order; category is None when not found.
+class CategoryBatchItem(BaseModel):
+    id: int
+    found: bool
+    category: Optional[CategoryRead] = None
+
+class CategoryBatchRead(BaseModel):
+    items: list[CategoryBatchItem]
+
 class CategoryChildRead(BaseModel):
     name: str = Field(min_length=1, max_length=255)
     id: int
@@ -0,0 +1,11 @@
+# Shared by the product and category schemas.
+
+BATCH_LIMIT = 200
+
+# Accept both a=x,y and repeated a=x&a=y in list query parameters.
+def split_commas(value):
+    if isinstance(value, str):
+        value = [value]
+    if isinstance(value, list):
+        value = [part.strip() for item in value for part in str(item).split(",") if part.strip()]
+    return value
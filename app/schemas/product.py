@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from typing_extensions import NotRequired, TypedDict
+
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 from pydantic.types import condecimal
 
 from app.schemas.category import CategoryMiniRead
+from app.schemas.common import BATCH_LIMIT, split_commas
 
 
 Money = condecimal(max_digits=12, decimal_places=2, ge=0)
@@ -42,11 +47,194 @@ class ProductRead(ProductBase):
     id: int
     category: Optional[CategoryMiniRead] = None
 
-class ProductParams(BaseModel):
+class CategoryFacet(BaseModel):
+    category_id: int
+    count: int
+
+# One histogram bucket, min inclusive and max exclusive; None is unbounded.
+class PriceBucket(BaseModel):
+    min: Optional[Decimal] = None
+    max: Optional[Decimal] = None
+    count: int
+
+class ProductFacets(BaseModel):
+    categories: list[CategoryFacet]
+    prices: list[PriceBucket]
+
+# Returned by search in cursor mode, or whenever include is set; next_cursor is
+# None on the last page and in offset mode.
+class ProductPage(BaseModel):
+    items: list[ProductRead]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    facets: Optional[ProductFacets] = None
+
+# Read-path records: built straight from database rows and serialised without
+# validation. Field order matches ProductRead, so the JSON is byte-identical.
+@dataclass(slots=True)
+class CategoryRecord:
+    id: int
+    name: str
+
+@dataclass(slots=True)
+class ProductRecord:
+    sku: str
+    title: str
+    description: Optional[str]
+    image: Optional[str]
+    price: Decimal
+    category_id: int
+    id: int
+    category: Optional[CategoryRecord]
+
+class ProductRecordPage(TypedDict):
+    items: list[ProductRecord]
+    next_cursor: Optional[str]
+    total: NotRequired[int]
+    facets: NotRequired[dict]
+
+# Sparse fieldsets (?fields=): only the requested keys are present, in ProductRead order.
+ProductField = Literal["sku", "title", "description", "image", "price", "category_id", "id", "category"]
+PRODUCT_FIELDS: tuple[str, ...] = ProductField.__args__
+
+class CategoryFields(TypedDict):
+    id: int
+    name: str
+
+class ProductFields(TypedDict, total=False):
+    sku: str
+    title: str
+    description: Optional[str]
+    image: Optional[str]
+    price: Decimal
+    category_id: int
+    id: int
+    category: Optional[CategoryFields]
+
+class ProductFieldsPage(TypedDict):
+    items: list[ProductFields]
+    next_cursor: Optional[str]
+    total: NotRequired[int]
+    facets: NotRequired[dict]
+
+class ProductFieldsParams(BaseModel):
+    fields: list[ProductField] = Field(default=[], max_length=len(PRODUCT_FIELDS))
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        return split_commas(value)
+
+# ids or skus, as ?ids=1,2,3 / ?skus=A,B or a POST body.
+class ProductBatchRequest(BaseModel):
+    ids: Optional[list[int]] = Field(default=None, min_length=1, max_length=BATCH_LIMIT)
+    skus: Optional[list[str]] = Field(default=None, min_length=1, max_length=BATCH_LIMIT)
+
+    @field_validator("ids", "skus", mode="before")
+    @classmethod
+    def split_lists(cls, value):
+        return split_commas(value)
+
+# One entry per requested key, in request order; product is None when not found.
+class ProductBatchItem(BaseModel):
+    id: Optional[int] = None
+    sku: Optional[str] = None
+    found: bool
+    product: Optional[ProductRead] = None
+
+class ProductBatchRead(BaseModel):
+    items: list[ProductBatchItem]
+
+class ProductBatchEntry(TypedDict):
+    id: NotRequired[int]
+    sku: NotRequired[str]
+    found: bool
+    product: Optional[ProductRecord]
+
+class ProductBatchPage(TypedDict):
+    items: list[ProductBatchEntry]
+
+BULK_UPDATE_LIMIT = 50_000
+
+# One row of PATCH /products/bulk: the product by id or by sku, and the fields
+# to change. sku is the lookup key here, so it can't be changed in bulk.
+class ProductBulkUpdateItem(BaseModel):
+    id: Optional[int] = Field(default=None, gt=0)
+    sku: Optional[str] = Field(default=None, min_length=1, max_length=64)
+    title: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    image: Optional[HttpUrl] = None
+    price: Optional[Money] = None
+    category_id: Optional[int] = None
+
+# Per-row errors in the ValidationErrors format, with the row's position in the request.
+class ProductBulkError(BaseModel):
+    index: int
+    field: str
+    message: str
+
+class ProductBulkUpdateResult(BaseModel):
+    updated: int
+    errors: list[ProductBulkError]
+
+class ProductChangesParams(BaseModel):
+    # Cursor from the previous response; omitted or empty starts from the beginning.
+    since: Optional[str] = Field(default=None, max_length=512)
+    limit: int = Field(100, gt=0, le=1000)
+
+class CategoryChangeRead(BaseModel):
+    id: int
+    name: str
+    parent_id: Optional[int] = None
+
+# An upsert carries the product or category as it is now; a deletion only its id.
+class ProductChange(BaseModel):
+    kind: Literal["product", "category"]
+    id: int
+    deleted: bool
+    changed_at: datetime
+    product: Optional[ProductRead] = None
+    category: Optional[CategoryChangeRead] = None
+
+class ProductChangesRead(BaseModel):
+    changes: list[ProductChange]
+    next_cursor: str
+    has_more: bool
+
+class CategoryChangeFields(TypedDict):
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+class ProductChangeEntry(TypedDict):
+    kind: str
+    id: int
+    deleted: bool
+    changed_at: datetime
+    product: NotRequired[ProductRecord]
+    category: NotRequired[CategoryChangeFields]
+
+class ProductChangesPage(TypedDict):
+    changes: list[ProductChangeEntry]
+    next_cursor: str
+    has_more: bool
+
+class ProductParams(ProductFieldsParams):
     title: Optional[str] = Field(default=None, min_length=1, max_length=255)
     sku: Optional[str] = Field(default=None, min_length=1, max_length=64)
     min_price: Optional[Decimal] = Field(default=None, ge=0)
     max_price: Optional[Decimal] = Field(default=None, ge=0)
     category_id: Optional[int] = Field(default=None, gt=0)
+    include_descendants: bool = False
+    q: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    sort: Literal["id", "-id", "price", "-price", "title", "relevance"] = "id"
     limit: Optional[int] = Field(100, gt=0, le=100)
-    offset: Optional[int] = Field(0, ge=0)
\ No newline at end of file
+    offset: Optional[int] = Field(0, ge=0)
+    after: Optional[str] = Field(default=None, max_length=512)
+    include: list[Literal["total", "facets"]] = Field(default=[], max_length=2)
+    price_edges: Optional[list[Decimal]] = Field(default=None, min_length=1, max_length=50)
+
+    @field_validator("include", "price_edges", mode="before")
+    @classmethod
+    def split_lists(cls, value):
+        return split_commas(value)
\ No newline at end of file
@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.crud.changes import TOMBSTONE_SOURCE, XID_HORIZON
+from app.crud.pagination import encode_cursor
+from app.crud.products import product_line_adapter, stream_product_records
+from app.db import session
+from app.db.models import Category
+from app.schemas.product import CategoryChangeFields
+
+# zstd is optional: without the zstandard package only gzip snapshots are built.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+EXTENSIONS = {"gzip": "gz", "zstd": "zst"}
+MEDIA_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+# Any fixed key works, as long as every worker uses the same one.
+BUILD_LOCK = 0x736e6170
+
+category_line = TypeAdapter(CategoryChangeFields)
+
+
+class CountingWriter:
+    # Sits under the compressor, so the checksum and size are of the file as served.
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.raw.write(data)
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return len(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+class SnapshotFile:
+    def __init__(self, directory: Path, table: str, compression: str):
+        self.name = f"{table}.ndjson.{EXTENSIONS[compression]}"
+        self.compression = compression
+        self.rows = 0
+        self.raw = open(directory / self.name, "wb")
+        self.counter = CountingWriter(self.raw)
+        if compression == "gzip":
+            # mtime=0 keeps the bytes, and so the checksum, a function of the rows alone.
+            self.writer = gzip.GzipFile(fileobj=self.counter, mode="wb", compresslevel=6, mtime=0)
+        else:
+            self.writer = zstandard.ZstdCompressor(level=3).stream_writer(self.counter, closefd=False)
+
+    def write(self, lines: list[bytes]):
+        if lines:
+            self.writer.write(b"\n".join(lines) + b"\n")
+            self.rows += len(lines)
+
+    def close(self) -> dict:
+        self.writer.close()
+        self.raw.close()
+        return {"format": self.compression, "rows": self.rows, "bytes": self.counter.bytes, "sha256": self.counter.sha256.hexdigest()}
+
+
+def write_table(directory: Path, table: str, formats: list[str], chunks) -> dict:
+    files = [SnapshotFile(directory, table, compression) for compression in formats]
+    try:
+        for lines in chunks:
+            for file in files:
+                file.write(lines)
+    finally:
+        summary = {file.name: file.close() for file in files}
+    return summary
+
+
+def product_lines(db: Session, chunk_size: int):
+    for records in stream_product_records(db, chunk_size):
+        yield [product_line_adapter.dump_json(record) for record in records]
+
+
+def category_lines(db: Session, chunk_size: int):
+    statement = select(Category.id, Category.name, Category.parent_id).order_by(Category.id).execution_options(yield_per=chunk_size)
+    for rows in db.execute(statement).partitions():
+        yield [category_line.dump_json({"id": row.id, "name": row.name, "parent_id": row.parent_id}) for row in rows]
+
+
+def read_manifest(directory: str | Path) -> dict | None:
+    try:
+        return json.loads((Path(directory) / MANIFEST).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def build_snapshot(bind: Engine, directory: str | Path, formats: list[str], keep: int = 2, chunk_size: int = 1000) -> dict:
+    # Products and categories as compressed NDJSON in a new generation
+    # directory, then manifest.json is pointed at it. Both tables are read in one
+    # REPEATABLE READ transaction, so the files agree with each other and with
+    # the change feed cursor recorded in the manifest. The build opens its own
+    # session so the isolation level is set before that transaction begins.
+    if "zstd" in formats and zstandard is None:
+        raise RuntimeError("zstd snapshots need the zstandard package.")
+    root = Path(directory)
+    generated_at = datetime.now(timezone.utc)
+    generation = f"{generated_at:%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex[:8]}"
+    target = root / generation
+    target.mkdir(parents=True)
+
+    try:
+        with Session(bind.execution_options(isolation_level="REPEATABLE READ")) as db:
+            # Everything below the snapshot's xmin is in the files; consumers
+            # resume the change feed from there. Changes between xmin and the
+            # snapshot may be sent again, which upserts and tombstones tolerate.
+            horizon = db.execute(select(XID_HORIZON)).scalar_one()
+            files = write_table(target, "products", formats, product_lines(db, chunk_size))
+            files.update(write_table(target, "categories", formats, category_lines(db, chunk_size)))
+    except BaseException:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+
+    manifest = {
+        "generation": generation,
+        "generated_at": generated_at.isoformat(),
+        "changes_cursor": encode_cursor("changes", [horizon - 1, TOMBSTONE_SOURCE, 2**63 - 1]),
+        "files": files,
+    }
+    # Published by an atomic rename: readers see the old manifest or the new one.
+    staging = root / f".{MANIFEST}.{generation}"
+    staging.write_text(json.dumps(manifest, indent=2))
+    os.replace(staging, root / MANIFEST)
+
+    # Older generations are dropped; downloads already open keep their file.
+    generations = sorted(path for path in root.iterdir() if path.is_dir() and not path.name.startswith("."))
+    for path in generations[:-max(keep, 1)]:
+        shutil.rmtree(path, ignore_errors=True)
+    return manifest
+
+
+def build_if_free(bind: Engine, directory: str | Path, formats: list[str], keep: int, chunk_size: int) -> dict | None:
+    # With several workers running the periodic build, one builds and the others
+    # skip. The lock is session-level, so it is taken and released on one
+    # dedicated connection held for the whole build, not on whichever pooled
+    # connection the build happens to check out.
+    with bind.connect() as lock:
+        acquired = lock.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": BUILD_LOCK}).scalar()
+        lock.commit()
+        if not acquired:
+            return None
+        try:
+            return build_snapshot(bind, directory, formats, keep, chunk_size)
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BUILD_LOCK})
+            lock.commit()
+
+
+def scheduled_build() -> dict | None:
+    settings = get_settings()
+    session.init_engine()
+    return build_if_free(session.engine, settings.snapshot_dir, settings.snapshot_formats, settings.snapshot_keep, settings.export_chunk_size)
+
+
+async def build_periodically(interval: float):
+    # Started by the app lifespan when snapshot_interval_seconds > 0.
+    while True:
+        try:
+            manifest = await asyncio.to_thread(scheduled_build)
+            if manifest is not None:
+                logger.info("Built catalog snapshot %s", manifest["generation"])
+        except Exception:
+            logger.exception("Catalog snapshot build failed")
+        await asyncio.sleep(interval)
+
+
+def main(argv=None):
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.snapshots", description="Build a catalog snapshot.")
+    parser.add_argument("--dir", default=settings.snapshot_dir)
+    parser.add_argument("--formats", default=",".join(settings.snapshot_formats), help="comma-separated: gzip, zstd")
+    parser.add_argument("--keep", type=int, default=settings.snapshot_keep, help="generations to keep")
+    args = parser.parse_args(argv)
+
+    session.init_engine()
+    manifest = build_if_free(session.engine, args.dir, args.formats.split(","), args.keep, settings.export_chunk_size)
+    if manifest is None:
+        sys.exit("Another snapshot build is running; try again once it has finished.")
+    json.dump(manifest, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
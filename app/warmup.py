@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.routers import async_categories, async_products
+from app.api.routers.categories import category_adapter, category_json
+from app.api.routers.products import product_json, product_record_adapter, search_json
+from app.core.config import get_settings
+from app.crud.async_categories import category_version as async_category_version
+from app.crud.async_products import product_version as async_product_version, search_product_records as async_search_product_records
+from app.crud.categories import category_version
+from app.crud.category_cache import load_category_cache
+from app.crud.products import product_version, search_product_records
+from app.db import session
+from app.schemas.product import CategoryRecord, ProductParams, ProductRead, ProductRecord
+
+logger = logging.getLogger(__name__)
+
+# The reads every cold worker would otherwise compile and plan on its first
+# requests: default and text search, and the by-id lookups with and without fields.
+WARM_SEARCHES = (ProductParams(), ProductParams(q="warm-up"))
+WARM_FIELDS = ((), ("id", "title", "price", "category"))
+
+
+class StartupState:
+    """
+    What the readiness endpoint reports: how long the app took to import and to
+    warm up, step by step. ready flips once warm-up has finished. The lifespan
+    keeps one on app.state.startup.
+    """
+
+    def __init__(self, import_seconds: float | None = None):
+        self.ready = False
+        self.attempts = 0
+        self.import_seconds = import_seconds
+        self.warmup_seconds: float | None = None
+        self.steps: dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - started
+
+    def report(self) -> dict:
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 2)
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "import_ms": ms(self.import_seconds),
+            "warmup_ms": ms(self.warmup_seconds),
+            "steps_ms": {name: ms(seconds) for name, seconds in self.steps.items()},
+        }
+
+
+def warm_pool(engine, size: int) -> None:
+    # Opening them all at once leaves pool_size connections idle in the pool,
+    # each already connected (and the dialect's type info loaded on the first).
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_statements(SessionLocal) -> None:
+    with SessionLocal() as db:
+        load_category_cache(db)
+        found = [search_product_records(db, query) for query in WARM_SEARCHES]
+        for query, result in zip(WARM_SEARCHES, found):
+            search_json(query, result)
+        records = found[0]
+        product_id = records[0].id if records else 0
+        category_id = records[0].category_id if records else 0
+        product_version(db, product_id)
+        for fields in WARM_FIELDS:
+            product_json(db, product_id, fields)
+        category_version(db, category_id)
+        category_json(db, category_id)
+        db.rollback()
+
+
+def warm_serialisers() -> None:
+    # Whatever the catalog holds, every response model serialises at least once.
+    category = CategoryRecord(id=1, name="Warm-up")
+    record = ProductRecord(sku="WARM-UP", title="Warm-up", description=None, image=None, price=Decimal("1.00"), category_id=1, id=1, category=category)
+    product_record_adapter.dump_json([record])
+    ProductRead.model_validate(record, from_attributes=True).model_dump_json()
+    category_adapter.dump_json(category_adapter.validate_python({"id": 1, "name": "Warm-up", "parent_id": None, "children": []}))
+
+
+def build_engines(state: StartupState) -> None:
+    # Called by the lifespan before the first request; creating the engines opens
+    # no connection yet, so this never waits on the database.
+    with state.step("engines"):
+        session.init_engine()
+        session.init_replicas()
+        if get_settings().async_database:
+            session.init_async_engine()
+            session.init_async_replicas()
+
+
+def warm_up(state: StartupState) -> None:
+    settings = get_settings()
+    SessionLocal = session.get_session_local()
+    if not settings.db_null_pool:
+        with state.step("pool"):
+            warm_pool(session.engine, settings.db_pool_size)
+    for index, replica in enumerate(session.replica_set.replicas):
+        # A replica that is down is skipped here, as it is by the read path.
+        try:
+            with state.step(f"replica_{index}"):
+                if not settings.db_null_pool:
+                    warm_pool(replica.engine, settings.db_pool_size)
+                warm_statements(replica.sessionmaker)
+        except SQLAlchemyError:
+            logger.warning("Could not warm up a replica", exc_info=True)
+    with state.step("statements"):
+        warm_statements(SessionLocal)
+    with state.step("serialisers"):
+        warm_serialisers()
+
+
+async def warm_up_async(state: StartupState) -> None:
+    settings = get_settings()
+    AsyncSessionLocal = session.get_async_session_local()
+    if not settings.db_null_pool:
+        with state.step("async_pool"):
+            connections = await asyncio.gather(*(session.async_engine.connect() for _ in range(settings.db_pool_size)))
+            for connection in connections:
+                await connection.close()
+    with state.step("async_statements"):
+        async with AsyncSessionLocal() as db:
+            found = [await async_search_product_records(db, query) for query in WARM_SEARCHES]
+            records = found[0]
+            product_id = records[0].id if records else 0
+            category_id = records[0].category_id if records else 0
+            await async_product_version(db, product_id)
+            for fields in WARM_FIELDS:
+                await async_products.product_json(db, product_id, fields)
+            await async_category_version(db, category_id)
+            await async_categories.category_json(db, category_id)
+
+
+async def warm_up_until_ready(state: StartupState) -> None:
+    # Started by the lifespan: the app already serves, but /internal/ready
+    # answers 503 until this finishes. While the database is unreachable it
+    # keeps retrying.
+    settings = get_settings()
+    started = time.perf_counter()
+    while True:
+        state.attempts += 1
+        try:
+            await asyncio.to_thread(warm_up, state)
+            if settings.async_database:
+                await warm_up_async(state)
+            break
+        except SQLAlchemyError:
+            logger.warning("Warm-up failed, retrying in %ss", settings.warmup_retry_seconds, exc_info=True)
+            await asyncio.sleep(settings.warmup_retry_seconds)
+    state.warmup_seconds = time.perf_counter() - started
+    state.ready = True
+    logger.info(json.dumps({"event": "startup", **state.report()}))
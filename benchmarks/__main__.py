@@ -0,0 +1,123 @@
+import argparse
+import json
+import platform
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+
+from app.core.config import get_settings
+from benchmarks.catalog import load_catalog
+from benchmarks.read_paths import compare_read_paths
+from benchmarks.runner import compare, in_process_client, run_scenario, uvicorn_client
+from benchmarks.scenarios import SCENARIOS, load_context
+
+
+def default_database_url() -> str:
+    # Never DATABASE_URL: load truncates the catalog, and run writes to it.
+    return get_settings().test_database_url
+
+
+def load(args):
+    engine = create_engine(args.database_url)
+    print(json.dumps(load_catalog(engine, args.categories, args.products, args.seed)))
+
+
+def run(args):
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    engine = create_engine(args.database_url)
+    run_id = uuid.uuid4().hex[:8]
+    if args.target == "inprocess":
+        target = in_process_client(args.database_url)
+    else:
+        target = uvicorn_client(args.database_url, args.url, args.port, args.workers)
+
+    report = {
+        "target": args.target,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "async_database": get_settings().async_database,
+        "scenarios": {},
+    }
+    with target as (client, counter):
+        for name in names:
+            # Requests are generated up front from the seed, so two runs send the same sequence.
+            ctx = load_context(engine, args.seed, run_id)
+            requests = [SCENARIOS[name](ctx) for _ in range(args.warmup + args.requests)]
+            report["scenarios"][name] = run_scenario(client, counter, requests, args.concurrency, args.warmup)
+            print(f"{name}: {report['scenarios'][name]['throughput_rps']} req/s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+def read_paths(args):
+    engine = create_engine(args.database_url)
+    row_counts = [int(rows) for rows in args.rows.split(",")]
+    print(json.dumps(compare_read_paths(engine, row_counts, args.repeat), indent=2))
+
+
+def compare_reports(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(json.dumps(compare(base, new), indent=2))
+
+
+def main(argv=None):
+    database_url = default_database_url()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = commands.add_parser("load", help="Replace the catalog with a synthetic one")
+    load_parser.add_argument("--categories", type=int, default=200)
+    load_parser.add_argument("--products", type=int, default=100_000)
+    load_parser.add_argument("--seed", type=int, default=0)
+    load_parser.add_argument("--database-url", default=database_url or None, required=not database_url, help="Defaults to TEST_DATABASE_URL")
+    load_parser.set_defaults(func=load)
+
+    run_parser = commands.add_parser("run", help="Run scenarios and report latency as JSON")
+    run_parser.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    run_parser.add_argument("--url", help="Existing server to benchmark instead of starting uvicorn")
+    run_parser.add_argument("--port", type=int, default=8765)
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--scenarios", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    run_parser.add_argument("--requests", type=int, default=200)
+    run_parser.add_argument("--warmup", type=int, default=10)
+    run_parser.add_argument("--concurrency", type=int, default=1)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output")
+    run_parser.add_argument("--database-url", default=database_url or None, required=not database_url, help="Defaults to TEST_DATABASE_URL")
+    run_parser.set_defaults(func=run)
+
+    paths_parser = commands.add_parser("read-paths", help="Time the ORM and record read paths side by side")
+    paths_parser.add_argument("--rows", default="100,10000")
+    paths_parser.add_argument("--repeat", type=int, default=20)
+    paths_parser.add_argument("--database-url", default=database_url or None, required=not database_url, help="Defaults to TEST_DATABASE_URL")
+    paths_parser.set_defaults(func=read_paths)
+
+    compare_parser = commands.add_parser("compare", help="Relative change between two run reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.set_defaults(func=compare_reports)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
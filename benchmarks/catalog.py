@@ -0,0 +1,88 @@
+import random
+from decimal import Decimal
+
+from sqlalchemy import Engine, text
+
+# Small vocabulary so title and full-text searches hit a realistic share of rows.
+ADJECTIVES = ["wireless", "organic", "compact", "premium", "vintage", "smart", "portable", "classic", "ultra", "eco"]
+NOUNS = ["phone", "case", "charger", "shirt", "jacket", "lamp", "mug", "backpack", "speaker", "watch", "bottle", "chair"]
+MATERIALS = ["cotton", "steel", "bamboo", "leather", "glass", "aluminium", "wool", "ceramic"]
+DEPARTMENTS = ["Electronics", "Clothing", "Home", "Garden", "Sports", "Toys", "Books", "Kitchen", "Beauty", "Office"]
+
+
+def category_tree(count: int, rng: random.Random, max_depth: int = 4) -> list[tuple[int, str, int | None]]:
+    # Rows of (id, name, parent_id) with ids 1..count. A handful of roots, then
+    # each category hangs under an earlier one, shallow parents preferred, which
+    # gives the wide-at-the-top shape of a real storefront.
+    roots = max(1, min(len(DEPARTMENTS), count // 20 or 1))
+    rows = []
+    depth = {}
+    eligible = []
+    cum_weights = []
+    for id in range(1, count + 1):
+        if id <= roots:
+            parent_id = None
+            depth[id] = 0
+        else:
+            parent_id = rng.choices(eligible, cum_weights=cum_weights)[0]
+            depth[id] = depth[parent_id] + 1
+        if depth[id] < max_depth - 1:
+            eligible.append(id)
+            cum_weights.append((cum_weights[-1] if cum_weights else 0) + 1 / (depth[id] + 1) ** 2)
+        name = DEPARTMENTS[id - 1] if parent_id is None else f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()}s {id}"
+        rows.append((id, name, parent_id))
+    return rows
+
+
+def closure_rows(tree: list[tuple[int, str, int | None]]):
+    # (ancestor_id, descendant_id, depth) for every category and each of its ancestors.
+    parents = {id: parent_id for id, _, parent_id in tree}
+    for id in parents:
+        ancestor, depth = id, 0
+        while ancestor is not None:
+            yield (ancestor, id, depth)
+            ancestor, depth = parents[ancestor], depth + 1
+
+
+def product_rows(count: int, category_ids: list[int], rng: random.Random):
+    # Category popularity is skewed (1/rank), so some categories hold most of the catalog.
+    weights = [1 / rank for rank in range(1, len(category_ids) + 1)]
+    popular = category_ids[:]
+    rng.shuffle(popular)
+    for n in range(1, count + 1):
+        adjective, noun, material = rng.choice(ADJECTIVES), rng.choice(NOUNS), rng.choice(MATERIALS)
+        price = Decimal(str(round(min(rng.lognormvariate(3.5, 1.2), 99999), 2))).quantize(Decimal("0.01"))
+        yield (
+            f"BENCH-{n:08d}",
+            f"{adjective.title()} {material.title()} {noun.title()} {n}",
+            f"A {adjective} {noun} made of {material}.",
+            price,
+            rng.choices(popular, weights)[0],
+        )
+
+
+def load_catalog(engine: Engine, categories: int, products: int, seed: int = 0) -> dict:
+    """
+    Replaces the catalog with a deterministic synthetic one: the same seed and
+    sizes always produce the same rows. The tables are truncated first, so only
+    point this at a database you can throw away.
+    """
+    rng = random.Random(seed)
+    tree = category_tree(categories, rng)
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE products, category_closure, categories, tombstones RESTART IDENTITY CASCADE"))
+        cursor = conn.connection.driver_connection.cursor()
+        with cursor.copy("COPY categories (id, name, parent_id) FROM STDIN") as copy:
+            for row in tree:
+                copy.write_row(row)
+        conn.execute(text("SELECT setval(pg_get_serial_sequence('categories', 'id'), :last)"), {"last": categories})
+        with cursor.copy("COPY category_closure (ancestor_id, descendant_id, depth) FROM STDIN") as copy:
+            for row in closure_rows(tree):
+                copy.write_row(row)
+        with cursor.copy("COPY products (sku, title, description, price, category_id) FROM STDIN") as copy:
+            for row in product_rows(products, [id for id, _, _ in tree], rng):
+                copy.write_row(row)
+    # Fresh statistics, so plans match what a long-lived database would pick.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE categories, category_closure, products"))
+    return {"categories": categories, "products": products, "seed": seed}
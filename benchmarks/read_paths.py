@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from app.api.routers.products import product_record_adapter, search_json
+from app.crud.category_cache import attach_cached_categories, load_category_cache
+from app.crud.products import facets_statement, product_record, product_records_statement, search_page, search_product_records, search_statement
+from app.db.models import Product
+from app.schemas.product import ProductPage, ProductParams, ProductRead
+
+orm_list_adapter = TypeAdapter(list[ProductRead])
+orm_search_adapter = TypeAdapter(list[ProductRead] | ProductPage)
+
+
+# The list path before records: ORM entities, cached categories attached, then
+# from_attributes validation into ProductRead and serialisation.
+def orm_list(db: Session, rows: int) -> bytes:
+    products = db.execute(select(Product).order_by(Product.id).limit(rows)).scalars().all()
+    attach_cached_categories(db, products)
+    return orm_list_adapter.dump_json(orm_list_adapter.validate_python(products, from_attributes=True))
+
+def record_list(db: Session, rows: int) -> bytes:
+    return product_record_adapter.dump_json([product_record(row) for row in db.execute(product_records_statement().limit(rows))])
+
+# The search path before records: the same statement selecting ORM entities.
+def orm_search(db: Session, query: ProductParams) -> bytes:
+    rows = db.execute(search_statement(query)).all()
+    attach_cached_categories(db, [row[0] for row in rows])
+    facets = None
+    if query.include:
+        facets = rows[0][-1] if rows else db.execute(facets_statement(query)).scalar_one()
+    result = search_page(query, rows, facets)
+    return orm_search_adapter.dump_json(orm_search_adapter.validate_python(result, from_attributes=True), exclude_unset=True)
+
+def record_search(db: Session, query: ProductParams) -> bytes:
+    return search_json(query, search_product_records(db, query))
+
+
+def time_path(engine: Engine, path, argument, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        # A fresh session each time, as per request, so the identity map starts empty.
+        with Session(engine) as db:
+            started = time.perf_counter()
+            body = path(db, argument)
+            timings.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(timings) * 1000, 3), "min_ms": round(min(timings) * 1000, 3), "bytes": len(body)}
+
+
+def compare_read_paths(engine: Engine, row_counts: list[int], repeat: int) -> dict:
+    with Session(engine) as db:
+        load_category_cache(db)
+    report = {}
+    cases = [(f"list_{rows}", orm_list, record_list, rows) for rows in row_counts]
+    cases.append(("search_100", orm_search, record_search, ProductParams(title="e", limit=100)))
+    for name, before, after, argument in cases:
+        # One untimed run each warms the connection pool and statement caches.
+        time_path(engine, before, argument, 1)
+        time_path(engine, after, argument, 1)
+        orm = time_path(engine, before, argument, repeat)
+        records = time_path(engine, after, argument, repeat)
+        report[name] = {"orm": orm, "records": records, "speedup": round(orm["median_ms"] / records["median_ms"], 2)}
+    return report
@@ -0,0 +1,173 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from benchmarks.scenarios import Request
+
+
+class StatementCounter:
+    """
+    Counts the SQL statements the in-process app sends, across every engine it
+    uses, so each scenario can report queries per request. Unlike Server-Timing,
+    this includes statements run after a streamed response has started.
+    """
+
+    def __init__(self, engines):
+        self.count = 0
+        self._engines = engines
+        self._lock = threading.Lock()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.count += 1
+
+    def __enter__(self):
+        for engine in self._engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+@contextmanager
+def in_process_client(database_url: str):
+    # Settings must point at the benchmark database before the app is imported:
+    # app.main reads them to pick the sync or async routers.
+    get_settings().database_url = database_url
+    from fastapi.testclient import TestClient
+    from app.db import session
+    from app.main import app
+
+    with TestClient(app) as client:
+        session.init_engine()
+        session.init_async_engine()
+        with StatementCounter([session.engine, session.async_engine.sync_engine]) as counter:
+            yield client, counter
+
+
+@contextmanager
+def uvicorn_client(database_url: str, url: str | None = None, port: int = 8765, workers: int = 1):
+    # Either an already running server (url), or a local uvicorn started for the run.
+    if url:
+        with httpx.Client(base_url=url, timeout=60) as client:
+            yield client, None
+        return
+    env = {**os.environ, "DATABASE_URL": database_url}
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(command, env=env)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    client.get("/categories/")
+                    break
+                except httpx.TransportError:
+                    if process.poll() is not None or time.monotonic() > deadline:
+                        raise SystemExit("uvicorn did not start")
+                    time.sleep(0.2)
+            yield client, None
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    # Nearest-rank on sorted values.
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values) + 0.5 - 1e-9))
+    return values[min(rank, len(values)) - 1]
+
+
+SERVER_TIMING_STATEMENTS = re.compile(r'db;[^,]*desc="(\d+) statements"')
+
+def reported_statements(response) -> int | None:
+    # Out of process, the statement count comes from the Server-Timing header.
+    match = SERVER_TIMING_STATEMENTS.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def send(client, request: Request):
+    return client.request(request.method, request.path, params=request.params, json=request.json)
+
+
+def run_scenario(client, counter: StatementCounter | None, requests: list[Request], concurrency: int = 1, warmup: int = 0) -> dict:
+    for request in requests[:warmup]:
+        send(client, request)
+    requests = requests[warmup:]
+
+    latencies = []
+    statuses = Counter()
+    reported = []
+    lock = threading.Lock()
+
+    def worker(batch):
+        for request in batch:
+            start = time.perf_counter()
+            response = send(client, request)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] += 1
+                reported.append(reported_statements(response))
+
+    queries_before = counter.count if counter else 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, [requests[i::concurrency] for i in range(concurrency)]))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    if counter is not None:
+        queries = counter.count - queries_before
+    elif reported and None not in reported:
+        queries = sum(reported)
+    else:
+        queries = None
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(seconds, 4),
+        "throughput_rps": round(len(latencies) / seconds, 2) if seconds else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(milliseconds), 3) if milliseconds else 0.0,
+            "p50": round(percentile(milliseconds, 50), 3),
+            "p95": round(percentile(milliseconds, 95), 3),
+            "p99": round(percentile(milliseconds, 99), 3),
+        },
+        "queries_per_request": round(queries / len(latencies), 2) if queries is not None and latencies else None,
+    }
+
+
+def compare(base: dict, new: dict) -> dict:
+    # Relative change per scenario; negative latency and positive throughput are better.
+    def change(old, value):
+        return None if not old or value is None else round((value - old) / old * 100, 1)
+
+    result = {}
+    for name, scenario in new["scenarios"].items():
+        previous = base["scenarios"].get(name)
+        if previous is None:
+            continue
+        result[name] = {
+            "throughput_rps_pct": change(previous["throughput_rps"], scenario["throughput_rps"]),
+            **{f"{key}_pct": change(previous["latency_ms"][key], scenario["latency_ms"][key]) for key in ("p50", "p95", "p99")},
+            "queries_per_request": [previous["queries_per_request"], scenario["queries_per_request"]],
+        }
+    return result
@@ -0,0 +1,98 @@
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Engine, func, select
+
+from app.crud.pagination import encode_cursor
+from app.db.models import Category, Product
+from benchmarks.catalog import ADJECTIVES, MATERIALS, NOUNS
+
+
+@dataclass(frozen=True, slots=True)
+class Request:
+    method: str
+    path: str
+    params: dict | None = None
+    json: dict | None = None
+
+
+@dataclass(slots=True)
+class Context:
+    # What scenarios may reference: the id range of the loaded catalog.
+    rng: random.Random
+    max_product_id: int
+    category_ids: list[int]
+    run_id: str
+    sequence: itertools.count
+
+    def product_id(self) -> int:
+        return self.rng.randint(1, self.max_product_id)
+
+
+def load_context(engine: Engine, seed: int, run_id: str) -> Context:
+    with engine.connect() as conn:
+        max_product_id = conn.execute(select(func.max(Product.id))).scalar_one()
+        category_ids = conn.execute(select(Category.id).order_by(Category.id)).scalars().all()
+    if not max_product_id:
+        raise SystemExit("No products loaded; run `python -m benchmarks load` first.")
+    return Context(random.Random(seed), max_product_id, list(category_ids), run_id, itertools.count(1))
+
+
+def list_products(ctx: Context) -> Request:
+    return Request("GET", "/products/")
+
+def get_product(ctx: Context) -> Request:
+    return Request("GET", f"/products/{ctx.product_id()}")
+
+def search_title(ctx: Context) -> Request:
+    return Request("GET", "/products/search", {"title": ctx.rng.choice(NOUNS), "limit": 20})
+
+def search_full_text(ctx: Context) -> Request:
+    q = f"{ctx.rng.choice(ADJECTIVES)} {ctx.rng.choice(NOUNS)}"
+    return Request("GET", "/products/search", {"q": q, "sort": "relevance", "limit": 20})
+
+def search_filters(ctx: Context) -> Request:
+    low = ctx.rng.choice([0, 10, 25, 50])
+    params = {"min_price": low, "max_price": low * 4 + 50, "category_id": ctx.rng.choice(ctx.category_ids), "limit": 20}
+    return Request("GET", "/products/search", params)
+
+def search_deep_offset(ctx: Context) -> Request:
+    return Request("GET", "/products/search", {"limit": 100, "offset": ctx.rng.randint(0, max(0, ctx.max_product_id - 100))})
+
+def search_cursor(ctx: Context) -> Request:
+    # The same depths as search_deep_offset, reached by a cursor on the last id
+    # served instead of an offset, as a client paging with next_cursor would.
+    after = encode_cursor("id", [ctx.rng.randint(0, max(0, ctx.max_product_id - 100))])
+    return Request("GET", "/products/search", {"limit": 100, "after": after})
+
+def search_facets(ctx: Context) -> Request:
+    return Request("GET", "/products/search", {"title": ctx.rng.choice(MATERIALS), "include": "total,facets", "limit": 20})
+
+def create_product(ctx: Context) -> Request:
+    n = next(ctx.sequence)
+    payload = {
+        "sku": f"RUN-{ctx.run_id}-{n}",
+        "title": f"Benchmark Product {n}",
+        "price": "19.99",
+        "category_id": ctx.rng.choice(ctx.category_ids),
+    }
+    return Request("POST", "/products/", json=payload)
+
+def patch_product(ctx: Context) -> Request:
+    return Request("PATCH", f"/products/{ctx.product_id()}", json={"price": f"{ctx.rng.randint(1, 500)}.00"})
+
+
+SCENARIOS: dict[str, Callable[[Context], Request]] = {
+    "list": list_products,
+    "get": get_product,
+    "search_title": search_title,
+    "search_full_text": search_full_text,
+    "search_filters": search_filters,
+    "search_deep_offset": search_deep_offset,
+    "search_cursor": search_cursor,
+    "search_facets": search_facets,
+    "create": create_product,
+    "patch": patch_product,
+}
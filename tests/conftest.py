@@ -1,17 +1,34 @@
 import pytest
 
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.api.routers import async_categories, async_products
 from app.core.config import get_settings
-from app.main import app
-from app.api.deps import get_db
-from app.db.models import Product, Category
+from app.core.errors import ValidationErrors
+from app.crud.categories import create_category_crud
+from app.crud.category_cache import get_category_cache
+from app.db.instrumentation import instrument_engine
+from app.main import app, integrity_error_handler, validation_errors_handler
+from app.api.deps import get_async_db, get_async_read_db, get_db, get_read_db
+from app.db.models import Product, Category, Tombstone
+from app.schemas.category import CategoryCreate
 
 settings = get_settings()
+# Anything the app connects to on its own (e.g. the startup cache preload) must
+# hit the test database too.
+settings.database_url = settings.test_database_url
+# The background warm-up would touch the category cache while tests inspect it;
+# tests/test_warmup.py turns it back on.
+settings.warmup_on_startup = False
 
 engine = create_engine(settings.test_database_url, pool_pre_ping=True)
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
@@ -40,22 +57,50 @@ def client(db_session: Session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def async_client():
+    """
+    Provides a TestClient for an app serving only the async routers, backed by
+    an AsyncSession on the test database. NullPool keeps connections from
+    outliving the event loop of the client that opened them.
+    """
+    async_engine = create_async_engine(settings.test_database_url, poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.add_exception_handler(ValidationErrors, validation_errors_handler)
+    async_app.add_exception_handler(IntegrityError, integrity_error_handler)
+    async_app.include_router(async_products.router)
+    async_app.include_router(async_categories.router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[get_async_read_db] = override_get_async_db
+    with TestClient(async_app) as c:
+        yield c
+
+
 @pytest.fixture(scope="function", autouse=True)
 def clean_db(db_session: Session):
     """
     Ensures the test DB is clean before each test.
     We delete in dependency order to avoid FK issues:
-      products -> categories
+      products -> categories, then the change feed's tombstones
     """
     # Use ORM deletes (simple and clear).
     db_session.query(Product).delete()
     db_session.query(Category).delete()
+    db_session.query(Tombstone).delete()
     db_session.commit()
+    get_category_cache().clear()
 
 
 @pytest.fixture(scope="function")
@@ -64,16 +109,12 @@ def seed_data(db_session: Session):
     Inserts a small deterministic dataset for search tests.
     Returns a dict with created entities for convenience.
     """
-    cat_electronics = Category(name="Electronics", parent_id=None)
-    cat_clothing = Category(name="Clothing", parent_id=None)
-    db_session.add_all([cat_electronics, cat_clothing])
-    db_session.commit()
-    db_session.refresh(cat_electronics)
-    db_session.refresh(cat_clothing)
-    cat_tshirts = Category(name="T-Shirts", parent_id=cat_clothing.id)
-    db_session.add(cat_tshirts)
-    db_session.commit()
-    db_session.refresh(cat_tshirts)
+    # Categories go through the CRUD functions so category_closure is filled in
+    # as well; they are then loaded into the session like the products below.
+    electronics = create_category_crud(db_session, CategoryCreate(name="Electronics"))
+    clothing = create_category_crud(db_session, CategoryCreate(name="Clothing"))
+    tshirts = create_category_crud(db_session, CategoryCreate(name="T-Shirts", parent_id=clothing.id))
+    cat_electronics, cat_clothing, cat_tshirts = (db_session.get(Category, category.id) for category in (electronics, clothing, tshirts))
 
     products = [
         Product(
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import Gate, get_admission, route_class
+
+
+@pytest.mark.parametrize(("method", "path", "expected"), [
+    ("GET", "/products/7", "lookup"),
+    ("GET", "/categories/3", "lookup"),
+    ("GET", "/products/", "heavy"),
+    ("GET", "/products/search", "heavy"),
+    ("POST", "/products/batch", "heavy"),
+    ("PATCH", "/products/7", "write"),
+    ("POST", "/categories/", "write"),
+    ("GET", "/internal/metrics", None),
+    ("GET", "/snapshots/manifest", None),
+])
+def test_route_classes(method, path, expected):
+    assert route_class(method, path) == expected
+
+
+def test_gate_queues_then_sheds():
+    async def scenario():
+        gate = Gate(limit=1, queue_size=1)
+        assert await gate.acquire(1)
+        queued = asyncio.create_task(gate.acquire(1))
+        await asyncio.sleep(0)
+        # Slot taken and queue full: rejected at once.
+        assert not await gate.acquire(1)
+        assert gate.stats()["queued"] == 1
+
+        gate.release()
+        assert await queued
+        assert not await gate.acquire(0.01)
+        gate.release()
+        return gate.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats == {"limit": 1, "queue_size": 1, "active": 0, "queued": 0, "admitted": 2, "waited": 1, "rejected": 1, "timed_out": 1}
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        gate = Gate(limit=1, queue_size=1)
+        await gate.acquire(1)
+        waiter = asyncio.create_task(gate.acquire(1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        gate.release()
+        return gate.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["active"], stats["queued"]) == (0, 0)
+
+
+def test_overloaded_route_class_gets_503(client, seed_data, monkeypatch):
+    gate = get_admission().gates["heavy"]
+    monkeypatch.setattr(gate, "limit", 0)
+    monkeypatch.setattr(gate, "queue_size", 0)
+    rejected = gate.rejected
+
+    resp = client.get("/products/search")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+    # Other route classes are unaffected.
+    assert client.get(f"/products/{seed_data['products'][0].id}").status_code == 200
+    stats = client.get("/internal/metrics").json()["admission"]
+    assert stats["heavy"]["rejected"] == rejected + 1
+    assert stats["lookup"]["active"] == 0
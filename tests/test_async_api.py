@@ -0,0 +1,67 @@
+def test_async_list_and_get_products(async_client, seed_data):
+    resp = async_client.get("/products/")
+    assert resp.status_code == 200
+    assert {p["sku"] for p in resp.json()} == {"SKU-CASE-001", "SKU-PHONE-001", "SKU-TSHIRT-001"}
+
+    product_id = seed_data["products"][0].id
+    resp = async_client.get(f"/products/{product_id}")
+    assert resp.status_code == 200
+    assert resp.json()["category"]["name"] == "Electronics"
+
+def test_async_get_missing_product(async_client, seed_data):
+    resp = async_client.get("/products/100000000")
+    assert resp.status_code == 404
+
+def test_async_search_matches_sync(async_client, client, seed_data):
+    params = {"title": "phone", "limit": 1, "after": ""}
+    assert async_client.get("/products/search", params=params).json() == client.get("/products/search", params=params).json()
+
+def test_async_product_write_roundtrip(async_client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+    resp = async_client.post("/products/", json={
+        "sku": "SKU-CABLE-001",
+        "title": "USB Cable",
+        "price": "7.50",
+        "category_id": electronics_id,
+    })
+    assert resp.status_code == 201
+    product = resp.json()
+    assert product["category"] == {"id": electronics_id, "name": "Electronics"}
+
+    resp = async_client.patch(f"/products/{product['id']}", json={"price": "8.00"})
+    assert resp.status_code == 200
+    assert resp.json()["price"] == "8.00"
+
+    resp = async_client.delete(f"/products/{product['id']}")
+    assert resp.status_code == 204
+    assert async_client.get(f"/products/{product['id']}").status_code == 404
+
+def test_async_create_product_validation_errors(async_client, seed_data):
+    resp = async_client.post("/products/", json={
+        "sku": "SKU-CASE-001",
+        "title": "Duplicate",
+        "price": "1.00",
+        "category_id": 100000000,
+    })
+    assert resp.status_code == 400
+    fields = {error["field"] for error in resp.json()["errors"]}
+    assert fields == {"sku", "category_id"}
+
+def test_async_category_write_roundtrip(async_client, seed_data):
+    clothing_id = seed_data["categories"]["clothing"].id
+    resp = async_client.post("/categories/", json={"name": "Hoodies", "parent_id": clothing_id})
+    assert resp.status_code == 201
+    category = resp.json()
+    assert category["children"] == []
+
+    resp = async_client.get(f"/categories/{clothing_id}")
+    assert "Hoodies" in {child["name"] for child in resp.json()["children"]}
+
+    resp = async_client.patch(f"/categories/{category['id']}", json={"parent_id": category["id"]})
+    assert resp.status_code == 400
+
+    assert async_client.delete(f"/categories/{category['id']}").status_code == 204
+
+def test_async_search_facets_match_sync(async_client, client, seed_data):
+    params = {"include": "total,facets", "limit": 2}
+    assert async_client.get("/products/search", params=params).json() == client.get("/products/search", params=params).json()
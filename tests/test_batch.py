@@ -0,0 +1,52 @@
+from tests.test_sparse_fields import captured_sql
+
+
+def test_products_batch_keeps_request_order(client, db_session, seed_data):
+    case, laptop, shirt = (product.id for product in seed_data["products"])
+    statements, stop = captured_sql(db_session)
+    try:
+        resp = client.get("/products/batch", params={"ids": f"{shirt},999999,{case},{shirt}"})
+    finally:
+        stop()
+
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [(item["id"], item["found"]) for item in items] == [(shirt, True), (999999, False), (case, True), (shirt, True)]
+    assert items[1]["product"] is None
+    assert items[0]["product"] == client.get(f"/products/{shirt}").json()
+    assert len(statements) == 1
+
+
+def test_products_batch_by_sku_in_body(client, seed_data):
+    resp = client.post("/products/batch", json={"skus": ["SKU-TSHIRT-001", "SKU-MISSING"]})
+
+    assert resp.status_code == 200
+    first, second = resp.json()["items"]
+    assert first["sku"] == "SKU-TSHIRT-001" and first["product"]["title"] == "T-Shirt"
+    assert second == {"sku": "SKU-MISSING", "found": False, "product": None}
+
+
+def test_products_batch_needs_exactly_one_key(client, seed_data):
+    assert client.post("/products/batch", json={}).status_code == 400
+    assert client.post("/products/batch", json={"ids": [1], "skus": ["SKU-CASE-001"]}).status_code == 400
+
+
+def test_products_batch_is_capped(client, seed_data):
+    resp = client.post("/products/batch", json={"ids": list(range(1, 202))})
+    assert resp.status_code == 422
+
+
+def test_categories_batch(client, db_session, seed_data):
+    clothing_id = seed_data["categories"]["clothing"].id
+    statements, stop = captured_sql(db_session)
+    try:
+        resp = client.get("/categories/batch", params={"ids": f"{clothing_id},0"})
+    finally:
+        stop()
+
+    assert resp.status_code == 200
+    found, missing = resp.json()["items"]
+    assert found["category"] == client.get(f"/categories/{clothing_id}").json()
+    assert [child["name"] for child in found["category"]["children"]] == ["T-Shirts"]
+    assert missing == {"id": 0, "found": False, "category": None}
+    assert len(statements) == 1
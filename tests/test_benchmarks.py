@@ -0,0 +1,66 @@
+import pytest
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.db.models import Category, Product
+from benchmarks.__main__ import main
+from benchmarks.catalog import category_tree, load_catalog
+from benchmarks.runner import StatementCounter, percentile, run_scenario
+from benchmarks.scenarios import SCENARIOS, load_context
+
+
+def test_category_tree_is_deterministic_and_acyclic():
+    import random
+
+    tree = category_tree(200, random.Random(1))
+    assert tree == category_tree(200, random.Random(1))
+    assert all(parent_id is None or parent_id < id for id, _, parent_id in tree)
+    assert sum(parent_id is None for _, _, parent_id in tree) == 10
+
+
+def test_load_catalog(db_session):
+    load_catalog(db_session.get_bind(), categories=30, products=500, seed=3)
+    assert db_session.execute(select(func.count()).select_from(Category)).scalar_one() == 30
+    assert db_session.execute(select(func.count()).select_from(Product)).scalar_one() == 500
+    # Generated columns and defaults are filled in by the database.
+    assert db_session.execute(select(func.min(Product.version))).scalar_one() == 1
+
+
+def test_run_scenarios_in_process(client, db_session):
+    engine = db_session.get_bind()
+    load_catalog(engine, categories=30, products=500, seed=3)
+
+    with StatementCounter([engine]) as counter:
+        for name in ("get", "search_cursor", "search_facets", "create"):
+            ctx = load_context(engine, seed=0, run_id="test")
+            requests = [SCENARIOS[name](ctx) for _ in range(12)]
+            result = run_scenario(client, counter, requests, concurrency=1, warmup=2)
+            assert result["requests"] == 10
+            assert result["errors"] == 0
+            assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+            assert result["queries_per_request"] >= 1
+
+
+def test_percentile_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_read_paths_produce_identical_bodies(db_session):
+    from benchmarks.read_paths import compare_read_paths
+
+    load_catalog(db_session.get_bind(), categories=30, products=200, seed=3)
+    report = compare_read_paths(db_session.get_bind(), [50], repeat=2)
+    for case in report.values():
+        assert case["orm"]["bytes"] == case["records"]["bytes"]
+
+
+def test_load_never_defaults_to_the_main_database(monkeypatch, capsys):
+    monkeypatch.setattr(get_settings(), "test_database_url", "")
+    with pytest.raises(SystemExit):
+        main(["load"])
+    assert "--database-url" in capsys.readouterr().err
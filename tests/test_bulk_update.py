@@ -0,0 +1,91 @@
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from tests.test_write_paths import count_statements
+
+
+def test_bulk_update_by_id_and_sku(client, seed_data):
+    case_id = seed_data["products"][0].id
+    resp = client.patch("/products/bulk", json=[
+        {"id": case_id, "price": "11.00"},
+        {"sku": "SKU-TSHIRT-001", "price": "26.00", "description": None},
+    ])
+
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 2, "errors": []}
+    products = {p["sku"]: p for p in client.get("/products/").json()}
+    assert products["SKU-CASE-001"]["price"] == "11.00"
+    assert products["SKU-CASE-001"]["description"] == "Case"
+    assert (products["SKU-TSHIRT-001"]["price"], products["SKU-TSHIRT-001"]["description"]) == ("26.00", None)
+
+
+def test_bulk_update_reports_per_row_errors(client, seed_data):
+    case_id, phone_id, _ = (product.id for product in seed_data["products"])
+    resp = client.patch("/products/bulk", json=[
+        {"id": case_id, "price": "12.00"},
+        {"id": 999999, "price": "1.00"},
+        {"id": phone_id, "category_id": 999999},
+        {"price": "1.00"},
+        {"id": case_id, "price": "13.00"},
+        {"sku": "SKU-TSHIRT-001"},
+        {"sku": "SKU-PHONE-001", "title": None},
+    ])
+
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 1, "errors": [
+        {"index": 1, "field": "id", "message": "id=999999 does not exist"},
+        {"index": 2, "field": "category_id", "message": "category_id=999999 does not exist"},
+        {"index": 3, "field": "id & sku", "message": "Provide either id or sku."},
+        {"index": 4, "field": "id", "message": f"id={case_id} appears more than once in the request."},
+        {"index": 5, "field": "sku", "message": "No fields to update."},
+        {"index": 6, "field": "title", "message": "title cannot be null."},
+    ]}
+    assert client.get(f"/products/{case_id}").json()["price"] == "12.00"
+
+
+def test_bulk_update_is_one_update_per_chunk(client, db_session, seed_data, monkeypatch):
+    monkeypatch.setattr(get_settings(), "bulk_update_chunk_size", 2)
+    electronics_id = seed_data["categories"]["electronics"].id
+    body = [{"id": product.id, "price": "5.00", "category_id": electronics_id} for product in seed_data["products"]]
+    client.get("/products/")
+
+    with count_statements(db_session) as statements:
+        resp = client.patch("/products/bulk", json=body)
+
+    assert resp.json() == {"updated": 3, "errors": []}
+    assert statements == ["UPDATE", "UPDATE"]
+    assert {p["category"]["name"] for p in client.get("/products/").json()} == {"Electronics"}
+
+
+def test_bulk_update_failed_chunk_reports_its_rows(client, db_session, seed_data):
+    # A category deleted behind the cache's back: the foreign key rejects the chunk.
+    gone_id = client.post("/categories/", json={"name": "Gone"}).json()["id"]
+    db_session.execute(text("DELETE FROM categories WHERE id = :id"), {"id": gone_id})
+    db_session.commit()
+
+    resp = client.patch("/products/bulk", json=[{"sku": "SKU-CASE-001", "category_id": gone_id}])
+    assert resp.json() == {"updated": 0, "errors": [
+        {"index": 0, "field": "category_id", "message": f"category_id={gone_id} does not exist"},
+    ]}
+
+
+def test_bulk_update_failed_row_does_not_reject_its_chunk(client, db_session, seed_data):
+    gone_id = client.post("/categories/", json={"name": "Gone"}).json()["id"]
+    db_session.execute(text("DELETE FROM categories WHERE id = :id"), {"id": gone_id})
+    db_session.commit()
+
+    body = [{"sku": "SKU-CASE-001", "category_id": gone_id}, {"sku": "SKU-PHONE-001", "price": "1.00"}]
+    resp = client.patch("/products/bulk", json=body)
+    assert resp.json() == {"updated": 1, "errors": [
+        {"index": 0, "field": "category_id", "message": f"category_id={gone_id} does not exist"},
+    ]}
+    prices = {p["sku"]: p["price"] for p in client.get("/products/").json()}
+    assert prices["SKU-PHONE-001"] == "1.00"
+    # The stale cache entry is gone, so the next request is rejected up front.
+    resp = client.patch("/products/bulk", json=body[:1])
+    assert resp.json()["errors"][0]["field"] == "category_id"
+
+
+def test_bulk_update_validates_the_body(client, seed_data):
+    assert client.patch("/products/bulk", json=[]).status_code == 422
+    assert client.patch("/products/bulk", json=[{"id": 1, "price": "-1"}]).status_code == 422
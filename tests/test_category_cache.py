@@ -0,0 +1,79 @@
+from app.crud.category_cache import get_category_cache
+from app.db.models import Category
+
+
+def create_product(client, category_id, sku="SKU-MUG-001"):
+    return client.post("/products/", json={
+        "sku": sku,
+        "title": "Mug",
+        "price": "9.00",
+        "category_id": category_id,
+    })
+
+
+def test_product_reads_are_served_from_cache(client, seed_data):
+    cache = get_category_cache()
+    product_id = seed_data["products"][0].id
+
+    client.get(f"/products/{product_id}")
+    misses = cache.misses
+    hits = cache.hits
+
+    resp = client.get(f"/products/{product_id}")
+    assert resp.json()["category"]["name"] == "Electronics"
+    assert cache.misses == misses
+    assert cache.hits == hits + 1
+
+
+def test_category_update_writes_through(client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+    product_id = seed_data["products"][0].id
+    client.get(f"/products/{product_id}")
+
+    resp = client.patch(f"/categories/{electronics_id}", json={"name": "Gadgets"})
+    assert resp.status_code == 200
+
+    resp = client.get(f"/products/{product_id}")
+    assert resp.json()["category"] == {"id": electronics_id, "name": "Gadgets"}
+
+
+def test_category_create_and_delete_write_through(client, seed_data):
+    resp = client.post("/categories/", json={"name": "Kitchen"})
+    kitchen_id = resp.json()["id"]
+    misses = get_category_cache().misses
+
+    assert create_product(client, kitchen_id).status_code == 201
+    assert get_category_cache().misses == misses
+
+    resp = client.post("/categories/", json={"name": "Garden"})
+    garden_id = resp.json()["id"]
+    assert client.delete(f"/categories/{garden_id}").status_code == 204
+
+    resp = create_product(client, garden_id, sku="SKU-MUG-002")
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "category_id"
+
+
+def test_cache_reloads_after_ttl(client, seed_data, db_session, monkeypatch):
+    electronics = seed_data["categories"]["electronics"]
+    product_id = seed_data["products"][0].id
+    client.get(f"/products/{product_id}")
+
+    # A change made behind the cache's back, e.g. by another worker.
+    db_session.query(Category).filter_by(id=electronics.id).update({"name": "Devices"})
+    db_session.commit()
+    assert client.get(f"/products/{product_id}").json()["category"]["name"] == "Electronics"
+
+    monkeypatch.setattr(get_category_cache(), "ttl_seconds", 0)
+    assert client.get(f"/products/{product_id}").json()["category"]["name"] == "Devices"
+
+
+def test_evict_clears_children_parent():
+    cache = get_category_cache()
+    cache.put(1, "Clothing", None)
+    cache.put(2, "T-Shirts", 1)
+    cache.evict(1)
+
+    found, missing = cache.lookup([1, 2])
+    assert missing == [1]
+    assert found[2].parent_id is None
@@ -0,0 +1,87 @@
+import pytest
+
+from sqlalchemy import select
+
+from app.db.models import Category, CategoryClosure
+
+
+def closure_rows(db_session) -> set:
+    db_session.rollback()
+    return set(db_session.execute(select(CategoryClosure.ancestor_id, CategoryClosure.descendant_id, CategoryClosure.depth)).all())
+
+
+def expected_closure(db_session) -> set:
+    # The closure rebuilt from parent_id alone, to compare the maintained one against.
+    parents = dict(db_session.execute(select(Category.id, Category.parent_id)).all())
+    rows = set()
+    for id in parents:
+        ancestor, depth = id, 0
+        while ancestor is not None:
+            rows.add((ancestor, id, depth))
+            ancestor, depth = parents[ancestor], depth + 1
+    return rows
+
+
+@pytest.fixture
+def tree(client, seed_data):
+    clothing_id = seed_data["categories"]["clothing"].id
+    tshirts_id = seed_data["products"][2].category_id
+    vneck_id = client.post("/categories/", json={"name": "V-Neck", "parent_id": tshirts_id}).json()["id"]
+    return {"clothing": clothing_id, "tshirts": tshirts_id, "vneck": vneck_id, "electronics": seed_data["categories"]["electronics"].id}
+
+
+def test_closure_follows_creates(db_session, tree):
+    rows = closure_rows(db_session)
+    assert rows == expected_closure(db_session)
+    assert (tree["clothing"], tree["vneck"], 2) in rows
+
+
+def test_search_include_descendants(client, tree):
+    params = {"category_id": tree["clothing"]}
+    assert client.get("/products/search", params=params).json() == []
+
+    resp = client.get("/products/search", params={**params, "include_descendants": "true"})
+    assert [p["sku"] for p in resp.json()] == ["SKU-TSHIRT-001"]
+
+
+def test_include_descendants_requires_category_id(client, tree):
+    resp = client.get("/products/search", params={"include_descendants": "true"})
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "include_descendants"
+
+
+@pytest.mark.parametrize("new_parent", ["electronics", "clothing", None])
+def test_reparent_moves_the_subtree(client, db_session, tree, new_parent):
+    parent_id = tree[new_parent] if new_parent else None
+    resp = client.patch(f"/categories/{tree['tshirts']}", json={"parent_id": parent_id})
+    assert resp.status_code == 200
+
+    assert closure_rows(db_session) == expected_closure(db_session)
+
+
+def test_reparent_into_own_subtree_is_rejected(client, db_session, tree):
+    before = closure_rows(db_session)
+    resp = client.patch(f"/categories/{tree['clothing']}", json={"parent_id": tree["vneck"]})
+
+    assert resp.status_code == 400
+    assert resp.json()["errors"] == [{"field": "parent_id", "message": f"parent_id = {tree['vneck']} is a descendant of the category."}]
+    assert closure_rows(db_session) == before
+
+
+def test_delete_detaches_the_subtree(client, db_session, tree):
+    client.delete(f"/products/{client.get('/products/search', params={'sku': 'SKU-TSHIRT-001'}).json()[0]['id']}")
+    assert client.delete(f"/categories/{tree['tshirts']}").status_code == 204
+
+    rows = closure_rows(db_session)
+    assert rows == expected_closure(db_session)
+    assert (tree["clothing"], tree["vneck"], 2) not in rows
+
+
+def test_async_writes_maintain_closure(async_client, db_session, tree):
+    resp = async_client.post("/categories/", json={"name": "Crew Neck", "parent_id": tree["tshirts"]})
+    assert resp.status_code == 201
+    assert async_client.patch(f"/categories/{tree['tshirts']}", json={"parent_id": tree["electronics"]}).status_code == 200
+    assert async_client.patch(f"/categories/{tree['electronics']}", json={"parent_id": tree["vneck"]}).status_code == 400
+    assert async_client.delete(f"/categories/{tree['vneck']}").status_code == 204
+
+    assert closure_rows(db_session) == expected_closure(db_session)
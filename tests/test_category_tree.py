@@ -0,0 +1,48 @@
+from app.db.models import Category
+
+
+def test_tree_returns_full_hierarchy(client, seed_data):
+    resp = client.get("/categories/tree")
+    assert resp.status_code == 200
+
+    roots = {node["name"]: node for node in resp.json()}
+    assert set(roots) == {"Electronics", "Clothing"}
+    assert roots["Electronics"]["children"] == []
+    assert [child["name"] for child in roots["Clothing"]["children"]] == ["T-Shirts"]
+
+
+def test_subtree_depth_limits_levels(client, seed_data, db_session):
+    clothing = seed_data["categories"]["clothing"]
+    tshirts = db_session.query(Category).filter_by(name="T-Shirts").one()
+    db_session.add(Category(name="V-Neck", parent_id=tshirts.id))
+    db_session.commit()
+
+    resp = client.get(f"/categories/{clothing.id}/subtree")
+    assert resp.status_code == 200
+    root = resp.json()
+    assert root["name"] == "Clothing"
+    assert root["children"][0]["children"][0]["name"] == "V-Neck"
+
+    resp = client.get(f"/categories/{clothing.id}/subtree", params={"depth": 1})
+    root = resp.json()
+    assert [child["name"] for child in root["children"]] == ["T-Shirts"]
+    assert root["children"][0]["children"] == []
+
+    resp = client.get(f"/categories/{clothing.id}/subtree", params={"depth": 0})
+    assert resp.json()["children"] == []
+
+
+def test_subtree_survives_parent_cycle(client, seed_data, db_session):
+    clothing = seed_data["categories"]["clothing"]
+    tshirts = db_session.query(Category).filter_by(name="T-Shirts").one()
+    clothing.parent_id = tshirts.id
+    db_session.commit()
+
+    resp = client.get(f"/categories/{clothing.id}/subtree")
+    assert resp.status_code == 200
+    assert [child["name"] for child in resp.json()["children"]] == ["T-Shirts"]
+
+
+def test_subtree_missing_category(client, seed_data):
+    resp = client.get("/categories/100000000/subtree")
+    assert resp.status_code == 404
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.crud.changes import changes_statement
+from app.db.models import Product
+from tests.conftest import engine
+from tests.test_search_plans import explain
+
+
+def sync(client, since=""):
+    # Drains the feed from a cursor, like a consumer would.
+    changes = []
+    while True:
+        page = client.get("/products/changes", params={"since": since, "limit": 2}).json()
+        changes += page["changes"]
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return changes, since
+
+
+def test_feed_starts_with_the_whole_catalog(client, seed_data):
+    changes, _ = sync(client)
+
+    assert [(change["kind"], change["deleted"]) for change in changes] == [("category", False)] * 3 + [("product", False)] * 3
+    assert changes[-1]["product"] == client.get(f"/products/{changes[-1]['id']}").json()
+    assert changes[2]["category"] == {"id": changes[2]["id"], "name": "T-Shirts", "parent_id": changes[1]["id"]}
+
+
+def test_feed_resumes_with_updates_and_deletions(client, seed_data):
+    _, cursor = sync(client)
+    case_id, phone_id, shirt_id = (product.id for product in seed_data["products"])
+    clothing_id = seed_data["categories"]["clothing"].id
+
+    client.patch(f"/products/{case_id}", json={"price": "3.00"})
+    client.delete(f"/products/{phone_id}")
+    client.delete(f"/products/{shirt_id}")
+    client.delete(f"/categories/{clothing_id}")
+
+    changes, cursor = sync(client, cursor)
+    assert [(change["kind"], change["id"], change["deleted"]) for change in changes] == [
+        ("product", case_id, False),
+        ("product", phone_id, True),
+        ("product", shirt_id, True),
+        # T-Shirts became a root when its parent was deleted.
+        ("category", changes[3]["id"], False),
+        ("category", clothing_id, True),
+    ]
+    assert changes[0]["product"]["price"] == "3.00"
+    assert changes[3]["category"]["parent_id"] is None
+    assert sync(client, cursor)[0] == []
+
+
+def test_feed_waits_for_transactions_still_running(client, seed_data):
+    _, cursor = sync(client)
+    electronics_id = seed_data["categories"]["electronics"].id
+    row = {"title": "Cable", "description": None, "price": Decimal("5.00"), "category_id": electronics_id}
+
+    # The earlier transaction commits last; its change must not be skipped.
+    with engine.connect() as slow:
+        slow.execute(insert(Product).values(sku="SKU-SLOW-001", **row))
+        client.post("/products/", json={**row, "sku": "SKU-FAST-001", "price": "5.00"})
+        assert sync(client, cursor)[0] == []
+        slow.commit()
+
+    changes, _ = sync(client, cursor)
+    assert [change["product"]["sku"] for change in changes] == ["SKU-SLOW-001", "SKU-FAST-001"]
+
+
+def test_feed_rejects_foreign_cursors(client, seed_data):
+    page = client.get("/products/search", params={"limit": 1, "after": ""}).json()
+    resp = client.get("/products/changes", params={"since": page["next_cursor"]})
+    assert resp.status_code == 400
+    assert [error["field"] for error in resp.json()["errors"]] == ["since"]
+
+
+def test_feed_reads_the_change_indexes(db_session, seed_data):
+    plan = explain(db_session, changes_statement([0, 1, 0], 100))
+
+    for index in ("ix_categories_change_xid_id", "ix_products_change_xid_id", "ix_tombstones_change_xid_id"):
+        assert index in plan
@@ -0,0 +1,72 @@
+def test_product_etag_roundtrip(client, seed_data):
+    product_id = seed_data["products"][0].id
+    resp = client.get(f"/products/{product_id}")
+    etag = resp.headers["etag"]
+    assert etag.startswith('"')
+
+    resp = client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+    resp = client.get(f"/products/{product_id}", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert resp.status_code == 304
+
+
+def test_product_update_changes_etag(client, seed_data):
+    product_id = seed_data["products"][0].id
+    etag = client.get(f"/products/{product_id}").headers["etag"]
+
+    client.patch(f"/products/{product_id}", json={"price": "11.00"})
+
+    resp = client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["price"] == "11.00"
+    assert resp.headers["etag"] != etag
+
+
+def test_category_rename_changes_product_etag(client, seed_data):
+    product_id = seed_data["products"][0].id
+    etag = client.get(f"/products/{product_id}").headers["etag"]
+
+    client.patch(f"/categories/{seed_data['categories']['electronics'].id}", json={"name": "Gadgets"})
+
+    resp = client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["category"]["name"] == "Gadgets"
+
+
+def test_category_etag_tracks_children(client, seed_data):
+    clothing_id = seed_data["categories"]["clothing"].id
+    etag = client.get(f"/categories/{clothing_id}").headers["etag"]
+    assert client.get(f"/categories/{clothing_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    tshirts_id = client.get(f"/categories/{clothing_id}").json()["children"][0]["id"]
+    client.patch(f"/categories/{tshirts_id}", json={"name": "Tees"})
+
+    resp = client.get(f"/categories/{clothing_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["children"][0]["name"] == "Tees"
+
+
+def test_list_endpoints_etags(client, seed_data):
+    for path in ("/products/", "/categories/"):
+        resp = client.get(path)
+        etag = resp.headers["etag"]
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    etag = client.get("/products/").headers["etag"]
+    client.patch(f"/products/{seed_data['products'][0].id}", json={"title": "Phone Cover"})
+    assert client.get("/products/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_missing_product_with_if_none_match(client, seed_data):
+    resp = client.get("/products/100000000", headers={"If-None-Match": '"abc"'})
+    assert resp.status_code == 404
+
+
+def test_async_etags_match_sync(async_client, client, seed_data):
+    product_id = seed_data["products"][0].id
+    etag = client.get(f"/products/{product_id}").headers["etag"]
+    assert async_client.get(f"/products/{product_id}").headers["etag"] == etag
+    assert async_client.get(f"/products/{product_id}", headers={"If-None-Match": etag}).status_code == 304
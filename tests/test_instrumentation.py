@@ -0,0 +1,57 @@
+import json
+import logging
+
+from app.core.config import get_settings
+from app.db.instrumentation import RequestStats
+
+
+def log_events(caplog, event):
+    return [json.loads(record.getMessage()) for record in caplog.records if f'"event": "{event}"' in record.getMessage()]
+
+
+def test_server_timing_reports_statements(client, seed_data):
+    # The first request reads the seeded categories through into the cache.
+    client.get("/products/search", params={"title": "phone"})
+    resp = client.get("/products/search", params={"title": "phone"})
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 statements"' in timing
+    assert "total;dur=" in timing
+
+
+def test_repeated_statements_are_flagged(client, seed_data, caplog, monkeypatch):
+    monkeypatch.setattr(get_settings(), "n_plus_one_threshold", 2)
+    product_ids = [product.id for product in seed_data["products"]]
+
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        for product_id in product_ids:
+            client.get(f"/products/{product_id}")
+    # Counts are per request: the same lookup across requests is not an N+1.
+    assert log_events(caplog, "n_plus_one") == []
+
+    monkeypatch.setattr(get_settings(), "n_plus_one_threshold", 1)
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        client.get(f"/products/{product_ids[0]}")
+    [event] = log_events(caplog, "n_plus_one")
+    assert event["path"] == f"/products/{product_ids[0]}"
+    assert event["statement"].startswith("SELECT")
+
+    stats = RequestStats()
+    for _ in range(3):
+        stats.shapes["SELECT 1"] += 1
+    stats.shapes["SELECT 2"] += 1
+    assert stats.repeated_shapes(2) == [("SELECT 1", 3)]
+
+
+def test_slow_requests_are_logged(client, seed_data, caplog, monkeypatch):
+    client.get("/products/search", params={"title": "phone"})
+    monkeypatch.setattr(get_settings(), "slow_request_ms", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        client.get("/products/search", params={"title": "phone"})
+
+    [event] = log_events(caplog, "slow_request")
+    assert event["path"] == "/products/search"
+    assert event["status"] == 200
+    assert event["statements"] == 1
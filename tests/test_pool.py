@@ -0,0 +1,79 @@
+import pytest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import Settings, get_settings
+from app.db.pool import MeteredNullPool, MeteredQueuePool, install_idle_pre_ping, pool_options, pool_status
+
+
+def make_settings(**overrides) -> Settings:
+    return Settings(database_url=get_settings().test_database_url, **overrides)
+
+
+def test_pool_options_follow_settings():
+    options = pool_options(make_settings(db_pool_size=20, db_max_overflow=0, db_pre_ping="never"))
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert "connect_args" not in options
+
+    options = pool_options(make_settings(db_pgbouncer=True, db_null_pool=True))
+    assert options["poolclass"] is MeteredNullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+    assert "pool_size" not in options
+
+
+def test_pool_metrics_count_checkouts_and_timeouts():
+    settings = make_settings(db_pool_size=1, db_max_overflow=0, db_pool_timeout_seconds=0.05)
+    engine = create_engine(settings.database_url, **pool_options(settings))
+    try:
+        with engine.connect():
+            assert pool_status(engine.pool)["checked_out"] == 1
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        status = pool_status(engine.pool)
+        assert status["checked_out"] == 0
+        assert status["checkouts"] == 1
+        assert status["timeouts"] == 1
+        assert status["wait_ms_max"] >= 50
+    finally:
+        engine.dispose()
+
+
+def test_pgbouncer_mode_disables_prepared_statements():
+    settings = make_settings(db_pgbouncer=True, db_null_pool=True)
+    engine = create_engine(settings.database_url, **pool_options(settings))
+    with engine.connect() as conn:
+        assert conn.connection.driver_connection.prepare_threshold is None
+    engine.dispose()
+
+
+def test_idle_pre_ping_replaces_dropped_connections():
+    settings = make_settings(db_pool_size=1, db_pre_ping="idle")
+    engine = create_engine(settings.database_url, **pool_options(settings))
+    install_idle_pre_ping(engine, idle_seconds=0)
+    try:
+        with engine.connect() as conn:
+            pid = conn.execute(text("SELECT pg_backend_pid()")).scalar_one()
+        # Drop the pooled connection behind the pool's back.
+        admin = create_engine(settings.database_url)
+        with admin.connect() as conn:
+            conn.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+        admin.dispose()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT pg_backend_pid()")).scalar_one() != pid
+    finally:
+        engine.dispose()
+
+
+def test_internal_metrics_endpoint(client):
+    client.get("/categories/")
+    resp = client.get("/internal/metrics")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["pools"]["sync"]["pool"] == "MeteredQueuePool"
+    assert {"checked_out", "overflow", "wait_ms_mean", "timeouts"} <= body["pools"]["sync"].keys()
+    assert "hits" in body["category_cache"]
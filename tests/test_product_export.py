@@ -0,0 +1,31 @@
+import json
+
+from app.core.config import get_settings
+
+
+def test_export_ndjson_streams_every_product(client, seed_data):
+    resp = client.get("/products/export", params={"format": "ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = resp.text.splitlines()
+    products = [json.loads(line) for line in lines]
+    assert [p["sku"] for p in products] == ["SKU-CASE-001", "SKU-PHONE-001", "SKU-TSHIRT-001"]
+    assert products[0]["category"]["name"] == "Electronics"
+
+
+def test_export_matches_list_endpoint(client, seed_data):
+    exported = [json.loads(line) for line in client.get("/products/export").text.splitlines()]
+    listed = sorted(client.get("/products/").json(), key=lambda p: p["id"])
+    assert exported == listed
+
+
+def test_export_across_multiple_chunks(client, seed_data, monkeypatch):
+    monkeypatch.setattr(get_settings(), "export_chunk_size", 2)
+    resp = client.get("/products/export")
+    assert len(resp.text.splitlines()) == 3
+
+
+def test_export_rejects_unknown_format(client, seed_data):
+    resp = client.get("/products/export", params={"format": "csv"})
+    assert resp.status_code == 422
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.api.routers.products import product_record_adapter
+from app.crud.products import list_product_records
+from app.db.models import Product
+from app.schemas.product import ProductRead
+
+
+product_read_list_adapter = TypeAdapter(list[ProductRead])
+
+
+@pytest.fixture
+def odd_product(db_session, seed_data):
+    product = Product(
+        title="Café Ünïcode \"quoted\"",
+        sku="SKU-ODD-001",
+        description=None,
+        image="https://example.com/img/odd.png",
+        price=Decimal("1234.50"),
+        category_id=seed_data["categories"]["electronics"].id,
+    )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+@pytest.fixture
+def expected(seed_data, odd_product):
+    # Every product as ProductRead serialises it, by sku.
+    electronics = seed_data["categories"]["electronics"].id
+    case, phone, tshirt = seed_data["products"]
+    electronics_category = {"id": electronics, "name": "Electronics"}
+    items = [
+        {"sku": "SKU-CASE-001", "title": "Phone Case", "description": "Case", "image": None, "price": "10.00", "category_id": electronics, "id": case.id, "category": electronics_category},
+        {"sku": "SKU-PHONE-001", "title": "Smart Phone", "description": "Phone", "image": None, "price": "500.00", "category_id": electronics, "id": phone.id, "category": electronics_category},
+        {"sku": "SKU-TSHIRT-001", "title": "T-Shirt", "description": "Shirt", "image": None, "price": "25.00", "category_id": tshirt.category_id, "id": tshirt.id, "category": {"id": tshirt.category_id, "name": "T-Shirts"}},
+        {"sku": "SKU-ODD-001", "title": "Café Ünïcode \"quoted\"", "description": None, "image": "https://example.com/img/odd.png", "price": "1234.50", "category_id": electronics, "id": odd_product.id, "category": electronics_category},
+    ]
+    return {item["sku"]: item for item in items}
+
+
+def test_records_serialise_like_product_read(db_session, expected):
+    products = product_read_list_adapter.validate_python(list(expected.values()))
+
+    assert product_record_adapter.dump_json(list_product_records(db_session)) == product_read_list_adapter.dump_json(products)
+
+
+def test_search_records_by_title(client, expected):
+    resp = client.get("/products/search", params={"title": "phone"})
+    assert resp.json() == [expected["SKU-CASE-001"], expected["SKU-PHONE-001"]]
+
+
+def test_search_records_cursor_page(client, expected):
+    resp = client.get("/products/search", params={"q": "phone", "sort": "relevance", "limit": 1, "after": ""})
+    body = resp.json()
+    assert body["items"] == [expected["SKU-PHONE-001"]]
+    assert body["next_cursor"] is not None
+
+
+def test_search_records_with_total_and_facets(client, seed_data, expected):
+    resp = client.get("/products/search", params={"include": "total,facets", "limit": 2})
+    body = resp.json()
+    assert body["items"] == [expected["SKU-CASE-001"], expected["SKU-PHONE-001"]]
+    assert body["next_cursor"] is None
+    assert body["total"] == 4
+    electronics, tshirts = seed_data["categories"]["electronics"].id, expected["SKU-TSHIRT-001"]["category_id"]
+    assert body["facets"]["categories"] == [{"category_id": electronics, "count": 3}, {"category_id": tshirts, "count": 1}]
+    assert sum(bucket["count"] for bucket in body["facets"]["prices"]) == 4
+
+
+def test_search_records_past_the_last_page(client, expected):
+    resp = client.get("/products/search", params={"min_price": 20, "include": "total", "offset": 10})
+    assert resp.json() == {"items": [], "next_cursor": None, "total": 3}
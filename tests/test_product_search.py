@@ -1,4 +1,8 @@
+import pytest
+
 from decimal import Decimal
+from app.crud.pagination import encode_cursor
+from app.db.models import Product
 
 def test_search_returns_empty_when_no_matches(client, seed_data):
     resp = client.get("/products/search", params={"title": "Should not exist"})
@@ -114,4 +118,147 @@ def test_search_pagination_limit_offset(client, seed_data):
     assert len(a) == 1
     assert len(b) == 1
 
-    assert a[0]["sku"] != b[0]["sku"]
\ No newline at end of file
+    assert a[0]["sku"] != b[0]["sku"]
+
+def test_search_cursor_pagination_walks_all_pages(client, seed_data):
+    r1 = client.get("/products/search", params={"limit": 2, "after": ""})
+    assert r1.status_code == 200
+    page1 = r1.json()
+    assert len(page1["items"]) == 2
+    assert page1["next_cursor"]
+
+    r2 = client.get("/products/search", params={"limit": 2, "after": page1["next_cursor"]})
+    assert r2.status_code == 200
+    page2 = r2.json()
+    assert len(page2["items"]) == 1
+    assert page2["next_cursor"] is None
+
+    skus = {p["sku"] for p in page1["items"] + page2["items"]}
+    assert skus == {"SKU-CASE-001", "SKU-PHONE-001", "SKU-TSHIRT-001"}
+
+def test_search_cursor_respects_filters(client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+
+    resp = client.get("/products/search", params={"category_id": electronics_id, "limit": 1, "after": ""})
+    page = resp.json()
+    resp = client.get("/products/search", params={"category_id": electronics_id, "limit": 1, "after": page["next_cursor"]})
+    assert resp.status_code == 200
+    skus = {p["sku"] for p in page["items"] + resp.json()["items"]}
+    assert skus == {"SKU-CASE-001", "SKU-PHONE-001"}
+
+def test_search_invalid_cursor(client, seed_data):
+    resp = client.get("/products/search", params={"after": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "after"
+
+@pytest.mark.parametrize("sort, keys", [
+    ("id", ["1"]),
+    ("id", [True]),
+    ("id", [None]),
+    ("price", [5.0, 1]),
+    ("price", ["NaN", 1]),
+    ("price", ["cheap", 1]),
+    ("title", [7, 1]),
+    ("title", ["Phone", "1"]),
+])
+def test_search_tampered_cursor_rejected(client, seed_data, sort, keys):
+    resp = client.get("/products/search", params={"sort": sort, "after": encode_cursor(sort, keys)})
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "after"
+
+def test_search_cursor_with_offset_rejected(client, seed_data):
+    resp = client.get("/products/search", params={"after": "", "offset": 1})
+    assert resp.status_code == 400
+
+def test_search_full_text_matches_description(client, seed_data, db_session):
+    db_session.add(Product(
+        title="Running Socks",
+        sku="SKU-SOCKS-001",
+        description="Breathable cotton, pairs well with any t-shirt",
+        price=5,
+        category_id=seed_data["categories"]["clothing"].id,
+    ))
+    db_session.commit()
+
+    resp = client.get("/products/search", params={"q": "breathable"})
+    assert resp.status_code == 200
+    assert [p["sku"] for p in resp.json()] == ["SKU-SOCKS-001"]
+
+def test_search_full_text_sorted_by_relevance(client, seed_data):
+    resp = client.get("/products/search", params={"q": "phone", "sort": "relevance"})
+    assert resp.status_code == 200
+    # "Smart Phone" matches in both title and description, "Phone Case" only in the title.
+    assert [p["sku"] for p in resp.json()] == ["SKU-PHONE-001", "SKU-CASE-001"]
+
+def test_search_relevance_cursor_pagination(client, seed_data):
+    r1 = client.get("/products/search", params={"q": "phone", "sort": "relevance", "limit": 1, "after": ""})
+    page1 = r1.json()
+    r2 = client.get("/products/search", params={"q": "phone", "sort": "relevance", "limit": 1, "after": page1["next_cursor"]})
+    page2 = r2.json()
+    assert [p["sku"] for p in page1["items"] + page2["items"]] == ["SKU-PHONE-001", "SKU-CASE-001"]
+    assert page2["next_cursor"] is None
+
+def test_search_relevance_requires_q(client, seed_data):
+    resp = client.get("/products/search", params={"sort": "relevance"})
+    assert resp.status_code == 400
+
+@pytest.mark.parametrize("sort, expected", [
+    ("price", ["SKU-CASE-001", "SKU-TSHIRT-001", "SKU-PHONE-001"]),
+    ("-price", ["SKU-PHONE-001", "SKU-TSHIRT-001", "SKU-CASE-001"]),
+    ("title", ["SKU-CASE-001", "SKU-PHONE-001", "SKU-TSHIRT-001"]),
+    ("-id", ["SKU-TSHIRT-001", "SKU-PHONE-001", "SKU-CASE-001"]),
+])
+def test_search_sort_orders_and_cursor_pages(client, seed_data, sort, expected):
+    resp = client.get("/products/search", params={"sort": sort})
+    assert [p["sku"] for p in resp.json()] == expected
+
+    skus, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/products/search", params={"sort": sort, "limit": 2, "after": cursor}).json()
+        skus += [p["sku"] for p in page["items"]]
+        cursor = page["next_cursor"]
+    assert skus == expected
+
+def test_search_cheapest_in_category(client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+    resp = client.get("/products/search", params={"category_id": electronics_id, "sort": "price", "limit": 1})
+    assert [p["sku"] for p in resp.json()] == ["SKU-CASE-001"]
+
+def test_search_cursor_is_tied_to_its_sort(client, seed_data):
+    page = client.get("/products/search", params={"sort": "price", "limit": 1, "after": ""}).json()
+    resp = client.get("/products/search", params={"sort": "title", "limit": 1, "after": page["next_cursor"]})
+    assert resp.status_code == 400
+
+def test_search_include_total_and_facets(client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+    tshirts_id = seed_data["products"][2].category_id
+    resp = client.get("/products/search", params={"include": "total,facets", "price_edges": "20,100", "limit": 1})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["items"]) == 1
+    assert body["total"] == 3
+    assert body["facets"]["categories"] == [
+        {"category_id": electronics_id, "count": 2},
+        {"category_id": tshirts_id, "count": 1},
+    ]
+    assert body["facets"]["prices"] == [
+        {"min": None, "max": "20", "count": 1},
+        {"min": "20", "max": "100", "count": 1},
+        {"min": "100", "max": None, "count": 1},
+    ]
+
+def test_search_include_total_respects_filters_not_paging(client, seed_data):
+    resp = client.get("/products/search", params={"title": "phone", "include": "total", "limit": 1, "after": ""})
+    body = resp.json()
+    assert body["total"] == 2
+    assert "facets" not in body
+    assert body["next_cursor"] is not None
+
+    # An empty page still carries the counts.
+    resp = client.get("/products/search", params={"title": "phone", "include": "total", "offset": 50})
+    assert resp.json() == {"items": [], "next_cursor": None, "total": 2}
+
+def test_search_include_rejects_unsorted_price_edges(client, seed_data):
+    resp = client.get("/products/search", params={"include": "facets", "price_edges": "100,20"})
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "price_edges"
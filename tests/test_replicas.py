@@ -0,0 +1,118 @@
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.api.deps import READ_PRIMARY_COOKIE
+from app.core.config import get_settings
+from app.db import session
+from app.db.replicas import LAG_SECONDS, Replica, ReplicaSet
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    """
+    Points replica_database_urls at the given URLs for one test, with fresh
+    replica engines that are disposed afterwards.
+    """
+    def configure(*urls):
+        monkeypatch.setattr(get_settings(), "replica_database_urls", list(urls))
+        monkeypatch.setattr(session, "replica_set", None)
+        session.init_replicas()
+        return session.replica_set
+
+    yield configure
+    if session.replica_set is not None:
+        for replica in session.replica_set.replicas:
+            replica.engine.dispose()
+
+
+def missing_database_url() -> str:
+    url = make_url(get_settings().test_database_url).set(database="no_such_replica")
+    return url.render_as_string(hide_password=False)
+
+
+@pytest.mark.parametrize(("in_recovery", "receiver_status", "received", "replayed", "replayed_ago", "expected"), [
+    (False, None, None, None, None, 0),
+    # Streaming and caught up: current, however old the last transaction.
+    (True, "streaming", "0/3000000", "0/3000000", 3600, 0),
+    # Streaming but behind: the age of the last replayed transaction.
+    (True, "streaming", "0/3000000", "0/2000000", 30, 30),
+    # Receiver gone (or not visible): caught up with what it got means nothing.
+    (True, "waiting", "0/3000000", "0/3000000", 3600, 3600),
+    (True, None, "0/3000000", "0/3000000", 3600, 3600),
+    (True, None, None, None, None, None),
+])
+def test_replica_lag_logic(db_session, in_recovery, receiver_status, received, replayed, replayed_ago, expected):
+    statement = text(
+        f"SELECT round({LAG_SECONDS}) FROM (SELECT :in_recovery AS in_recovery, CAST(:receiver_status AS text) AS receiver_status,"
+        " CAST(:received AS pg_lsn) AS received, CAST(:replayed AS pg_lsn) AS replayed,"
+        " now() - make_interval(secs => :replayed_ago) AS replayed_at) AS state"
+    )
+    params = {"in_recovery": in_recovery, "receiver_status": receiver_status, "received": received, "replayed": replayed, "replayed_ago": replayed_ago}
+    lag = db_session.execute(statement, params).scalar_one()
+    assert lag == expected
+
+
+def test_replica_set_health_and_rotation():
+    a, b = Replica(engine=None, sessionmaker="a"), Replica(engine=None, sessionmaker="b")
+    replica_set = ReplicaSet([a, b], max_lag_seconds=5, check_interval=60)
+
+    assert [r.sessionmaker for r in replica_set.rotation()] == ["a", "b"]
+    assert [r.sessionmaker for r in replica_set.rotation()] == ["b", "a"]
+
+    assert replica_set.claim_check(a) is True
+    assert replica_set.claim_check(a) is False
+    replica_set.record(a, lag_seconds=30)
+    assert a.healthy is False
+    # Not due again until check_interval has passed.
+    assert replica_set.claim_check(a) is False
+
+    replica_set.record(b, lag_seconds=None, error="OperationalError")
+    assert b.healthy is False
+    replica_set.record(b, lag_seconds=0.5)
+    assert b.healthy is True
+
+
+def test_reads_go_to_a_healthy_replica(replicas):
+    replica_set = replicas(get_settings().test_database_url)
+
+    SessionLocal = session.get_read_session_local()
+    assert SessionLocal is replica_set.replicas[0].sessionmaker
+    assert replica_set.replicas[0].lag_seconds == 0
+    with SessionLocal() as db:
+        assert db.execute(text("SELECT 1")).scalar_one() == 1
+
+    # Read-after-write stays on the primary.
+    assert session.get_read_session_local(prefer_primary=True) is session.get_session_local()
+
+
+def test_reads_fall_back_to_primary_when_replica_is_down(replicas):
+    replica_set = replicas(missing_database_url())
+
+    assert session.get_read_session_local() is session.get_session_local()
+    [status] = replica_set.status()
+    assert status["healthy"] is False
+    assert status["error"] == "OperationalError"
+
+
+def test_reads_fall_back_to_primary_when_replica_lags(replicas, monkeypatch):
+    monkeypatch.setattr(get_settings(), "replica_max_lag_seconds", -1)
+    replicas(get_settings().test_database_url)
+
+    assert session.get_read_session_local() is session.get_session_local()
+
+
+def test_writes_pin_reads_to_primary(client, seed_data, monkeypatch):
+    electronics_id = seed_data["categories"]["electronics"].id
+
+    resp = client.post("/categories/", json={"name": "Cameras", "parent_id": electronics_id})
+    assert READ_PRIMARY_COOKIE not in resp.cookies
+
+    monkeypatch.setattr(get_settings(), "replica_database_urls", ["postgresql+psycopg://replica/ecommerce"])
+    resp = client.post("/categories/", json={"name": "Drones", "parent_id": electronics_id})
+    assert resp.cookies[READ_PRIMARY_COOKIE] == "1"
+    assert "Max-Age=5" in resp.headers["set-cookie"]
+
+    resp = client.get("/categories/")
+    assert READ_PRIMARY_COOKIE not in resp.headers.get("set-cookie", "")
@@ -0,0 +1,84 @@
+import pytest
+
+from sqlalchemy import func, select, text
+
+from app.crud.products import TEXT_SEARCH_CONFIG, search_statement, title_contains
+from app.db.models import Product
+from app.schemas.product import ProductParams
+
+
+def explain(db_session, statement, disable=("seqscan",)) -> str:
+    """
+    Returns the text plan of a statement with sequential scans disabled, so the
+    planner picks an index whenever one can serve the query, even on tiny tables.
+    Pass disable=("seqscan", "sort", "incremental_sort") to also make it prefer an
+    index that returns rows already in order over sorting them.
+    """
+    compiled = statement.compile(bind=db_session.get_bind())
+    for setting in disable:
+        db_session.execute(text(f"SET LOCAL enable_{setting} = off"))
+    rows = db_session.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars().all()
+    db_session.rollback()
+    return "\n".join(rows)
+
+
+def index_exists(db_session, name: str) -> bool:
+    return db_session.execute(
+        text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": name}
+    ).scalar() is not None
+
+
+def test_title_search_uses_trigram_index(db_session, seed_data):
+    if not index_exists(db_session, "ix_products_title_trgm"):
+        pytest.skip("pg_trgm is not available on this database")
+
+    plan = explain(db_session, select(Product.id).where(title_contains("phone")))
+    assert "ix_products_title_trgm" in plan
+
+
+def test_full_text_search_uses_search_vector_index(db_session, seed_data):
+    tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, "phone")
+    plan = explain(db_session, select(Product.id).where(Product.search_vector.op("@@")(tsquery)))
+    assert "ix_products_search_vector" in plan
+
+
+def test_title_search_escapes_wildcards(client, seed_data):
+    resp = client.get("/products/search", params={"title": "%"})
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+def test_facets_share_one_filtered_scan(db_session, seed_data):
+    query = ProductParams(q="phone", include=["total", "facets"])
+    plan = explain(db_session, search_statement(query))
+
+    # The filtered scan feeds the matches CTE once; the page only probes the primary key.
+    assert plan.count("ix_products_search_vector") == 1
+    assert "CTE matches" in plan
+    assert "Group Key: ()" in plan
+
+
+@pytest.mark.parametrize("sort, filtered, index", [
+    ("price", True, "ix_products_category_id_price_id"),
+    ("-price", True, "ix_products_category_id_price_id"),
+    ("title", True, "ix_products_category_id_title_id"),
+    ("price", False, "ix_products_price_id"),
+    ("-price", False, "ix_products_price_id"),
+    ("title", False, "ix_products_title_id"),
+    ("-id", False, "products_pkey"),
+])
+def test_sorted_first_page_is_an_index_range_scan(db_session, seed_data, sort, filtered, index):
+    category_id = seed_data["categories"]["electronics"].id if filtered else None
+    query = ProductParams(sort=sort, category_id=category_id, limit=10)
+    plan = explain(db_session, search_statement(query, records=True), disable=("seqscan", "sort", "incremental_sort"))
+
+    assert index in plan
+    assert "Sort" not in plan
+
+
+def test_subtree_filter_is_one_indexed_join(db_session, seed_data):
+    query = ProductParams(category_id=seed_data["categories"]["clothing"].id, include_descendants=True)
+    plan = explain(db_session, search_statement(query, records=True))
+
+    assert "category_closure_pkey" in plan
+    assert "ix_products_category_id" in plan
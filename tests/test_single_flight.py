@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.api.deps import READ_PRIMARY_COOKIE
+from app.api.routers import products
+from app.api.single_flight import SingleFlight, get_single_flight, params_key
+from app.schemas.product import ProductParams
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        release.wait(5)
+        return b"body"
+
+    with ThreadPoolExecutor(6) as pool:
+        futures = [pool.submit(flight.run, "key", read, 5) for _ in range(6)]
+        while not calls:
+            time.sleep(0.001)
+        # Let the followers join before the leader finishes.
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == [b"body"] * 6
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 5, "timeouts": 0, "in_flight": 0, "coalescing_ratio": 0.8333}
+
+
+def test_follower_gives_up_after_max_wait():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    with ThreadPoolExecutor(1) as pool:
+        leader = pool.submit(flight.run, "key", lambda: release.wait(5) and "leader", 5)
+        while not flight.stats()["in_flight"]:
+            time.sleep(0.001)
+        assert flight.run("key", lambda: "own", 0.01) == "own"
+        release.set()
+        assert leader.result() == "leader"
+    assert flight.timeouts == 1
+
+
+def test_leader_error_is_shared():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def failing():
+            started.set()
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        leader = asyncio.create_task(flight.run_async("key", failing, 5))
+        await started.wait()
+        follower = asyncio.create_task(flight.run_async("key", failing, 5))
+        return await asyncio.gather(leader, follower, return_exceptions=True), flight.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert (stats["leaders"], stats["coalesced"]) == (1, 1)
+
+
+def test_equivalent_search_params_share_a_key():
+    assert params_key("search", ProductParams(q="phone", limit=20)) == params_key("search", ProductParams(limit=20, q="phone"))
+    assert params_key("search", ProductParams(q="phone")) != params_key("search", ProductParams(q="case"))
+    assert params_key("search", ProductParams(fields="id,title")) == params_key("search", ProductParams(fields="title,id"))
+    assert params_key("search", ProductParams(include="facets,total")) == params_key("search", ProductParams(include="total,facets"))
+    assert params_key("search", ProductParams(price_edges="10,20")) != params_key("search", ProductParams(price_edges="20,10"))
+
+
+@pytest.fixture
+def slow_product_reads(monkeypatch):
+    calls = []
+    original = products.list_specific_product
+
+    def slow(db, id):
+        calls.append(id)
+        time.sleep(0.2)
+        return original(db, id)
+
+    monkeypatch.setattr(products, "list_specific_product", slow)
+    return calls
+
+
+def test_concurrent_product_reads_are_coalesced(client, seed_data, slow_product_reads):
+    product_id = seed_data["products"][0].id
+    coalesced = get_single_flight().coalesced
+    with ThreadPoolExecutor(4) as pool:
+        responses = list(pool.map(lambda _: client.get(f"/products/{product_id}"), range(4)))
+
+    assert {resp.status_code for resp in responses} == {200}
+    assert len({resp.content for resp in responses}) == 1
+    assert len({resp.headers["ETag"] for resp in responses}) == 1
+    assert len(slow_product_reads) < 4
+    metrics = client.get("/internal/metrics").json()["single_flight"]
+    assert metrics["coalesced"] == coalesced + 4 - len(slow_product_reads)
+
+
+def test_read_your_writes_clients_are_not_coalesced(client, seed_data, slow_product_reads):
+    product_id = seed_data["products"][0].id
+    client.cookies.set(READ_PRIMARY_COOKIE, "1")
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(lambda _: client.get(f"/products/{product_id}"), range(3)))
+    assert len(slow_product_reads) == 3
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import get_settings
+from app.crud.changes import list_changes
+from app.schemas.product import ProductChangesParams
+from app import snapshots
+from app.snapshots import BUILD_LOCK, build_if_free, build_snapshot, read_manifest
+from tests.conftest import engine
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "snapshot_dir", str(tmp_path))
+    return tmp_path
+
+
+def build(directory, formats=("gzip",), **kwargs):
+    return build_snapshot(engine, directory, list(formats), **kwargs)
+
+
+def test_build_writes_files_and_manifest(seed_data, snapshot_dir):
+    manifest = build(snapshot_dir)
+    assert read_manifest(snapshot_dir) == manifest
+    assert set(manifest["files"]) == {"products.ndjson.gz", "categories.ndjson.gz"}
+
+    path = snapshot_dir / manifest["generation"] / "products.ndjson.gz"
+    data = path.read_bytes()
+    entry = manifest["files"]["products.ndjson.gz"]
+    assert entry["bytes"] == len(data)
+    assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+
+    rows = [json.loads(line) for line in gzip.decompress(data).splitlines()]
+    assert entry["rows"] == len(rows) == len(seed_data["products"])
+    assert [row["id"] for row in rows] == sorted(p.id for p in seed_data["products"])
+    assert manifest["files"]["categories.ndjson.gz"]["rows"] == 3
+
+
+def test_manifest_cursor_resumes_the_change_feed(client, db_session, seed_data, snapshot_dir):
+    manifest = build(snapshot_dir)
+    client.patch(f"/products/{seed_data['products'][0].id}", json={"title": "Changed"})
+
+    changes = list_changes(db_session, ProductChangesParams(since=manifest["changes_cursor"]))["changes"]
+    assert [(c["kind"], c["id"]) for c in changes] == [("product", seed_data["products"][0].id)]
+
+
+def test_old_generations_are_pruned(seed_data, snapshot_dir):
+    generations = [build(snapshot_dir, keep=2)["generation"] for _ in range(3)]
+    assert sorted(path.name for path in snapshot_dir.iterdir() if path.is_dir()) == generations[1:]
+
+
+def test_serves_manifest_and_ranges(client, seed_data, snapshot_dir):
+    manifest = build(snapshot_dir)
+    assert client.get("/snapshots/manifest").json() == manifest
+
+    data = (snapshot_dir / manifest["generation"] / "products.ndjson.gz").read_bytes()
+    resp = client.get("/snapshots/products.ndjson.gz")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert resp.content == data
+
+    resp = client.get("/snapshots/products.ndjson.gz", headers={"Range": "bytes=10-"})
+    assert resp.status_code == 206
+    assert resp.content == data[10:]
+
+
+def test_unknown_snapshot_is_404(client, snapshot_dir):
+    assert client.get("/snapshots/manifest").status_code == 404
+    assert client.get("/snapshots/products.ndjson.gz").status_code == 404
+
+
+def test_zstd_snapshot(seed_data, snapshot_dir):
+    zstandard = pytest.importorskip("zstandard")
+    manifest = build(snapshot_dir, ["gzip", "zstd"])
+    data = (snapshot_dir / manifest["generation"] / "products.ndjson.zst").read_bytes()
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(data).count(b"\n") == len(seed_data["products"])
+
+
+def test_build_skipped_while_another_worker_builds(seed_data, snapshot_dir):
+    with engine.connect() as other:
+        other.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BUILD_LOCK})
+        assert build_if_free(engine, snapshot_dir, ["gzip"], 2, 1000) is None
+        other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BUILD_LOCK})
+    assert build_if_free(engine, snapshot_dir, ["gzip"], 2, 1000) is not None
+
+
+def test_build_lock_is_released_with_a_warm_pool(seed_data, snapshot_dir, monkeypatch):
+    # Several idle pooled connections, so the lock and the build could land on
+    # different ones if the lock weren't held on its own connection.
+    pooled = create_engine(get_settings().test_database_url, pool_size=4)
+    connections = [pooled.connect() for _ in range(4)]
+    for connection in connections:
+        connection.close()
+
+    def try_lock():
+        with engine.connect() as other:
+            acquired = other.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": BUILD_LOCK}).scalar()
+            if acquired:
+                other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BUILD_LOCK})
+            return acquired
+
+    held_during_build = []
+    build = snapshots.build_snapshot
+    def checked_build(*args):
+        held_during_build.append(not try_lock())
+        return build(*args)
+    monkeypatch.setattr(snapshots, "build_snapshot", checked_build)
+
+    try:
+        assert build_if_free(pooled, snapshot_dir, ["gzip"], 2, 1000) is not None
+        assert held_during_build == [True]
+        assert try_lock()
+    finally:
+        pooled.dispose()
+
+
+def test_build_reads_in_repeatable_read(db_session, seed_data, snapshot_dir, monkeypatch):
+    # The caller's own open transaction has no say in the build's isolation level.
+    db_session.execute(text("SELECT 1"))
+    isolation = []
+    lines = snapshots.category_lines
+    def checked_lines(db, chunk_size):
+        isolation.append(db.execute(text("SHOW transaction_isolation")).scalar())
+        return lines(db, chunk_size)
+    monkeypatch.setattr(snapshots, "category_lines", checked_lines)
+
+    build(snapshot_dir)
+    assert isolation == ["repeatable read"]
+
+
+def test_cli_builds_and_exits_while_another_worker_builds(seed_data, snapshot_dir, capsys):
+    snapshots.main(["--dir", str(snapshot_dir), "--formats", "gzip"])
+    assert json.loads(capsys.readouterr().out) == read_manifest(snapshot_dir)
+
+    with engine.connect() as other:
+        other.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BUILD_LOCK})
+        with pytest.raises(SystemExit) as exited:
+            snapshots.main(["--dir", str(snapshot_dir), "--formats", "gzip"])
+        other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BUILD_LOCK})
+    assert exited.value.code != 0
@@ -0,0 +1,76 @@
+from sqlalchemy import event
+
+
+def captured_sql(db_session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(db_session.get_bind(), "before_cursor_execute", before_cursor_execute)
+
+
+def test_list_fields_narrow_the_select(client, db_session, seed_data):
+    statements, stop = captured_sql(db_session)
+    try:
+        resp = client.get("/products/", params={"fields": "id,title,price,image"})
+    finally:
+        stop()
+
+    assert resp.status_code == 200
+    assert [list(product) for product in resp.json()] == [["title", "image", "price", "id"]] * 3
+    [sql] = statements
+    assert "description" not in sql
+    assert "categories" not in sql
+
+
+def test_category_field_joins_categories(client, db_session, seed_data):
+    statements, stop = captured_sql(db_session)
+    try:
+        resp = client.get("/products/", params={"fields": "category,sku"})
+    finally:
+        stop()
+
+    electronics_id = seed_data["categories"]["electronics"].id
+    assert resp.json()[0] == {"sku": "SKU-CASE-001", "category": {"id": electronics_id, "name": "Electronics"}}
+    assert "JOIN categories" in statements[0]
+
+
+def test_search_fields(client, seed_data):
+    resp = client.get("/products/search", params={"title": "phone", "fields": "id,price", "limit": 1, "after": "", "include": "total"})
+    assert resp.status_code == 200
+    page = resp.json()
+    assert page["items"] == [{"price": "10.00", "id": seed_data["products"][0].id}]
+    assert page["total"] == 2
+
+    resp = client.get("/products/search", params={"title": "phone", "fields": "id,price", "after": page["next_cursor"]})
+    assert resp.json()["items"] == [{"price": "500.00", "id": seed_data["products"][1].id}]
+
+
+def test_get_by_id_fields_and_etag(client, seed_data):
+    product_id = seed_data["products"][2].id
+    full = client.get(f"/products/{product_id}")
+    resp = client.get(f"/products/{product_id}", params={"fields": "title,category"})
+    assert resp.status_code == 200
+    assert resp.json() == {"title": "T-Shirt", "category": full.json()["category"]}
+    assert resp.headers["etag"] != full.headers["etag"]
+
+    resp = client.get(f"/products/{product_id}", params={"fields": "title,category"}, headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+    assert client.get("/products/999999", params={"fields": "title"}).status_code == 404
+
+
+def test_unknown_field_is_rejected(client, seed_data):
+    assert client.get("/products/", params={"fields": "id,password"}).status_code == 422
+
+
+def test_async_fields_match_sync(async_client, client, seed_data):
+    product_id = seed_data["products"][0].id
+    for path, params in [
+        ("/products/", {"fields": "id,category"}),
+        ("/products/search", {"fields": "title", "include": "facets"}),
+        (f"/products/{product_id}", {"fields": "sku,price"}),
+    ]:
+        assert async_client.get(path, params=params).json() == client.get(path, params=params).json()
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app import warmup
+from app.core.config import get_settings
+from app.db import session
+from app.main import app
+from app.warmup import StartupState, build_engines, warm_up
+
+
+def wait_until_ready(client, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = client.get("/internal/ready")
+        if resp.status_code == 200 or time.monotonic() > deadline:
+            return resp
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def warm_app(monkeypatch):
+    monkeypatch.setattr(get_settings(), "warmup_on_startup", True)
+    monkeypatch.setattr(get_settings(), "warmup_retry_seconds", 0)
+    return app
+
+
+def test_warm_up_fills_the_pool(seed_data):
+    state = StartupState()
+    build_engines(state)
+    warm_up(state)
+
+    assert session.engine.pool.checkedin() >= get_settings().db_pool_size
+    assert {"engines", "pool", "statements", "serialisers"} <= set(state.steps)
+
+
+def test_ready_after_warm_up(warm_app, seed_data):
+    with TestClient(warm_app) as client:
+        resp = wait_until_ready(client)
+
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["ready"] is True
+    assert report["attempts"] == 1
+    assert report["import_ms"] > 0
+    assert report["warmup_ms"] >= report["steps_ms"]["statements"]
+
+
+def test_not_ready_until_warm_up_succeeds(warm_app, monkeypatch):
+    failures = []
+
+    def flaky_warm_up(state):
+        if len(failures) < 2:
+            failures.append(1)
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+        warm_up(state)
+
+    monkeypatch.setattr(warmup, "warm_up", flaky_warm_up)
+    with TestClient(warm_app) as client:
+        resp = wait_until_ready(client)
+
+    assert resp.status_code == 200
+    assert resp.json()["attempts"] == 3
+
+
+def test_not_ready_while_warming_up(warm_app, monkeypatch):
+    monkeypatch.setattr(warmup, "warm_up", lambda state: time.sleep(0.5))
+    with TestClient(warm_app) as client:
+        resp = client.get("/internal/ready")
+        assert resp.status_code == 503
+        assert resp.json()["ready"] is False
+        # The API itself is already served.
+        assert client.get("/categories/").status_code == 200
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.crud.category_cache import load_category_cache
+
+
+@contextmanager
+def count_statements(db_session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def product_payload(category_id, sku="SKU-MUG-001"):
+    return {"sku": sku, "title": "Mug", "price": "9.00", "category_id": category_id}
+
+
+def test_create_product_is_a_single_insert(client, db_session, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+    load_category_cache(db_session)
+
+    with count_statements(db_session) as statements:
+        resp = client.post("/products/", json=product_payload(electronics_id))
+
+    assert resp.status_code == 201
+    assert resp.json()["sku"] == "SKU-MUG-001"
+    assert resp.json()["category"] == {"id": electronics_id, "name": "Electronics"}
+    assert statements == ["INSERT"]
+
+
+def test_update_product_is_a_single_update(client, db_session, seed_data):
+    product_id = seed_data["products"][0].id
+    load_category_cache(db_session)
+
+    with count_statements(db_session) as statements:
+        resp = client.patch(f"/products/{product_id}", json={"title": "Phone Cover"})
+
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Phone Cover"
+    assert resp.json()["category"]["name"] == "Electronics"
+    assert statements == ["UPDATE"]
+
+
+def test_delete_product_is_a_single_delete(client, db_session, seed_data):
+    product_id = seed_data["products"][0].id
+
+    with count_statements(db_session) as statements:
+        resp = client.delete(f"/products/{product_id}")
+
+    assert resp.status_code == 204
+    # Still one statement; the change feed's tombstone is written by a CTE of it.
+    assert statements == ["WITH"]
+    assert client.delete(f"/products/{product_id}").status_code == 404
+
+
+def test_duplicate_sku_is_reported_from_the_unique_index(client, seed_data):
+    electronics_id = seed_data["categories"]["electronics"].id
+
+    resp = client.post("/products/", json=product_payload(electronics_id, sku="SKU-CASE-001"))
+    assert resp.status_code == 400
+    assert resp.json()["errors"] == [{"field": "sku", "message": "sku=SKU-CASE-001 already exists"}]
+
+    product_id = seed_data["products"][1].id
+    resp = client.patch(f"/products/{product_id}", json={"sku": "SKU-CASE-001"})
+    assert resp.status_code == 400
+    assert resp.json()["errors"] == [{"field": "sku", "message": "sku=SKU-CASE-001 already exists"}]
+
+
+def test_update_missing_product_with_invalid_category_is_404(client, seed_data):
+    resp = client.patch("/products/999999", json={"category_id": 999999})
+    assert resp.status_code == 404
+
+
+def test_category_writes(client, db_session, seed_data):
+    clothing_id = seed_data["categories"]["clothing"].id
+
+    resp = client.post("/categories/", json={"name": "Shoes", "parent_id": 999999})
+    assert resp.status_code == 400
+    assert resp.json()["errors"][0]["field"] == "category_id"
+
+    resp = client.post("/categories/", json={"name": "Shoes", "parent_id": clothing_id})
+    assert resp.status_code == 201
+    assert resp.json()["children"] == []
+    shoes_id = resp.json()["id"]
+
+    resp = client.patch(f"/categories/{clothing_id}", json={"name": "Apparel"})
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Apparel"
+    assert {child["name"] for child in resp.json()["children"]} == {"T-Shirts", "Shoes"}
+
+    with count_statements(db_session) as statements:
+        resp = client.delete(f"/categories/{shoes_id}")
+    assert resp.status_code == 204
+    # Still one statement; closure cleanup, orphaned children and tombstone are CTEs.
+    assert statements == ["WITH"]
+    assert client.delete(f"/categories/{shoes_id}").status_code == 404